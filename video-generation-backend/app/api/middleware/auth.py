@@ -7,7 +7,7 @@ from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.security import security
-from app.infrastructure.external.supabase.client import SupabaseClient
+from app.infrastructure.external.supabase.client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ class AuthMiddleware:
     """Middleware para autenticación JWT con Supabase."""
 
     def __init__(self):
-        self.supabase_client = SupabaseClient()
+        self.supabase_client = get_supabase_client()
 
     async def verify_token(self, credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
         """
@@ -0,0 +1,41 @@
+"""
+Response compression middleware
+"""
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware que deja pasar sin comprimir las rutas indicadas.
+
+    Pensado para respuestas ya comprimidas (MP3 en streaming): recomprimirlas
+    no reduce el tamaño y obliga a bufferizar cada chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+        exclude_paths: Iterable[str] = ()
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Comprime la respuesta salvo en las rutas excluidas.
+
+        Args:
+            scope: Scope ASGI de la conexión
+            receive: Canal de entrada ASGI
+            send: Canal de salida ASGI
+        """
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
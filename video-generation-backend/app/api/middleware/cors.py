@@ -16,7 +16,8 @@ def setup_cors(app: FastAPI) -> None:
     """
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins_list,
+        # frozenset: comprobación O(1) del Origin en cada request
+        allow_origins=frozenset(settings.cors_origins_list),
         allow_credentials=True,
         allow_methods=[
             "GET",
@@ -43,7 +44,10 @@ def setup_cors(app: FastAPI) -> None:
             "X-Total-Count",
             "X-Page-Count",
             "X-Rate-Limit-Remaining",
-            "X-Rate-Limit-Reset"
+            "X-Rate-Limit-Reset",
+            "X-Duration",
+            "X-Filename",
+            "X-Voice-Id"
         ],
         max_age=86400  # 24 horas
     )
\ No newline at end of file
@@ -5,39 +5,78 @@ import logging
 import traceback
 from typing import Dict, Any
 from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import ValidationError
 
+from app.api.responses import ModelJSONResponse
+from app.core.config import settings
 from app.schemas.base import ErrorResponse
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Middleware para manejo global de errores."""
+class ErrorHandlerMiddleware:
+    """
+    Middleware ASGI para manejo global de errores.
+
+    Implementado como ASGI puro (sin BaseHTTPMiddleware) para no crear un
+    task group ni objetos Request/Response extra en cada request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Procesa la request y maneja errores globalmente.
 
         Args:
-            request: Request de FastAPI
-            call_next: Siguiente middleware/handler
-
-        Returns:
-            Response: Respuesta del servidor
+            scope: Scope ASGI de la conexión
+            receive: Canal de entrada ASGI
+            send: Canal de salida ASGI
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # Si la respuesta ya empezó no se puede sustituir
+            if response_started:
+                raise
+            response = self._handle_exception(
+                e, f"{scope['method']} {scope['path']}")
+            await response(scope, receive, send)
+
+    def _handle_exception(self, e: Exception, request_info: str) -> ORJSONResponse:
+        """
+        Convierte una excepción en una respuesta de error estándar.
+
+        Args:
+            e: Excepción capturada
+            request_info: Método y ruta de la request (para logs)
 
-        except HTTPException as e:
+        Returns:
+            ORJSONResponse: Respuesta de error
+        """
+        if isinstance(e, HTTPException):
             # HTTPExceptions ya están manejadas por FastAPI
             # Pero podemos logear y personalizar el formato
             logger.warning(
                 f"HTTP Exception: {e.status_code} - {e.detail} "
-                f"[{request.method} {request.url}]"
+                f"[{request_info}]"
             )
 
             error_response = ErrorResponse(
@@ -46,17 +85,17 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 details={"status_code": e.status_code}
             )
 
-            return JSONResponse(
+            return ModelJSONResponse(
+                error_response,
                 status_code=e.status_code,
-                content=error_response.dict(),
                 headers=e.headers
             )
 
-        except ValidationError as e:
+        elif isinstance(e, ValidationError):
             # Errores de validación de Pydantic
             logger.warning(
                 f"Validation Error: {str(e)} "
-                f"[{request.method} {request.url}]"
+                f"[{request_info}]"
             )
 
             error_details = {
@@ -76,16 +115,16 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 details=error_details
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content=error_response.dict()
+            return ModelJSONResponse(
+                error_response,
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
             )
 
-        except ValueError as e:
+        elif isinstance(e, ValueError):
             # Errores de valor (lógica de negocio)
             logger.warning(
                 f"Value Error: {str(e)} "
-                f"[{request.method} {request.url}]"
+                f"[{request_info}]"
             )
 
             error_response = ErrorResponse(
@@ -93,16 +132,16 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 error_code="VALUE_ERROR"
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content=error_response.dict()
+            return ModelJSONResponse(
+                error_response,
+                status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        except PermissionError as e:
+        elif isinstance(e, PermissionError):
             # Errores de permisos
             logger.warning(
                 f"Permission Error: {str(e)} "
-                f"[{request.method} {request.url}]"
+                f"[{request_info}]"
             )
 
             error_response = ErrorResponse(
@@ -110,16 +149,16 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 error_code="PERMISSION_DENIED"
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content=error_response.dict()
+            return ModelJSONResponse(
+                error_response,
+                status_code=status.HTTP_403_FORBIDDEN
             )
 
-        except ConnectionError as e:
+        elif isinstance(e, ConnectionError):
             # Errores de conexión con servicios externos
             logger.error(
                 f"Connection Error: {str(e)} "
-                f"[{request.method} {request.url}]"
+                f"[{request_info}]"
             )
 
             error_response = ErrorResponse(
@@ -128,16 +167,16 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 details={"service_error": str(e)}
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content=error_response.dict()
+            return ModelJSONResponse(
+                error_response,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
             )
 
-        except Exception as e:
+        else:
             # Errores no esperados
             logger.error(
                 f"Unexpected Error: {str(e)} "
-                f"[{request.method} {request.url}]\n"
+                f"[{request_info}]\n"
                 f"Traceback: {traceback.format_exc()}"
             )
 
@@ -146,7 +185,6 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             error_details = None
 
             # En desarrollo, mostrar más detalles
-            from app.core.config import settings
             if settings.DEBUG:
                 error_message = str(e)
                 error_details = {
@@ -160,9 +198,9 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 details=error_details
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content=error_response.dict()
+            return ModelJSONResponse(
+                error_response,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
@@ -186,9 +224,9 @@ def setup_error_handlers(app) -> None:
             }
         )
 
-        return JSONResponse(
-            status_code=404,
-            content=error_response.dict()
+        return ModelJSONResponse(
+            error_response,
+            status_code=404
         )
 
     @app.exception_handler(405)
@@ -204,9 +242,26 @@ def setup_error_handlers(app) -> None:
             }
         )
 
-        return JSONResponse(
+        return ModelJSONResponse(
+            error_response,
             status_code=405,
-            content=error_response.dict(),
+            headers=exc.headers
+        )
+
+    @app.exception_handler(StarletteHTTPException)
+    async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+        """
+        Handler para el resto de HTTPException lanzadas por las rutas.
+
+        Mantiene el contrato de FastAPI ({"detail": ...}) pero serializa con
+        orjson en lugar del JSONResponse por defecto (json de la stdlib).
+        """
+        if exc.status_code in (204, 304):
+            return Response(status_code=exc.status_code, headers=exc.headers)
+
+        return ORJSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
             headers=exc.headers
         )
 
@@ -230,11 +285,7 @@ def setup_error_handlers(app) -> None:
             details=error_details
         )
 
-        return JSONResponse(
-            status_code=422,
-            content=error_response.dict()
+        return ModelJSONResponse(
+            error_response,
+            status_code=422
         )
-
-
-# Import necesario para el handler
-from fastapi.exceptions import RequestValidationError
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Health check interceptor (ASGI)
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+import orjson
+from pydantic import BaseModel
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class HealthCheckInterceptor:
+    """
+    Envoltorio ASGI que responde GET /health desde un cache.
+
+    Las sondas de Kubernetes/uptime no atraviesan el stack de middleware ni
+    disparan comprobaciones contra OpenAI/Supabase en cada request: el
+    resultado se cachea durante cache_ttl segundos y se refresca en segundo
+    plano (se sirve el último valor mientras tanto). Si el estado es
+    "unhealthy" se responde 503 para que balanceadores y probes lo detecten.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        health_provider: Callable[[], Awaitable[BaseModel]],
+        cache_ttl: float = 5.0,
+        path: str = "/health"
+    ):
+        self.app = app
+        self.health_provider = health_provider
+        self.cache_ttl = cache_ttl
+        self.path = path
+
+        # Los proxies/LB pueden reutilizar la respuesta mientras esté vigente
+        self._cache_control = f"max-age={int(cache_ttl)}".encode()
+        self._cached_body: Optional[bytes] = None
+        self._cached_status = 200
+        self._expires_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Intercepta GET /health y delega el resto de requests en la app.
+
+        Args:
+            scope: Scope ASGI de la conexión
+            receive: Canal de entrada ASGI
+            send: Canal de salida ASGI
+        """
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or scope["path"] != self.path):
+            await self.app(scope, receive, send)
+            return
+
+        if self._cached_body is None:
+            # Primera sonda: no hay nada que servir todavía. Las sondas
+            # concurrentes esperan al mismo refresco en lugar de lanzar uno
+            # cada una (shield: cancelar una request no cancela el refresco)
+            self._schedule_refresh()
+            await asyncio.shield(self._refresh_task)
+        elif time.monotonic() >= self._expires_at:
+            self._schedule_refresh()
+
+        await send({
+            "type": "http.response.start",
+            "status": self._cached_status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self._cached_body)).encode()),
+                (b"cache-control", self._cache_control),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self._cached_body})
+
+    def _schedule_refresh(self) -> None:
+        """Lanza un refresco en segundo plano si no hay uno en curso."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        """Recalcula el estado de salud y actualiza el cache."""
+        try:
+            health = await self.health_provider()
+            self._cached_body = orjson.dumps(health.model_dump())
+            self._cached_status = 503 if getattr(
+                health, "status", None) == "unhealthy" else 200
+        except Exception as e:
+            logger.error(f"❌ Error refrescando health check: {str(e)}")
+            if self._cached_body is None:
+                self._cached_body = orjson.dumps(
+                    {"status": "unhealthy", "services": {"error": str(e)}})
+                self._cached_status = 503
+        finally:
+            self._expires_at = time.monotonic() + self.cache_ttl
@@ -3,78 +3,123 @@ Rate limiting middleware
 """
 import time
 import logging
-from typing import Dict, Optional
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi import status
 
 from app.core.config import settings
+from app.core.security import security
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware de rate limiting basado en IP y usuario."""
+class RateLimitMiddleware:
+    """
+    Middleware ASGI de rate limiting basado en IP y usuario.
+
+    Usa un token bucket por clave (capacidad = burst, recarga =
+    calls_per_minute / 60 tokens por segundo): cada request cuesta O(1) en
+    lugar de filtrar una lista de timestamps, y al ser ASGI puro no crea
+    objetos Request ni task groups por request.
+    """
 
-    def __init__(self, app, calls_per_minute: int = None, burst_limit: int = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, calls_per_minute: int = None, burst_limit: int = None):
+        self.app = app
         self.calls_per_minute = calls_per_minute or settings.RATE_LIMIT_PER_MINUTE
         self.burst_limit = burst_limit or settings.RATE_LIMIT_BURST
         self.window_size = 60  # 1 minuto en segundos
 
-        # Almacenamiento en memoria para rate limiting
+        # Almacenamiento en memoria: clave -> (tokens disponibles, último refill)
         # En producción, usar Redis para compartir entre instancias
-        self.ip_requests: Dict[str, list] = {}
-        self.user_requests: Dict[str, list] = {}
+        self.ip_buckets: Dict[str, Tuple[float, float]] = {}
+        self.user_buckets: Dict[str, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Procesa la request y aplica rate limiting.
 
         Args:
-            request: Request de FastAPI
-            call_next: Siguiente middleware/handler
-
-        Returns:
-            Response: Respuesta del servidor
+            scope: Scope ASGI de la conexión
+            receive: Canal de entrada ASGI
+            send: Canal de salida ASGI
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
         # Obtener IP del cliente
-        client_ip = self._get_client_ip(request)
+        client_ip = self._get_client_ip(scope, headers)
 
         # Obtener ID de usuario si está autenticado
-        user_id = await self._get_user_id_from_request(request)
+        user_id = self._get_user_id_from_headers(headers)
 
         # Verificar rate limits
-        if not self._check_rate_limit(client_ip, user_id):
-            return self._create_rate_limit_response()
+        current_time = time.monotonic()
 
-        # Continuar con la request
-        response = await call_next(request)
+        # Barrido periódico: los buckets de clientes inactivos no crecen sin
+        # límite (una pasada O(n) por minuto, amortizada O(1) por request)
+        if current_time - self._last_sweep >= self.window_size:
+            self.cleanup_old_entries()
 
-        # Añadir headers de rate limiting a la respuesta
-        self._add_rate_limit_headers(response, client_ip, user_id)
-
-        return response
+        ip_remaining = self._consume(
+            self.ip_buckets, client_ip, self.burst_limit, current_time)
+        if ip_remaining is None:
+            logger.warning(f"Rate limit excedido para IP: {client_ip}")
+            await self._create_rate_limit_response()(scope, receive, send)
+            return
 
-    def _get_client_ip(self, request: Request) -> str:
+        user_remaining = None
+        if user_id:
+            # Los usuarios autenticados tienen el doble de capacidad
+            user_remaining = self._consume(
+                self.user_buckets, user_id, self.burst_limit * 2, current_time,
+                refill_factor=2)
+            if user_remaining is None:
+                logger.warning(
+                    f"User rate limit excedido para usuario: {user_id}")
+                await self._create_rate_limit_response()(scope, receive, send)
+                return
+
+        async def send_with_headers(message: Message) -> None:
+            # Añadir headers de rate limiting a la respuesta
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Rate-Limit-Limit"] = str(self.calls_per_minute)
+                response_headers["X-Rate-Limit-Remaining"] = str(ip_remaining)
+                response_headers["X-Rate-Limit-Reset"] = str(
+                    int(time.time() + self.window_size))
+                if user_remaining is not None:
+                    response_headers["X-User-Rate-Limit-Remaining"] = str(
+                        user_remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """Obtiene la IP del cliente considerando proxies."""
         # Verificar headers de proxy más comunes
-        forwarded_for = request.headers.get("x-forwarded-for")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
             # Tomar la primera IP (cliente original)
             return forwarded_for.split(",")[0].strip()
 
-        real_ip = request.headers.get("x-real-ip")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
 
         # IP directa
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
-    async def _get_user_id_from_request(self, request: Request) -> Optional[str]:
+    def _get_user_id_from_headers(self, headers: Headers) -> Optional[str]:
         """Extrae el ID de usuario del token JWT si está presente."""
         try:
-            auth_header = request.headers.get("authorization")
+            auth_header = headers.get("authorization")
             if not auth_header or not auth_header.startswith("Bearer "):
                 return None
 
@@ -82,7 +127,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
             # Decodificar token básico para obtener user_id
             # En un escenario real, usarías el mismo servicio de auth
-            from app.core.security import security
             payload = security.verify_supabase_token(token)
 
             if payload:
@@ -94,91 +138,40 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             logger.debug(f"Error extrayendo user_id del token: {str(e)}")
             return None
 
-    def _check_rate_limit(self, client_ip: str, user_id: Optional[str]) -> bool:
+    def _consume(
+        self,
+        buckets: Dict[str, Tuple[float, float]],
+        key: str,
+        capacity: int,
+        current_time: float,
+        refill_factor: int = 1
+    ) -> Optional[int]:
         """
-        Verifica si la request está dentro de los límites de rate limiting.
+        Consume un token del bucket de la clave indicada.
 
         Args:
-            client_ip: IP del cliente
-            user_id: ID del usuario (si está autenticado)
+            buckets: Buckets de IP o de usuario
+            key: IP o ID de usuario
+            capacity: Tokens máximos (burst)
+            current_time: Instante actual (time.monotonic)
+            refill_factor: Multiplicador de la tasa de recarga
 
         Returns:
-            bool: True si está dentro del límite, False si se excede
+            Optional[int]: Tokens restantes, o None si se excede el límite
         """
-        current_time = time.time()
-
-        # Verificar rate limit por IP
-        if not self._check_ip_rate_limit(client_ip, current_time):
-            return False
-
-        # Verificar rate limit por usuario (si está autenticado)
-        if user_id and not self._check_user_rate_limit(user_id, current_time):
-            return False
-
-        # Registrar la request actual
-        self._record_request(client_ip, user_id, current_time)
-
-        return True
-
-    def _check_ip_rate_limit(self, client_ip: str, current_time: float) -> bool:
-        """Verifica rate limit por IP."""
-        if client_ip not in self.ip_requests:
-            return True
-
-        # Limpiar requests antiguas
-        self.ip_requests[client_ip] = [
-            req_time for req_time in self.ip_requests[client_ip]
-            if current_time - req_time < self.window_size
-        ]
-
-        # Verificar límites
-        recent_requests = len(self.ip_requests[client_ip])
+        tokens, last_refill = buckets.get(key, (float(capacity), current_time))
 
-        # Verificar burst limit
-        if recent_requests >= self.burst_limit:
-            logger.warning(f"Burst limit excedido para IP: {client_ip}")
-            return False
+        # Recargar tokens según el tiempo transcurrido
+        refill_rate = self.calls_per_minute * refill_factor / self.window_size
+        tokens = min(float(capacity), tokens +
+                     (current_time - last_refill) * refill_rate)
 
-        # Verificar límite por minuto
-        if recent_requests >= self.calls_per_minute:
-            logger.warning(f"Rate limit excedido para IP: {client_ip}")
-            return False
-
-        return True
-
-    def _check_user_rate_limit(self, user_id: str, current_time: float) -> bool:
-        """Verifica rate limit por usuario."""
-        if user_id not in self.user_requests:
-            return True
-
-        # Limpiar requests antiguas
-        self.user_requests[user_id] = [
-            req_time for req_time in self.user_requests[user_id]
-            if current_time - req_time < self.window_size
-        ]
-
-        # Los usuarios autenticados pueden tener límites más altos
-        user_limit = self.calls_per_minute * 2  # 2x el límite para usuarios autenticados
-        recent_requests = len(self.user_requests[user_id])
-
-        if recent_requests >= user_limit:
-            logger.warning(f"User rate limit excedido para usuario: {user_id}")
-            return False
-
-        return True
+        if tokens < 1:
+            buckets[key] = (tokens, current_time)
+            return None
 
-    def _record_request(self, client_ip: str, user_id: Optional[str], current_time: float) -> None:
-        """Registra la request actual."""
-        # Registrar por IP
-        if client_ip not in self.ip_requests:
-            self.ip_requests[client_ip] = []
-        self.ip_requests[client_ip].append(current_time)
-
-        # Registrar por usuario si está autenticado
-        if user_id:
-            if user_id not in self.user_requests:
-                self.user_requests[user_id] = []
-            self.user_requests[user_id].append(current_time)
+        buckets[key] = (tokens - 1, current_time)
+        return int(tokens - 1)
 
     def _create_rate_limit_response(self) -> Response:
         """Crea respuesta de rate limit excedido."""
@@ -194,53 +187,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             }
         )
 
-    def _add_rate_limit_headers(self, response: Response, client_ip: str, user_id: Optional[str]) -> None:
-        """Añade headers de rate limiting a la respuesta."""
-        current_time = time.time()
-
-        # Calcular requests restantes para IP
-        ip_requests = self.ip_requests.get(client_ip, [])
-        ip_remaining = max(0, self.calls_per_minute - len(ip_requests))
-
-        # Calcular tiempo de reset
-        reset_time = int(current_time + self.window_size)
-
-        # Añadir headers
-        response.headers["X-Rate-Limit-Limit"] = str(self.calls_per_minute)
-        response.headers["X-Rate-Limit-Remaining"] = str(ip_remaining)
-        response.headers["X-Rate-Limit-Reset"] = str(reset_time)
-
-        # Headers adicionales para usuarios autenticados
-        if user_id:
-            user_requests = self.user_requests.get(user_id, [])
-            user_limit = self.calls_per_minute * 2
-            user_remaining = max(0, user_limit - len(user_requests))
-            response.headers["X-User-Rate-Limit-Remaining"] = str(user_remaining)
-
     def cleanup_old_entries(self) -> None:
         """
-        Limpia entradas antiguas de memoria (para mantenimiento).
-        Debería ejecutarse periódicamente.
+        Limpia buckets que ya se han recargado por completo (para mantenimiento).
+        Se ejecuta automáticamente una vez por ventana desde __call__.
         """
-        current_time = time.time()
-
-        # Limpiar requests de IP
-        for ip in list(self.ip_requests.keys()):
-            self.ip_requests[ip] = [
-                req_time for req_time in self.ip_requests[ip]
-                if current_time - req_time < self.window_size
-            ]
-            if not self.ip_requests[ip]:
-                del self.ip_requests[ip]
-
-        # Limpiar requests de usuario
-        for user_id in list(self.user_requests.keys()):
-            self.user_requests[user_id] = [
-                req_time for req_time in self.user_requests[user_id]
-                if current_time - req_time < self.window_size
-            ]
-            if not self.user_requests[user_id]:
-                del self.user_requests[user_id]
+        current_time = time.monotonic()
+        self._last_sweep = current_time
+
+        for buckets in (self.ip_buckets, self.user_buckets):
+            for key in [k for k, (_, last) in buckets.items()
+                        if current_time - last >= self.window_size]:
+                del buckets[key]
 
 
 def create_rate_limit_middleware(calls_per_minute: int = None, burst_limit: int = None) -> RateLimitMiddleware:
@@ -254,4 +212,4 @@ def create_rate_limit_middleware(calls_per_minute: int = None, burst_limit: int
     Returns:
         RateLimitMiddleware: Instancia del middleware
     """
-    return lambda app: RateLimitMiddleware(app, calls_per_minute, burst_limit)
\ No newline at end of file
+    return lambda app: RateLimitMiddleware(app, calls_per_minute, burst_limit)
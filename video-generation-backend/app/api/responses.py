@@ -0,0 +1,28 @@
+"""
+Custom response classes
+"""
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    Response que serializa un modelo pydantic directamente a bytes JSON.
+
+    El serializador de pydantic-core escribe el JSON en una sola pasada en
+    Rust: sin el model_dump -> revalidación -> orjson.dumps que hace FastAPI
+    con response_model. Pensado para respuestas grandes (audio en base64)
+    cuyo modelo ya se validó al construirse.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        """
+        Serializa el modelo.
+
+        Args:
+            content: Modelo de respuesta ya validado
+
+        Returns:
+            bytes: Cuerpo JSON
+        """
+        return content.__pydantic_serializer__.to_json(content)
@@ -2,7 +2,11 @@
 Audio generation and processing endpoints - Refactored for hexagonal architecture
 """
 import logging
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile
+from fastapi.responses import StreamingResponse
+from openai import APIStatusError
 
 from app.schemas.requests.audio import (
     AudioGenerateRequest, TextToAudioRequest,
@@ -14,6 +18,7 @@ from app.schemas.responses.audio import (
     VoiceListResponse, AudioHealthResponse
 )
 from app.api.middleware.auth import get_current_user, get_user_id
+from app.api.responses import ModelJSONResponse
 from app.application.use_cases.generate_audio import GenerateAudioUseCase
 from app.core.container import get_generate_audio_use_case
 
@@ -21,9 +26,61 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _upstream_http_exception(error: APIStatusError) -> HTTPException:
+    """
+    Traduce un error HTTP de OpenAI a la respuesta del endpoint.
+
+    Los 429 y demás 4xx conservan su código (con Retry-After si OpenAI lo
+    envía) para que el cliente pueda reintentar; los fallos de credenciales
+    (401/403) son de este servidor, no del cliente, y junto con los 5xx se
+    responden como 502.
+
+    Args:
+        error: Error devuelto por la API de OpenAI
+
+    Returns:
+        HTTPException: Excepción lista para lanzar
+    """
+    if error.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+        retry_after = error.response.headers.get("retry-after")
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Límite de peticiones del servicio de audio alcanzado, inténtalo más tarde",
+            headers={"Retry-After": retry_after} if retry_after else None
+        )
+
+    if 400 <= error.status_code < 500 and error.status_code not in (401, 403):
+        return HTTPException(
+            status_code=error.status_code,
+            detail="El servicio de audio rechazó la petición"
+        )
+
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail="Error del servicio de audio"
+    )
+
+
+async def _prepend_chunk(first: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Reenvía un chunk ya leído seguido del resto del stream.
+
+    Args:
+        first: Primer chunk, obtenido antes de enviar los headers
+        chunks: Resto del stream
+
+    Yields:
+        bytes: Chunks del audio en orden
+    """
+    yield first
+    async for chunk in chunks:
+        yield chunk
+
+
 @router.post(
     "/generate",
     response_model=AudioGenerateResponse,
+    response_class=ModelJSONResponse,
     summary="Generate Audio from Script",
     description="Genera audio a partir de un script usando Text-to-Speech"
 )
@@ -46,17 +103,19 @@ async def generate_audio(
         result = await use_case.execute(
             user_id=user_id,
             script_id=request.script_id,
-            voice=request.voice.value,
+            voice=request.voice,
             speed=request.speed,
             save_to_storage=request.save_to_storage
         )
 
         logger.info(f"✅ Audio generado exitosamente: {result.get('audio_size', 0)} bytes")
 
-        return AudioGenerateResponse(
+        # Serialización directa con pydantic-core (el audio en base64 puede
+        # ocupar varios MB)
+        return ModelJSONResponse(AudioGenerateResponse(
             message="Audio generado exitosamente",
             data=result
-        )
+        ))
 
     except ValueError as e:
         logger.warning(f"Error de validación: {str(e)}")
@@ -81,6 +140,7 @@ async def generate_audio(
 @router.post(
     "/text-to-speech",
     response_model=TextToAudioResponse,
+    response_class=ModelJSONResponse,
     summary="Text to Speech",
     description="Convierte texto directamente a audio sin guardar script"
 )
@@ -103,17 +163,17 @@ async def text_to_speech(
         result = await use_case.generate_audio_from_text(
             user_id=user_id,
             text=request.text,
-            voice=request.voice.value,
+            voice=request.voice,
             speed=request.speed,
             save_to_storage=request.save_to_storage
         )
 
         logger.info(f"✅ Texto convertido a audio: {len(request.text)} caracteres")
 
-        return TextToAudioResponse(
+        return ModelJSONResponse(TextToAudioResponse(
             message="Texto convertido a audio exitosamente",
             data=result
-        )
+        ))
 
     except ValueError as e:
         raise HTTPException(
@@ -128,6 +188,79 @@ async def text_to_speech(
         )
 
 
+@router.post(
+    "/text-to-speech/stream",
+    response_class=StreamingResponse,
+    summary="Text to Speech (Stream)",
+    description="Convierte texto a audio y devuelve el MP3 en bruto",
+    responses={200: {"content": {"audio/mpeg": {}}}}
+)
+async def text_to_speech_stream(
+    request: TextToAudioRequest,
+    user_id: str = Depends(get_user_id),
+    use_case: GenerateAudioUseCase = Depends(get_generate_audio_use_case)
+):
+    """
+    Convierte texto a audio y lo sirve como audio/mpeg.
+
+    A diferencia de /text-to-speech no codifica el audio en base64 dentro de
+    un JSON: el MP3 se reenvía al cliente a medida que OpenAI lo genera, y los
+    metadatos viajan en headers (X-Duration estimada, X-Voice-Id).
+
+    - **text**: Texto a convertir (10-3000 caracteres)
+    - **voice**: Voz a utilizar
+    - **speed**: Velocidad del habla
+    """
+    try:
+        logger.info(f"🗣️ Convirtiendo texto a audio (stream) para usuario: {user_id[:8]}...")
+
+        chunks, metadata = await use_case.stream_text(
+            user_id=user_id,
+            text=request.text,
+            voice=request.voice,
+            speed=request.speed
+        )
+
+        # El generador es perezoso: se pide el primer chunk antes de enviar
+        # los headers para que un error de OpenAI se responda con un código
+        # de error (ver los except) en lugar de un 200 con el cuerpo truncado
+        first_chunk = await anext(chunks)
+
+        file_name = f"tts_{request.voice}_{metadata['generated_at'][:19].replace(':', '')}.mp3"
+
+        return StreamingResponse(
+            _prepend_chunk(first_chunk, chunks),
+            media_type="audio/mpeg",
+            headers={
+                "Content-Disposition": f'attachment; filename="{file_name}"',
+                "X-Duration": str(metadata["estimated_duration"]),
+                "X-Filename": file_name,
+                "X-Voice-Id": request.voice
+            }
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except StopAsyncIteration:
+        logger.error("OpenAI cerró el stream de audio sin enviar datos")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="El servicio de audio no devolvió datos"
+        )
+    except APIStatusError as e:
+        logger.error(f"OpenAI respondió {e.status_code} en text-to-speech (stream): {str(e)}")
+        raise _upstream_http_exception(e)
+    except Exception as e:
+        logger.error(f"Error en text-to-speech (stream): {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno en conversión de texto a audio"
+        )
+
+
 @router.post(
     "/transcribe",
     response_model=AudioTranscribeResponse,
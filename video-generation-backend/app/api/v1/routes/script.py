@@ -4,13 +4,16 @@ Script enhancement endpoints - Refactored to use hexagonal architecture
 import logging
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 
-from app.schemas.requests.script import ScriptEnhanceRequest, ScriptListRequest, ScriptUpdateRequest
+from app.schemas.requests.script import (
+    ScriptEnhanceRequest, ScriptEnhanceBatchRequest, ScriptListRequest, ScriptUpdateRequest
+)
 from app.schemas.responses.script import (
-    ScriptEnhanceResponse, ScriptListResponse, ScriptDetailResponse,
-    ScriptStatsResponse, ScriptAnalyticsResponse
+    ScriptEnhanceResponse, ScriptEnhanceBatchResponse, ScriptListResponse, ScriptResponse, ScriptDetailResponse,
+    ScriptDetailData, ScriptStatsResponse, ScriptAnalyticsResponse
 )
 from app.schemas.base import ErrorResponse
 from app.api.middleware.auth import get_current_user, get_user_id
+from app.api.responses import ModelJSONResponse
 from app.application.use_cases.enhance_script import EnhanceScriptUseCase
 from app.core.container import get_enhance_script_use_case
 
@@ -21,6 +24,7 @@ logger = logging.getLogger(__name__)
 @router.post(
     "/enhance",
     response_model=ScriptEnhanceResponse,
+    response_class=ModelJSONResponse,
     summary="Enhance Script with AI",
     description="Mejora un script usando IA, optimizando estructura, ganchos y duración"
 )
@@ -46,20 +50,20 @@ async def enhance_script(
             user_id=user_id,
             original_script=request.script,
             target_duration=request.target_duration,
-            tone=request.tone.value,
-            category=request.category.value,
+            tone=request.tone,
+            category=request.category,
             target_audience=request.target_audience
         )
 
         logger.info(
             f"✅ Script mejorado exitosamente: {result['script_id'][:8]}... "
-            f"({result['enhanced_length']} chars)"
+            f"({len(result['enhanced_script'] or '')} chars)"
         )
 
-        return ScriptEnhanceResponse(
+        return ModelJSONResponse(ScriptEnhanceResponse(
             message="Script mejorado exitosamente",
             data=result
-        )
+        ))
 
     except ValueError as e:
         logger.warning(f"Error de validación: {str(e)}")
@@ -81,9 +85,69 @@ async def enhance_script(
         )
 
 
+@router.post(
+    "/enhance/batch",
+    response_model=ScriptEnhanceBatchResponse,
+    response_class=ModelJSONResponse,
+    summary="Enhance Scripts in Batch",
+    description="Mejora varios scripts en paralelo con resultados parciales por script"
+)
+async def enhance_scripts_batch(
+    request: ScriptEnhanceBatchRequest,
+    user_id: str = Depends(get_user_id),
+    use_case: EnhanceScriptUseCase = Depends(get_enhance_script_use_case)
+):
+    """
+    Mejora varios scripts a la vez (máximo 10).
+
+    Cada script se procesa de forma independiente: los que fallan se devuelven
+    con su error sin afectar al resto.
+
+    - **items**: Lista de scripts con los mismos campos que /enhance
+    """
+    try:
+        logger.info(
+            f"🎯 Mejorando {len(request.items)} scripts para usuario: {user_id[:8]}...")
+
+        results = await use_case.execute_batch(
+            user_id=user_id,
+            items=[
+                {
+                    "original_script": item.script,
+                    "target_duration": item.target_duration,
+                    "tone": item.tone,
+                    "category": item.category,
+                    "target_audience": item.target_audience
+                }
+                for item in request.items
+            ]
+        )
+
+        succeeded = sum(1 for result in results if result["success"])
+        logger.info(f"✅ Scripts mejorados: {succeeded}/{len(results)}")
+
+        return ModelJSONResponse(ScriptEnhanceBatchResponse(
+            message=f"{succeeded} de {len(results)} scripts mejorados",
+            data={
+                "total": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "results": results
+            }
+        ))
+
+    except Exception as e:
+        logger.error(f"Error mejorando scripts en lote: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno procesando los scripts"
+        )
+
+
 @router.get(
     "/",
     response_model=ScriptListResponse,
+    response_class=ModelJSONResponse,
     summary="List User Scripts",
     description="Obtiene la lista de scripts del usuario con paginación y filtros"
 )
@@ -118,9 +182,11 @@ async def list_scripts(
             offset=offset
         )
 
-        # Preparar respuesta paginada
-        response = ScriptListResponse(
-            items=result["scripts"],
+        # Preparar respuesta paginada: los datos vienen de entidades del
+        # dominio, así que se construye sin revalidar cada item
+        response = ScriptListResponse.model_construct(
+            items=tuple(ScriptResponse.from_db_row(item)
+                        for item in result["scripts"]),
             total_count=result["total_count"],
             page=page,
             page_size=page_size,
@@ -128,7 +194,7 @@ async def list_scripts(
         )
 
         logger.info(f"✅ Scripts listados: {len(result['scripts'])} de {result['total_count']}")
-        return response
+        return ModelJSONResponse(response)
 
     except Exception as e:
         logger.error(f"Error listando scripts: {str(e)}")
@@ -141,6 +207,7 @@ async def list_scripts(
 @router.get(
     "/{script_id}",
     response_model=ScriptDetailResponse,
+    response_class=ModelJSONResponse,
     summary="Get Script Details",
     description="Obtiene los detalles completos de un script específico"
 )
@@ -161,10 +228,11 @@ async def get_script(
 
         logger.info(f"✅ Script obtenido exitosamente: {script_id[:8]}...")
 
-        return ScriptDetailResponse(
+        # Datos del repositorio: se construye sin revalidar
+        return ModelJSONResponse(ScriptDetailResponse.model_construct(
             message="Script obtenido exitosamente",
-            data=result
-        )
+            data=ScriptDetailData.from_db_row(result)
+        ))
 
     except ValueError as e:
         logger.warning(f"Script no encontrado: {str(e)}")
@@ -189,6 +257,7 @@ async def get_script(
 @router.put(
     "/{script_id}",
     response_model=ScriptDetailResponse,
+    response_class=ModelJSONResponse,
     summary="Update Script",
     description="Actualiza un script existente manualmente"
 )
@@ -215,10 +284,10 @@ async def update_script(
         # Por ahora retornamos el script actual
         logger.warning("⚠️ Función de actualización no implementada todavía")
 
-        return ScriptDetailResponse(
+        return ModelJSONResponse(ScriptDetailResponse.model_construct(
             message="Script actualizado exitosamente",
-            data=current_script
-        )
+            data=ScriptDetailData.from_db_row(current_script)
+        ))
 
     except ValueError as e:
         raise HTTPException(
@@ -269,6 +338,7 @@ async def delete_script(
 @router.get(
     "/stats/user",
     response_model=ScriptStatsResponse,
+    response_class=ModelJSONResponse,
     summary="User Script Statistics",
     description="Obtiene estadísticas de scripts del usuario"
 )
@@ -292,10 +362,10 @@ async def get_user_script_stats(
             "avg_script_length": 195
         }
 
-        return ScriptStatsResponse(
+        return ModelJSONResponse(ScriptStatsResponse(
             message="Estadísticas obtenidas exitosamente",
             data=mock_stats
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Error obteniendo estadísticas: {str(e)}")
@@ -2,6 +2,7 @@
 Audio Service Interface
 """
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class AudioService(ABC):
@@ -17,6 +18,16 @@ class AudioService(ABC):
         """Genera audio a partir de texto."""
         pass
 
+    @abstractmethod
+    def stream_speech(
+        self,
+        text: str,
+        voice: str = "alloy",
+        speed: float = 1.0
+    ) -> AsyncIterator[bytes]:
+        """Genera audio a partir de texto entregándolo en chunks."""
+        pass
+
     @abstractmethod
     async def transcribe_audio(self, audio_data: bytes) -> str:
         """Transcribe audio a texto."""
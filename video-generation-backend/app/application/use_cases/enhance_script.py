@@ -1,12 +1,17 @@
 """
 Use case for enhancing scripts with AI
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from app.domain.entities.script import Script, ScriptSegment, Tone, Category, SegmentType
+from app.core.config import settings
+
+from app.domain.entities.script import (
+    Script, ScriptSegment, Tone, Category, SegmentType, TONE_VALUES, CATEGORY_VALUES
+)
 from app.domain.entities.user import User
 from app.domain.repositories.script_repository import ScriptRepository
 from app.domain.repositories.user_repository import UserRepository
@@ -105,16 +110,17 @@ class EnhanceScriptUseCase:
             script.keywords = enhancement_result.get('keywords', [])
             script.applied_improvements = enhancement_result.get('mejoras', [])
 
-            # Crear segmentos
-            segmentos_data = enhancement_result.get('segmentos', [])
-            for i, seg_data in enumerate(segmentos_data):
-                segmento = ScriptSegment(
-                    text=seg_data.get('texto', ''),
-                    duration=seg_data.get('duracion', 0),
-                    type=SegmentType(seg_data.get('tipo', 'contenido')),
+            # Crear segmentos (el servicio de IA ya validó que cada segmento
+            # trae texto, duracion y tipo, así que se accede directamente)
+            script.segments = [
+                ScriptSegment(
+                    text=seg_data['texto'],
+                    duration=seg_data['duracion'],
+                    type=SegmentType(seg_data['tipo']),
                     position=i
                 )
-                script.segments.append(segmento)
+                for i, seg_data in enumerate(enhancement_result.get('segmentos', []))
+            ]
 
             # Si no hay segmentos, generarlos automáticamente
             if not script.segments:
@@ -143,8 +149,6 @@ class EnhanceScriptUseCase:
                 "script_id": saved_script.id,
                 "original_script": saved_script.original_text,
                 "enhanced_script": saved_script.enhanced_text,
-                "original_length": saved_script.original_length,
-                "enhanced_length": saved_script.improved_length,
                 "estimated_duration": saved_script.estimated_duration,
                 "target_duration": saved_script.target_duration,
                 "segments": [
@@ -170,6 +174,74 @@ class EnhanceScriptUseCase:
             logger.error(f"Error mejorando script: {str(e)}")
             raise
 
+    async def execute_batch(
+        self,
+        user_id: str,
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Mejora varios scripts en paralelo.
+
+        Las llamadas a OpenAI se lanzan a la vez, limitadas por
+        ENHANCE_BATCH_CONCURRENCY, así que la latencia total es la del
+        script más lento en lugar de la suma.
+
+        Args:
+            user_id: ID del usuario
+            items: Parámetros de execute() por script (sin user_id)
+
+        Returns:
+            List[Dict[str, Any]]: Un resultado por script, en el orden de entrada,
+            con success y data o error
+        """
+        semaphore = asyncio.Semaphore(settings.ENHANCE_BATCH_CONCURRENCY)
+
+        async def enhance_one(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute(user_id=user_id, **item)
+
+        outcomes = await asyncio.gather(
+            *(enhance_one(item) for item in items),
+            return_exceptions=True
+        )
+
+        results = []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, BaseException):
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "error": self._batch_error_message(index, outcome)
+                })
+            else:
+                results.append(
+                    {"index": index, "success": True, "data": outcome})
+
+        return results
+
+    @staticmethod
+    def _batch_error_message(index: int, error: BaseException) -> str:
+        """
+        Convierte el error de un script del lote en un mensaje apto para el cliente.
+
+        Igual que en /enhance, solo los errores de validación y de permisos
+        exponen su mensaje; el detalle del resto se queda en los logs.
+
+        Args:
+            index: Posición del script en el lote
+            error: Excepción producida al mejorarlo
+
+        Returns:
+            str: Mensaje de error para la respuesta
+        """
+        if isinstance(error, (ValueError, PermissionError)):
+            logger.warning(f"Script {index} del lote rechazado: {str(error)}")
+            return str(error)
+
+        logger.error(
+            f"Error mejorando script {index} del lote: {error!r}", exc_info=error)
+        return "Error interno procesando el script"
+
     def _validate_parameters(
         self,
         script: str,
@@ -190,18 +262,13 @@ class EnhanceScriptUseCase:
         if not 15 <= target_duration <= 120:
             raise ValueError("La duración debe estar entre 15 y 120 segundos")
 
-        try:
-            Tone(tone)
-        except ValueError:
-            valid_tones = [t.value for t in Tone]
-            raise ValueError(f"Tono inválido. Opciones válidas: {valid_tones}")
+        if tone not in TONE_VALUES:
+            raise ValueError(
+                f"Tono inválido. Opciones válidas: {sorted(TONE_VALUES)}")
 
-        try:
-            Category(category)
-        except ValueError:
-            valid_categories = [c.value for c in Category]
+        if category not in CATEGORY_VALUES:
             raise ValueError(
-                f"Categoría inválida. Opciones válidas: {valid_categories}")
+                f"Categoría inválida. Opciones válidas: {sorted(CATEGORY_VALUES)}")
 
     async def get_user_scripts(
         self,
@@ -215,7 +282,13 @@ class EnhanceScriptUseCase:
             raise ValueError("Usuario no encontrado")
 
         scripts = await self.script_repository.get_by_user_id(user_id, limit, offset)
-        total_count = await self.script_repository.count({"usuario_id": user_id})
+
+        # Página incompleta (o vacía en la primera página): el total ya se
+        # conoce sin lanzar la query de conteo
+        if (scripts and len(scripts) < limit) or (not scripts and offset == 0):
+            total_count = offset + len(scripts)
+        else:
+            total_count = await self.script_repository.count({"usuario_id": user_id})
 
         return {
             "scripts": [
@@ -223,13 +296,14 @@ class EnhanceScriptUseCase:
                     "id": script.id,
                     "original_script": script.original_text,
                     "enhanced_script": script.enhanced_text,
-                    "duration": script.estimated_duration,
+                    "estimated_duration": script.estimated_duration,
                     "target_duration": script.target_duration,
                     "tone": script.tone.value,
                     "category": script.category.value,
+                    "target_audience": script.target_audience,
                     "keywords": script.keywords,
-                    "created_at": script.created_at.isoformat(),
-                    "quality_score": ScriptDomainService.validar_calidad_script(script).get('score_calidad', 0)
+                    "created_at": script.created_at,
+                    "updated_at": script.updated_at
                 }
                 for script in scripts
             ],
@@ -252,8 +326,6 @@ class EnhanceScriptUseCase:
             "script_id": script.id,
             "original_script": script.original_text,
             "enhanced_script": script.enhanced_text,
-            "original_length": script.original_length,
-            "enhanced_length": script.improved_length,
             "estimated_duration": script.estimated_duration,
             "target_duration": script.target_duration,
             "segments": [
@@ -272,6 +344,6 @@ class EnhanceScriptUseCase:
             "improvements": script.applied_improvements,
             "quality_metrics": quality_metrics,
             "suggestions": ScriptDomainService.sugerir_mejoras(script),
-            "created_at": script.created_at.isoformat(),
-            "updated_at": script.updated_at.isoformat() if script.updated_at else None
+            "created_at": script.created_at,
+            "updated_at": script.updated_at
         }
@@ -1,11 +1,15 @@
 """
 Use case for generating audio from scripts
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 
+import pybase64
+
+from app.domain.entities.video import VOICE_VALUES
 from app.domain.repositories.script_repository import ScriptRepository
 from app.domain.repositories.user_repository import UserRepository
 from app.application.interfaces.audio_service import AudioService
@@ -14,6 +18,122 @@ from app.application.interfaces.storage_service import StorageService
 logger = logging.getLogger(__name__)
 
 
+# Tablas de cabecera MPEG audio (Layer III), indexadas por versión MPEG
+_MP3_BITRATES_KBPS = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),   # MPEG 1
+    2: (22050, 24000, 16000),   # MPEG 2
+    0: (11025, 12000, 8000),    # MPEG 2.5
+}
+
+
+def _mp3_duration(audio_data: bytes) -> Optional[float]:
+    """
+    Calcula la duración de un MP3 leyendo solo las cabeceras de frame.
+
+    Usa la cabecera Xing/Info o VBRI si existe (un solo frame) y si no
+    recorre las cabeceras de los frames sin decodificar el audio.
+
+    Args:
+        audio_data: Contenido MP3
+
+    Returns:
+        Optional[float]: Duración en segundos, o None si no es un MP3 válido
+    """
+    view = memoryview(audio_data)
+    size = len(view)
+    pos = 0
+
+    # Saltar etiqueta ID3v2 si existe
+    if size >= 10 and view[:3] == b"ID3":
+        pos = 10 + ((view[6] & 0x7F) << 21 | (view[7] & 0x7F) << 14 |
+                    (view[8] & 0x7F) << 7 | (view[9] & 0x7F))
+
+    total_samples = 0
+    sample_rate = 0
+    first_frame = True
+
+    while pos + 4 <= size:
+        header = int.from_bytes(view[pos:pos + 4], "big")
+        if header & 0xFFE00000 != 0xFFE00000:
+            if first_frame:
+                pos += 1
+                continue
+            break
+
+        version_bits = (header >> 19) & 0x3
+        layer_bits = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        padding = (header >> 9) & 0x1
+
+        if (version_bits == 1 or layer_bits != 1 or bitrate_index in (0, 15)
+                or rate_index == 3):
+            if first_frame:
+                pos += 1
+                continue
+            break
+
+        is_mpeg1 = version_bits == 3
+        sample_rate = _MP3_SAMPLE_RATES[version_bits][rate_index]
+        bitrate = _MP3_BITRATES_KBPS[1 if is_mpeg1 else 2][bitrate_index] * 1000
+        samples_per_frame = 1152 if is_mpeg1 else 576
+        frame_length = (samples_per_frame // 8) * bitrate // sample_rate + padding
+
+        if first_frame:
+            first_frame = False
+            # Cabecera Xing/Info: contiene el número total de frames
+            channel_mode = (header >> 6) & 0x3
+            if is_mpeg1:
+                side_info = 17 if channel_mode == 3 else 32
+            else:
+                side_info = 9 if channel_mode == 3 else 17
+            tag_pos = pos + 4 + side_info
+            tag = bytes(view[tag_pos:tag_pos + 4])
+            if tag in (b"Xing", b"Info"):
+                flags = int.from_bytes(view[tag_pos + 4:tag_pos + 8], "big")
+                if flags & 0x1:
+                    frames = int.from_bytes(
+                        view[tag_pos + 8:tag_pos + 12], "big")
+                    return round(frames * samples_per_frame / sample_rate, 2)
+
+            # Cabecera VBRI (Fraunhofer): siempre 32 bytes tras la cabecera
+            vbri_pos = pos + 36
+            if bytes(view[vbri_pos:vbri_pos + 4]) == b"VBRI":
+                frames = int.from_bytes(
+                    view[vbri_pos + 14:vbri_pos + 18], "big")
+                return round(frames * samples_per_frame / sample_rate, 2)
+
+        total_samples += samples_per_frame
+        pos += frame_length
+
+    if not sample_rate or not total_samples:
+        return None
+
+    return round(total_samples / sample_rate, 2)
+
+
+async def _encode_base64(audio_data: bytes) -> bytes:
+    """
+    Codifica el audio en base64 fuera del event loop.
+
+    pybase64 usa SIMD y libera el GIL, así que un MP3 de varios MB no
+    bloquea al resto de requests mientras se codifica. Se devuelven los
+    bytes ASCII tal cual: el serializador de la respuesta los escribe como
+    string JSON sin pasar por un str intermedio.
+
+    Args:
+        audio_data: Audio en bytes
+
+    Returns:
+        bytes: Audio en base64 (ASCII puro)
+    """
+    return await asyncio.to_thread(pybase64.b64encode, audio_data)
+
+
 class GenerateAudioUseCase:
     """
     Caso de uso para generar audio a partir de scripts.
@@ -91,9 +211,9 @@ class GenerateAudioUseCase:
                 speed=speed
             )
 
-            # Calcular duración estimada (aproximada)
-            estimated_duration = self._estimate_audio_duration(
-                text_to_convert, speed)
+            # Duración desde las cabeceras MP3 (estimada si no se puede leer)
+            estimated_duration = await self._audio_duration(
+                audio_data, text_to_convert, speed)
 
             result = {
                 "script_id": script_id,
@@ -116,9 +236,7 @@ class GenerateAudioUseCase:
                 logger.info(f"Audio guardado en storage: {audio_url}")
             else:
                 # Retornar audio como base64 si no se guarda
-                import base64
-                result["audio_base64"] = base64.b64encode(
-                    audio_data).decode('utf-8')
+                result["audio_base64"] = await _encode_base64(audio_data)
                 result["stored"] = False
 
             # Actualizar actividad del usuario
@@ -153,21 +271,52 @@ class GenerateAudioUseCase:
         Returns:
             Dict con información del audio generado
         """
-        # Validar usuario
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
-            raise ValueError("Usuario no encontrado")
+        audio_data, result = await self.synthesize_text(
+            user_id=user_id,
+            text=text,
+            voice=voice,
+            speed=speed
+        )
 
-        # Validar texto
-        if not text or not text.strip():
-            raise ValueError("El texto no puede estar vacío")
+        try:
+            if save_to_storage:
+                # Generar ID único para el archivo
+                temp_id = str(uuid.uuid4())
+                audio_url = await self._save_audio_to_storage(
+                    user_id, temp_id, audio_data, voice, prefix="text_audio"
+                )
+                result["audio_url"] = audio_url
+                result["stored"] = True
+            else:
+                result["audio_base64"] = await _encode_base64(audio_data)
+                result["stored"] = False
 
-        if len(text.strip()) > 3000:
-            raise ValueError(
-                "El texto es demasiado largo (máximo 3000 caracteres)")
+            return result
 
-        # Validar parámetros
-        self._validate_parameters(voice, speed)
+        except Exception as e:
+            logger.error(f"Error generando audio desde texto: {str(e)}")
+            raise
+
+    async def synthesize_text(
+        self,
+        user_id: str,
+        text: str,
+        voice: str = "alloy",
+        speed: float = 1.0
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Genera el audio completo de un texto y lo devuelve en bruto.
+
+        Args:
+            user_id: ID del usuario
+            text: Texto a convertir
+            voice: Voz a utilizar
+            speed: Velocidad del habla
+
+        Returns:
+            Tuple[bytes, Dict[str, Any]]: Audio MP3 y metadatos del audio
+        """
+        await self._validate_text_request(user_id, text, voice, speed)
 
         try:
             logger.info(f"Generando audio desde texto para usuario: {user_id}")
@@ -179,9 +328,9 @@ class GenerateAudioUseCase:
                 speed=speed
             )
 
-            estimated_duration = self._estimate_audio_duration(text, speed)
+            estimated_duration = await self._audio_duration(audio_data, text, speed)
 
-            result = {
+            metadata = {
                 "text_length": len(text),
                 "voice": voice,
                 "speed": speed,
@@ -190,29 +339,85 @@ class GenerateAudioUseCase:
                 "generated_at": datetime.utcnow().isoformat()
             }
 
-            if save_to_storage:
-                # Generar ID único para el archivo
-                temp_id = str(uuid.uuid4())
-                audio_url = await self._save_audio_to_storage(
-                    user_id, temp_id, audio_data, voice, prefix="text_audio"
-                )
-                result["audio_url"] = audio_url
-                result["stored"] = True
-            else:
-                import base64
-                result["audio_base64"] = base64.b64encode(
-                    audio_data).decode('utf-8')
-                result["stored"] = False
-
             # Actualizar actividad del usuario
             await self.user_repository.update_last_activity(user_id, datetime.utcnow())
 
-            return result
+            return audio_data, metadata
 
         except Exception as e:
             logger.error(f"Error generando audio desde texto: {str(e)}")
             raise
 
+    async def stream_text(
+        self,
+        user_id: str,
+        text: str,
+        voice: str = "alloy",
+        speed: float = 1.0
+    ) -> Tuple[AsyncIterator[bytes], Dict[str, Any]]:
+        """
+        Prepara la generación de audio de un texto en streaming.
+
+        La validación ocurre antes de devolver el iterador, de modo que los
+        errores de entrada se pueden responder con un 4xx antes de empezar a
+        enviar audio. Los chunks se producen a medida que llegan de OpenAI.
+
+        Args:
+            user_id: ID del usuario
+            text: Texto a convertir
+            voice: Voz a utilizar
+            speed: Velocidad del habla
+
+        Returns:
+            Tuple[AsyncIterator[bytes], Dict[str, Any]]: Chunks MP3 y metadatos
+            (la duración es estimada: el audio aún no existe)
+        """
+        await self._validate_text_request(user_id, text, voice, speed)
+
+        logger.info(f"Generando audio en streaming para usuario: {user_id}")
+
+        metadata = {
+            "text_length": len(text),
+            "voice": voice,
+            "speed": speed,
+            "estimated_duration": self._estimate_audio_duration(text, speed),
+            "generated_at": datetime.utcnow().isoformat()
+        }
+
+        # Actualizar actividad del usuario
+        await self.user_repository.update_last_activity(user_id, datetime.utcnow())
+
+        chunks = self.audio_service.stream_speech(
+            text=text.strip(),
+            voice=voice,
+            speed=speed
+        )
+        return chunks, metadata
+
+    async def _validate_text_request(
+        self,
+        user_id: str,
+        text: str,
+        voice: str,
+        speed: float
+    ) -> None:
+        """Valida usuario, texto y parámetros de una conversión texto-audio."""
+        # Validar usuario
+        user = await self.user_repository.get_by_id(user_id)
+        if not user:
+            raise ValueError("Usuario no encontrado")
+
+        # Validar texto
+        if not text or not text.strip():
+            raise ValueError("El texto no puede estar vacío")
+
+        if len(text.strip()) > 3000:
+            raise ValueError(
+                "El texto es demasiado largo (máximo 3000 caracteres)")
+
+        # Validar parámetros
+        self._validate_parameters(voice, speed)
+
     async def transcribe_audio(
         self,
         user_id: str,
@@ -264,13 +469,26 @@ class GenerateAudioUseCase:
 
     def _validate_parameters(self, voice: str, speed: float) -> None:
         """Valida los parámetros de generación de audio."""
-        valid_voices = ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
-        if voice not in valid_voices:
-            raise ValueError(f"Voz inválida. Opciones válidas: {valid_voices}")
+        if voice not in VOICE_VALUES:
+            raise ValueError(
+                f"Voz inválida. Opciones válidas: {sorted(VOICE_VALUES)}")
 
         if not 0.25 <= speed <= 4.0:
             raise ValueError("La velocidad debe estar entre 0.25 y 4.0")
 
+    async def _audio_duration(self, audio_data: bytes, text: str, speed: float) -> float:
+        """
+        Obtiene la duración real del MP3 desde sus cabeceras.
+
+        Recorrer miles de cabeceras de frame es CPU puro, así que se ejecuta
+        en un hilo para no bloquear el event loop. Si el audio no se puede
+        analizar recurre a la estimación por texto.
+        """
+        duration = await asyncio.to_thread(_mp3_duration, audio_data)
+        if duration is None:
+            return self._estimate_audio_duration(text, speed)
+        return duration
+
     def _estimate_audio_duration(self, text: str, speed: float) -> float:
         """Estima la duración del audio basada en el texto y velocidad."""
         # Estimación: ~2 palabras por segundo a velocidad normal
@@ -288,9 +506,14 @@ class GenerateAudioUseCase:
         prefix: str = "script_audio"
     ) -> str:
         """Guarda el audio en el storage y retorna la URL."""
-        # Crear ruta del archivo
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        file_path = f"audio/{user_id}/{prefix}_{content_id}_{voice}_{timestamp}.mp3"
+        # Crear ruta del archivo, particionada por mes para que ninguna
+        # carpeta del usuario crezca sin límite (listados y borrados por
+        # prefijo siguen siendo baratos con miles de audios)
+        now = datetime.utcnow()
+        file_path = (
+            f"audio/{user_id}/{now:%Y/%m}/"
+            f"{prefix}_{content_id}_{voice}_{now:%Y%m%d_%H%M%S}.mp3"
+        )
 
         # Subir a storage
         audio_url = await self.storage_service.upload_file(
@@ -14,11 +14,37 @@ Configuración centralizada usando Pydantic v2
 - Propiedades calculan valores derivados
 """
 
-from typing import List
+import os
+from functools import cached_property
+from typing import Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
+# Tope de workers por defecto: cada worker duplica caches en proceso, pools
+# de conexiones y rate limiters
+DEFAULT_MAX_WORKERS = 4
+
+
+def _default_workers() -> int:
+    """
+    Calcula el número de workers por defecto.
+
+    Usa las CPUs asignadas al proceso (sched_getaffinity respeta cpusets de
+    contenedores, os.cpu_count() devuelve las del host) con un tope
+    conservador.
+
+    Returns:
+        int: Workers entre 1 y DEFAULT_MAX_WORKERS
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # macOS/Windows no exponen sched_getaffinity
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, DEFAULT_MAX_WORKERS))
+
+
 class Settings(BaseSettings):
     """Settings centralizadas usando Pydantic v2."""
 
@@ -37,6 +63,9 @@ class Settings(BaseSettings):
     # ============= API CONFIGURATION =============
     API_HOST: str = Field(default="0.0.0.0", description="API host")
     API_PORT: int = Field(default=8000, description="API port")
+    UVICORN_WORKERS: int = Field(
+        default_factory=_default_workers,
+        description="Uvicorn worker processes, one per assigned CPU up to 4 by default (ignored with reload)")
     API_V1_PREFIX: str = "/api/v1"
 
     # ============= CORS CONFIGURATION =============
@@ -51,8 +80,22 @@ class Settings(BaseSettings):
                               description="OpenAI model")
     TEMPERATURE: float = Field(default=0.7, description="OpenAI temperature")
     MAX_TOKENS: int = Field(default=1500, description="Max tokens for OpenAI")
+    ENHANCE_BATCH_CONCURRENCY: int = Field(
+        default=8, description="Max concurrent OpenAI calls per batch enhancement")
+    OPENAI_CHAT_RPM: int = Field(
+        default=500, description="Account-wide chat completion requests per minute, split evenly across UVICORN_WORKERS (0 disables)")
+    ENHANCEMENT_CACHE_SIZE: int = Field(
+        default=512, description="Max enhanced scripts kept in the in-process cache")
+    ENHANCEMENT_CACHE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600, description="Enhanced script cache TTL in seconds")
     # TTS Configuration
     TTS_MODEL: str = Field(default="gpt-4o-mini-tts", description="TTS model")
+    TTS_RPM: int = Field(
+        default=500, description="Account-wide TTS requests per minute, split evenly across UVICORN_WORKERS (0 disables)")
+    TTS_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, description="Max MP3 bytes kept in the in-process TTS cache")
+    TTS_CACHE_TTL_SECONDS: int = Field(
+        default=24 * 3600, description="TTS cache TTL in seconds")
 
     # ============= SUPABASE CONFIGURATION =============
     SUPABASE_URL: str = Field(default="", description="Supabase URL")
@@ -88,6 +131,8 @@ class Settings(BaseSettings):
         default="all-mpnet-base-v2", description="Embedding model")
     EMBEDDING_DIMENSION: int = Field(
         default=768, description="Embedding dimension")
+    EMBEDDING_CACHE_SIZE: int = Field(
+        default=2048, description="Max embeddings kept in the in-process cache")
 
     # ============= FILE UPLOAD CONFIGURATION =============
     MAX_FILE_SIZE_MB: int = Field(
@@ -123,6 +168,19 @@ class Settings(BaseSettings):
 
     # ============= PROPIEDADES CALCULADAS =============
 
+    @property
+    def worker_count(self) -> int:
+        """
+        Número de workers con el que se lanza el servidor
+
+        Lo usan main.py, gunicorn.conf.py y el reparto del límite RPM de
+        OpenAI entre workers, para que no puedan divergir.
+
+        Returns:
+            int: 1 en DEBUG (reload), UVICORN_WORKERS en otro caso
+        """
+        return 1 if self.DEBUG else self.UVICORN_WORKERS
+
     @property
     def openai_configured(self) -> bool:
         """
@@ -143,17 +201,17 @@ class Settings(BaseSettings):
         """
         return bool(self.SUPABASE_URL and self.SUPABASE_ANON_KEY)
 
-    @property
-    def cors_origins_list(self) -> List[str]:
+    @cached_property
+    def cors_origins_list(self) -> Tuple[str, ...]:
         """
-        Obtiene la lista de orígenes CORS
+        Obtiene los orígenes CORS (se calcula una sola vez)
 
         Returns:
-            List[str]: Lista de orígenes permitidos para CORS
+            Tuple[str, ...]: Orígenes permitidos para CORS
         """
         if isinstance(self.CORS_ORIGINS, str):
-            return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
-        return self.CORS_ORIGINS
+            return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(","))
+        return tuple(self.CORS_ORIGINS)
 
     @property
     def jwt_configured(self) -> bool:
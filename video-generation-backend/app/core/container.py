@@ -13,11 +13,11 @@ Dependency Injection Container
 - Agregados mock services completos
 - Mejorada gestión de errores
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, Optional
 
 from .config import settings
-from .database import get_db
 
 # Domain repositories interfaces
 from app.domain.repositories.user_repository import UserRepository
@@ -32,7 +32,8 @@ from app.infrastructure.database.repositories.supabase_video_repository import S
 from app.infrastructure.database.repositories.supabase_clip_repository import SupabaseClipRepository
 from app.infrastructure.database.repositories.supabase_credit_repository import SupabaseCreditRepository
 from app.infrastructure.database.repositories.in_memory_script_repository import InMemoryScriptRepository
-from app.infrastructure.external.supabase.client import SupabaseClient
+from app.infrastructure.external.supabase.client import get_supabase_client
+from app.infrastructure.external.openai.client import get_openai_client
 from app.infrastructure.external.openai.service import OpenAIScriptService, OpenAIAudioService
 
 # Application use cases
@@ -115,6 +116,8 @@ class DependencyContainer:
             if not settings.openai_configured:
                 raise ValueError("OpenAI no está configurado correctamente")
 
+            # Cliente compartido (un solo pool keep-alive) por ambos servicios
+            self._instances['openai_client'] = get_openai_client()
             self._instances['openai_script_service'] = OpenAIScriptService()
             self._instances['openai_audio_service'] = OpenAIAudioService()
             logger.info("✅ OpenAI services inicializados")
@@ -130,7 +133,7 @@ class DependencyContainer:
             if not settings.supabase_configured:
                 raise ValueError("Supabase no está configurado correctamente")
 
-            self._instances['supabase_client'] = SupabaseClient()
+            self._instances['supabase_client'] = get_supabase_client()
             logger.info("✅ Supabase client inicializado")
 
         except Exception as e:
@@ -179,3 +182,141 @@ class DependencyContainer:
             self._initialization_errors['repositories'] = error_msg
             logger.error(f"❌ {error_msg}")
             raise
+
+    def _verify_services_health(self) -> None:
+        """Comprueba que los servicios críticos quedaron registrados."""
+        for name in ('openai_script_service', 'supabase_client'):
+            if self._instances.get(name) is None:
+                raise RuntimeError(f"Servicio crítico no disponible: {name}")
+
+    def _log_initialization_summary(self) -> None:
+        """Registra los errores acumulados durante la inicialización."""
+        for service, error in self._initialization_errors.items():
+            logger.error(f"❌ {service}: {error}")
+
+    def get(self, name: str) -> Any:
+        """
+        Obtiene una dependencia registrada.
+
+        Args:
+            name: Nombre de la dependencia
+
+        Returns:
+            Any: Instancia registrada o None si no existe
+        """
+        return self._instances.get(name)
+
+    async def shutdown(self) -> None:
+        """
+        Cierra los pools de conexiones de los clientes externos.
+
+        Se llama desde el lifespan al apagar la aplicación.
+        """
+        for name in ('openai_client', 'supabase_client'):
+            client = self._instances.get(name)
+            if client is None:
+                continue
+            try:
+                await client.close()
+                logger.info(f"🔌 {name} cerrado")
+            except Exception as e:
+                logger.error(f"❌ Error cerrando {name}: {str(e)}")
+
+        # Los clientes cerrados no deben reutilizarse: se descartan las
+        # instancias cacheadas para que un nuevo initialize() cree otras
+        get_openai_client.cache_clear()
+        get_supabase_client.cache_clear()
+        self._instances = {}
+        self._initialized = False
+
+
+container = DependencyContainer()
+
+
+def get_enhance_script_use_case() -> EnhanceScriptUseCase:
+    """
+    Dependencia FastAPI del caso de uso de mejora de scripts.
+
+    Returns:
+        EnhanceScriptUseCase: Caso de uso con las dependencias del container
+    """
+    return EnhanceScriptUseCase(
+        script_repository=container.get('script_repository'),
+        user_repository=container.get('user_repository'),
+        ai_service=container.get('openai_script_service')
+    )
+
+
+def get_generate_audio_use_case() -> GenerateAudioUseCase:
+    """
+    Dependencia FastAPI del caso de uso de generación de audio.
+
+    SupabaseClient implementa las operaciones de StorageService que usa el
+    caso de uso (upload_file, delete_file).
+
+    Returns:
+        GenerateAudioUseCase: Caso de uso con las dependencias del container
+    """
+    return GenerateAudioUseCase(
+        script_repository=container.get('script_repository'),
+        user_repository=container.get('user_repository'),
+        audio_service=container.get('openai_audio_service'),
+        storage_service=container.get('supabase_client')
+    )
+
+
+# Tiempo máximo por servicio para que uno lento no bloquee la sonda
+HEALTH_CHECK_TIMEOUT_SECONDS = 1.0
+
+
+async def _check_service(name: str, health_check: Optional[Callable[[], Awaitable[bool]]]) -> str:
+    """
+    Ejecuta el health check de un servicio con timeout.
+
+    Args:
+        name: Nombre del servicio (para logs)
+        health_check: Función async del servicio o None si no está registrado
+
+    Returns:
+        str: "healthy" o "unhealthy"
+    """
+    if health_check is None:
+        return "unhealthy"
+
+    try:
+        healthy = await asyncio.wait_for(health_check(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+        return "healthy" if healthy else "unhealthy"
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Health check de {name} superó {HEALTH_CHECK_TIMEOUT_SECONDS}s")
+        return "unhealthy"
+    except Exception as e:
+        logger.error(f"❌ Health check de {name} falló: {str(e)}")
+        return "unhealthy"
+
+
+async def check_services_health() -> Dict[str, str]:
+    """
+    Comprueba el estado de los servicios externos en paralelo.
+
+    Returns:
+        Dict[str, str]: Estado por servicio y estado general en "overall"
+    """
+    openai_service = container.get('openai_script_service')
+    supabase_client = container.get('supabase_client')
+
+    # La latencia de la sonda es la del servicio más lento, no la suma
+    openai_status, supabase_status = await asyncio.gather(
+        _check_service('openai', openai_service.client.health_check if openai_service else None),
+        _check_service('supabase', supabase_client.health_check if supabase_client else None)
+    )
+
+    services: Dict[str, str] = {
+        'openai': openai_status,
+        'supabase': supabase_status,
+        'jwt': "configured" if settings.jwt_configured else "not_configured"
+    }
+
+    services['overall'] = "healthy" if services['openai'] == "healthy" and \
+        services['supabase'] == "healthy" else "degraded"
+
+    return services
@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from .config import settings
+from .container import container
 from .database import db_manager
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,13 @@ async def lifespan(app: FastAPI):
     db_manager.initialize()
     db_manager.create_tables()
 
+    # Inicializar el container una sola vez, antes de aceptar requests
+    try:
+        container.initialize()
+    except RuntimeError as e:
+        # La app arranca igualmente; /health reportará los servicios caídos
+        logger.error(f"Container initialization failed: {str(e)}")
+
     # Verificar configuraciones críticas
     if not settings.openai_configured:
         logger.warning("OpenAI is not properly configured")
@@ -36,6 +44,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown events
     logger.info("Shutting down Video Generation API")
+
+    # Cerrar los pools de conexiones compartidos (OpenAI, Supabase Storage)
+    await container.shutdown()
     logger.info("Application shutdown complete")
 
 
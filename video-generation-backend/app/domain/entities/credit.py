@@ -2,7 +2,7 @@
 Entidad de dominio para la gestión de clips de video.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -37,7 +37,7 @@ class CreditTransaction:
     credit_pack_id: Optional[str] = None
     price_paid_eur: Optional[Decimal] = None
     description: Optional[str] = None
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: Optional[datetime] = None
 
     def __post_init__(self):
@@ -38,6 +38,12 @@ class Category(str, Enum):
     NEWS = "news"
 
 
+# Valores válidos precalculados: las validaciones del servicio comprueban
+# pertenencia contra un frozenset en lugar de construir el Enum
+TONE_VALUES = frozenset(t.value for t in Tone)
+CATEGORY_VALUES = frozenset(c.value for c in Category)
+
+
 @dataclass
 class ScriptSegment:
     """Representa un segmento de un script."""
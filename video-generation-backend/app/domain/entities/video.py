@@ -7,11 +7,13 @@ y toda la metadata relevante para el proceso de creación y análisis posterior.
 
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from .script import Tone, Category
+
 
 # ============= ENUMS =============
 
@@ -27,27 +29,10 @@ class VideoStatus(str, Enum):
     FAILED = "failed"
 
 
-class VideoTone(str, Enum):
-    """Tono del video."""
-    EDUCATIVO = "educativo"
-    VIRAL = "viral"
-    PROFESIONAL = "profesional"
-    CASUAL = "casual"
-    ENERGETICO = "energetico"
-
-
-class VideoCategory(str, Enum):
-    """Categoría del contenido."""
-    TECH = "tech"
-    MARKETING = "marketing"
-    EDUCATION = "education"
-    ENTERTAINMENT = "entertainment"
-    LIFESTYLE = "lifestyle"
-    BUSINESS = "business"
-    FITNESS = "fitness"
-    FOOD = "food"
-    TRAVEL = "travel"
-    NEWS = "news"
+# Tono y categoría son los mismos conceptos que en Script: se reutilizan sus
+# enums en lugar de redefinirlos (los nombres Video* se mantienen como alias)
+VideoTone = Tone
+VideoCategory = Category
 
 
 class VoiceId(str, Enum):
@@ -60,6 +45,9 @@ class VoiceId(str, Enum):
     SHIMMER = "shimmer"
 
 
+VOICE_VALUES = frozenset(v.value for v in VoiceId)
+
+
 # ============= VALUE OBJECTS =============
 
 @dataclass
@@ -128,11 +116,11 @@ class Video:
     audio_url: Optional[str] = None
 
     # Clips y configuración
-    clips_used: List[SelectedClip] = []
+    clips_used: List[SelectedClip] = field(default_factory=list)
     tone: VideoTone = VideoTone.CASUAL
     category: VideoCategory = VideoCategory.TECH
     voice_id: VoiceId = VoiceId.NOVA
-    template_config: Dict[str, Any] = {}
+    template_config: Dict[str, Any] = field(default_factory=dict)
 
     # Processing status
     status: VideoStatus = VideoStatus.CREATED
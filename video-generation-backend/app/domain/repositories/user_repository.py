@@ -129,12 +129,13 @@ class UserRepository(BaseRepository[User]):
         pass
 
     @abstractmethod
-    async def get_inactive_users(self, days_inactive: int = 30) -> List[User]:
+    async def get_inactive_users(self, days_inactive: int = 30, limit: int = 100) -> List[User]:
         """
         Obtiene usuarios inactivos por X días.
 
         Args:
             days_inactive (int): Número de días sin actividad para considerar inactivo. 30 por defecto.
+            limit (int): Número máximo de usuarios a retornar. 100 por defecto.
 
         Returns:
             List[User]: Lista de usuarios inactivos.
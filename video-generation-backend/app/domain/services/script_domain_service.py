@@ -158,11 +158,11 @@ class ScriptDomainService:
         validaciones['duracion_objetivo'] = script.achieves_target_duration()
 
         # Validar segmentos
+        # Una sola pasada extrae la columna de tipos; el resto son lookups
+        tipos_segmento = {s.type for s in script.segments}
         validaciones['tiene_segmentos'] = len(script.segments) > 0
-        validaciones['tiene_hook'] = any(
-            s.type == SegmentType.HOOK for s in script.segments)
-        validaciones['tiene_cta'] = any(
-            s.type == SegmentType.CTA for s in script.segments)
+        validaciones['tiene_hook'] = SegmentType.HOOK in tipos_segmento
+        validaciones['tiene_cta'] = SegmentType.CTA in tipos_segmento
 
         # Calcular densidad de palabras clave
         total_palabras = len(script.enhanced_text.split())
@@ -1,5 +1,25 @@
+import sys
 from datetime import datetime
+from typing import List, Optional
 from app.domain.entities.clip import AssetClip, MotionIntensity, SceneType, ProcessingStatus, VideoOrientation
+from app.infrastructure.database.utils import parse_pgvector
+
+
+def _intern_tags(tags: Optional[List[str]]) -> List[str]:
+    """
+    Interna los tags de un clip.
+
+    Los mismos tags ("technology", "professional", colores...) se repiten en
+    casi todas las filas: cada lote de clips comparte un único str por valor
+    en lugar de uno por fila, y las comparaciones posteriores son por puntero.
+
+    Args:
+        tags: Tags de la fila (None si la columna viene vacía)
+
+    Returns:
+        List[str]: Tags internados
+    """
+    return [sys.intern(tag) for tag in tags] if tags else []
 
 
 class AssetClipModel:
@@ -11,13 +31,14 @@ class AssetClipModel:
         self.duration = data['duration']
         self.resolution = data.get('resolution', '1920x1080')
         self.format = data.get('format', 'mp4')
-        self.concept_tags = data.get('concept_tags', [])
-        self.emotion_tags = data.get('emotion_tags', [])
+        self.concept_tags = _intern_tags(data.get('concept_tags'))
+        self.emotion_tags = _intern_tags(data.get('emotion_tags'))
         self.scene_type = data.get('scene_type', 'medium')
-        self.dominant_colors = data.get('dominant_colors', [])
+        self.dominant_colors = _intern_tags(data.get('dominant_colors'))
         self.description = data.get('description')
-        self.keywords = data.get('keywords', [])
-        self.embedding = data.get('embedding')
+        self.keywords = _intern_tags(data.get('keywords'))
+        # pgvector devuelve el vector como string "[0.1,0.2,...]" o como lista
+        self.embedding = parse_pgvector(data.get('embedding'))
         self.quality_score = data.get('quality_score', 5.0)
         self.motion_intensity = data.get('motion_intensity', 'medium')
         self.audio_present = data.get('audio_present', False)
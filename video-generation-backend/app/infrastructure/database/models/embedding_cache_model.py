@@ -7,6 +7,8 @@ import hashlib
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.infrastructure.database.utils import parse_pgvector
+
 
 class EmbeddingCacheModel:
     """Modelo simple para mapear cache de embeddings entre BD y aplicación."""
@@ -25,22 +27,8 @@ class EmbeddingCacheModel:
         Returns:
             List[float] Lista de floats o None si error
         """
-        if not self.db_row.get('embedding'):
-            return None
-
         try:
-            embedding_raw = self.db_row['embedding']
-
-            # Ya es lista
-            if isinstance(embedding_raw, list):
-                return [float(x) for x in embedding_raw]
-
-            # String formato pgvector "[0.1,0.2,0.3]"
-            if isinstance(embedding_raw, str):
-                embedding_str = embedding_raw.strip().strip('[]')
-                return [float(x.strip()) for x in embedding_str.split(',')]
-
-            return None
+            return parse_pgvector(self.db_row.get('embedding'))
 
         except (ValueError, TypeError):
             return None
@@ -11,6 +11,31 @@ from app.domain.entities.video import (
     Video, VideoStatus, VideoTone, VideoCategory, VoiceId,
     SelectedClip, ProcessingMetadata, EngagementMetrics
 )
+from app.infrastructure.database.utils import parse_pgvector
+
+
+# Tablas valor -> miembro precalculadas: evitan pasar por EnumMeta.__call__
+# en cada fila al hidratar listados de videos
+_VIDEO_TONES = {member.value: member for member in VideoTone}
+_VIDEO_CATEGORIES = {member.value: member for member in VideoCategory}
+_VOICE_IDS = {member.value: member for member in VoiceId}
+_VIDEO_STATUSES = {member.value: member for member in VideoStatus}
+
+
+def _enum_from_value(lookup: Dict[str, Any], enum_cls: Any, value: Any) -> Any:
+    """
+    Resuelve un miembro de enum usando la tabla precalculada.
+
+    Args:
+        lookup: Tabla valor -> miembro del enum
+        enum_cls: Clase del enum (se usa como fallback para validar)
+        value: Valor almacenado en BD
+
+    Returns:
+        Miembro del enum correspondiente
+    """
+    member = lookup.get(value)
+    return member if member is not None else enum_cls(value)
 
 
 class VideoModel:
@@ -92,17 +117,8 @@ class VideoModel:
                     self.db_row['template_config'])
 
             # Parse script_embedding (VECTOR -> List[float])
-            script_embedding = None
-            if self.db_row.get('script_embedding'):
-                # pgvector devuelve como string "[0.1,0.2,0.3]" o como lista
-                embedding_raw = self.db_row['script_embedding']
-                if isinstance(embedding_raw, str):
-                    # Limpiar y parsear string vector
-                    embedding_str = embedding_raw.strip('[]')
-                    script_embedding = [float(x.strip())
-                                        for x in embedding_str.split(',')]
-                elif isinstance(embedding_raw, list):
-                    script_embedding = [float(x) for x in embedding_raw]
+            script_embedding = parse_pgvector(
+                self.db_row.get('script_embedding'))
 
             # Crear entidad Video
             return Video(
@@ -129,13 +145,17 @@ class VideoModel:
 
                 # Clips y configuración
                 clips_used=clips_used,
-                tone=VideoTone(self.db_row['tone']),
-                category=VideoCategory(self.db_row['category']),
-                voice_id=VoiceId(self.db_row.get('voice_id', 'nova')),
+                tone=_enum_from_value(
+                    _VIDEO_TONES, VideoTone, self.db_row['tone']),
+                category=_enum_from_value(
+                    _VIDEO_CATEGORIES, VideoCategory, self.db_row['category']),
+                voice_id=_enum_from_value(
+                    _VOICE_IDS, VoiceId, self.db_row.get('voice_id', 'nova')),
                 template_config=template_config,
 
                 # Processing status
-                status=VideoStatus(self.db_row['status']),
+                status=_enum_from_value(
+                    _VIDEO_STATUSES, VideoStatus, self.db_row['status']),
                 processing_metadata=processing_metadata,
                 error_message=self.db_row.get('error_message'),
 
@@ -279,7 +279,7 @@ class InMemoryScriptRepository(ScriptRepository):
             "newest_script": max([s.created_at for s in self._scripts.values()], default=None)
         }
 
-    def clear_old_scripts(self, hours: int = 24) -> int:
+    async def clear_old_scripts(self, hours: int = 24) -> int:
         """
         Limpia scripts antiguos para liberar memoria.
 
@@ -6,6 +6,7 @@ from app.infrastructure.database.models.asset_clip_model import AssetClipModel
 from app.infrastructure.database.models.video_clip_model import VideoClipModel
 from app.domain.entities.clip import AssetClip, VideoClip
 from typing import List, Optional
+import asyncio
 import logging
 
 
@@ -57,8 +58,8 @@ class SupabaseClipRepository(ClipRepository):
             clip_data['emotion_tags'] = "{" + \
                 ",".join(clip_data.get('emotion_tags', [])) + "}"
 
-            result = self.client.table(
-                "asset_clips").insert(clip_data).execute()
+            result = await asyncio.to_thread(self.client.table(
+                "asset_clips").insert(clip_data).execute)
             # Ensure result.data[0] is a dict, not a model instance
             return AssetClipModel(dict(result.data[0])).to_entity()
 
@@ -80,8 +81,8 @@ class SupabaseClipRepository(ClipRepository):
             clip = await repository.get_by_id("some-clip-id")
         """
         try:
-            result = self.client.table("asset_clips").select(
-                "*").eq("id", id).single().execute()
+            result = await asyncio.to_thread(self.client.table("asset_clips").select(
+                "*").eq("id", id).single().execute)
 
             if not result.data:
                 return None
@@ -114,8 +115,8 @@ class SupabaseClipRepository(ClipRepository):
                 ",".join(clip_data.get('concept_tags', [])) + "}"
             clip_data['emotion_tags'] = "{" + \
                 ",".join(clip_data.get('emotion_tags', [])) + "}"
-            result = self.client.table(
-                "asset_clips").update(clip_data).eq("id", entity.id).execute()
+            result = await asyncio.to_thread(self.client.table(
+                "asset_clips").update(clip_data).eq("id", entity.id).execute)
             return AssetClipModel(dict(result.data[0])).to_entity()
 
         except Exception as e:
@@ -164,24 +165,18 @@ class SupabaseClipRepository(ClipRepository):
             }
 
             # Llamar a la función SQL personalizada
-            result = self.client.rpc(
+            result = await asyncio.to_thread(self.client.rpc(
                 'search_asset_clips',
                 params
-            ).execute()
+            ).execute)
 
             if not result.data:
                 logger.info("No se encontraron clips similares")
                 return []
 
-            # Convertir resultados a entidades
-            clips = []
-            for row in result.data:
-                # Añadir similarity_score a los metadatos
-                clip_data = dict(row)
-                clip_data['similarity_score'] = clip_data.pop(
-                    'similarity_score', 0.0)
-
-                clips.append(AssetClipModel(clip_data).to_entity())
+            # Convertir resultados a entidades. La similitud ya viene calculada
+            # por pgvector (índice ivfflat), no hace falta copiar cada fila
+            clips = [AssetClipModel(row).to_entity() for row in result.data]
 
             logger.info(f"Encontrados {len(clips)} clips similares")
             return clips
@@ -193,8 +188,8 @@ class SupabaseClipRepository(ClipRepository):
     async def get_by_category(self, category: str, limit: int = 50) -> List[AssetClip]:
         try:
             # obtener clips activos y procesados en la categoría dada, guardar en modelo y devolver entidad
-            result = self.client.table("asset_clips").select("*").eq("category", category).eq("is_active", True).eq(
-                "processing_status", "ready").order("quality_score", desc=True).limit(limit).execute()
+            result = await asyncio.to_thread(self.client.table("asset_clips").select("*").eq("category", category).eq("is_active", True).eq(
+                "processing_status", "ready").order("quality_score", desc=True).limit(limit).execute)
 
             return [AssetClipModel(clip).to_entity() for clip in result.data]
 
@@ -206,8 +201,8 @@ class SupabaseClipRepository(ClipRepository):
         try:
             # Usar overlap operator para arrays
             tags_str = "{" + ",".join(tags) + "}"
-            result = self.client.table("asset_clips").select("*").filter("concept_tags", "ov", tags_str).eq(
-                "is_active", True).eq("processing_status", "ready").order("usage_count", desc=True).limit(limit).execute()
+            result = await asyncio.to_thread(self.client.table("asset_clips").select("*").filter("concept_tags", "ov", tags_str).eq(
+                "is_active", True).eq("processing_status", "ready").order("usage_count", desc=True).limit(limit).execute)
 
             return [AssetClipModel(clip).to_entity() for clip in result.data]
 
@@ -218,8 +213,8 @@ class SupabaseClipRepository(ClipRepository):
     async def update_usage_stats(self, clip_id: str, success: bool, relevance_score: float) -> bool:
         try:
             # Obtener stats actuales
-            current = self.client.table("asset_clips").select(
-                "usage_count, success_rate, avg_relevance_score").eq("id", clip_id).single().execute()
+            current = await asyncio.to_thread(self.client.table("asset_clips").select(
+                "usage_count, success_rate, avg_relevance_score").eq("id", clip_id).single().execute)
 
             if not current.data:
                 return False  # Clip no encontrado
@@ -237,12 +232,12 @@ class SupabaseClipRepository(ClipRepository):
                 (current_avg_relevance * (usage_count - 1)) + relevance_score) / usage_count
 
             # Actualizar
-            result = self.client.table("asset_clips").update({
+            result = await asyncio.to_thread(self.client.table("asset_clips").update({
                 "usage_count": usage_count,
                 "success_rate": success_rate,
                 "avg_relevance_score": avg_relevance,
                 "last_used_at": "now()"
-            }).eq("id", clip_id).execute()
+            }).eq("id", clip_id).execute)
 
             return len(result.data) > 0
 
@@ -269,8 +264,8 @@ class SupabaseClipRepository(ClipRepository):
                 "created_at": video_clip.created_at.isoformat()
             }
 
-            result = self.client.table(
-                "video_clips").insert(clip_data).execute()
+            result = await asyncio.to_thread(self.client.table(
+                "video_clips").insert(clip_data).execute)
             # Ensure result.data[0] is a dict, not a model instance
             return VideoClipModel(dict(result.data[0])).to_entity()
 
@@ -280,8 +275,8 @@ class SupabaseClipRepository(ClipRepository):
 
     async def get_video_clips(self, video_id: str) -> List[VideoClip]:
         try:
-            result = self.client.table("video_clips").select(
-                "*").eq("video_id", video_id).order("order_in_video").execute()
+            result = await asyncio.to_thread(self.client.table("video_clips").select(
+                "*").eq("video_id", video_id).order("order_in_video").execute)
 
             return [VideoClipModel(clip).to_entity() for clip in result.data]
 
@@ -2,6 +2,7 @@
 Implementación del repositorio de créditos usando Supabase.
 """
 
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -58,10 +59,10 @@ class SupabaseCreditRepository(CreditRepository):
         credits_after = credits_before - credits
 
         # Actualizar balance en la base de datos, al solo actualizar créditos, no es necesario un modelo
-        self.client.table("profiles").update({
+        await asyncio.to_thread(self.client.table("profiles").update({
             "credits_current": credits_after,
             "credits_used_this_month": balance.credits_used_this_month + credits
-        }).eq("id", user_id).execute()
+        }).eq("id", user_id).execute)
 
         # Crear transacción
         transaction = CreditTransaction(
@@ -99,12 +100,12 @@ class SupabaseCreditRepository(CreditRepository):
         credits_after = credits_before + credits
 
         # actualizar la tabla de usuarios
-        self.client.table("profiles").update({
+        await asyncio.to_thread(self.client.table("profiles").update({
             "credits_current": credits_after,
             "total_credits_purchased": balance.total_credits_purchased + credits,
             # convertir a float para DB
             "total_spent_eur": float(balance.total_spent_eur + price_eur)
-        }).eq("id", user_id).execute()
+        }).eq("id", user_id).execute)
 
         # Crear transacción
         transaction = CreditTransaction(
@@ -131,10 +132,10 @@ class SupabaseCreditRepository(CreditRepository):
 
     async def get_user_credit_balance(self, user_id: str) -> UserCreditBalance:
         try:
-            result = self.client.table("profiles").select(
+            result = await asyncio.to_thread(self.client.table("profiles").select(
                 "credits_current, credits_used_this_month, credits_limit_per_month, "
                 "last_credits_reset, total_credits_purchased, total_spent_usd, subscription_tier"
-            ).eq("id", user_id).single().execute()
+            ).eq("id", user_id).single().execute)
 
             if not result.data:
                 raise ValueError(f"Usuario {user_id} no encontrado")
@@ -161,11 +162,11 @@ class SupabaseCreditRepository(CreditRepository):
 
         query = query.order("created_at", desc=True).limit(limit)
 
-        result = query.execute()
+        result = await asyncio.to_thread(query.execute)
         return [CreditTransactionModel(tx).to_entity() for tx in result.data]
 
     async def get_available_packages(self) -> List[CreditPackage]:
-        result = self.client.table("credit_packages").select("*").execute()
+        result = await asyncio.to_thread(self.client.table("credit_packages").select("*").execute)
         return [CreditPackageModel(pkg).to_entity() for pkg in result.data]
 
     async def create_transaction(self, transaction: CreditTransaction) -> CreditTransaction:
@@ -184,8 +185,8 @@ class SupabaseCreditRepository(CreditRepository):
             "metadata": transaction.metadata,
             "created_at": (transaction.created_at or datetime.utcnow()).isoformat()
         }
-        result = self.client.table(
-            "credit_transactions").insert(data).execute()
+        result = await asyncio.to_thread(self.client.table(
+            "credit_transactions").insert(data).execute)
         return CreditTransactionModel(result.data[0]).to_entity()
 
     async def get_monthly_usage_stats(self, user_id: str) -> Dict[str, Any]:
@@ -199,8 +200,8 @@ class SupabaseCreditRepository(CreditRepository):
         query = self.client.table("profiles")
         if user_ids:
             query = query.in_("id", user_ids)  # type: ignore
-        result = query.update({
+        result = await asyncio.to_thread(query.update({
             "credits_used_this_month": 0,
             "last_credits_reset": datetime.utcnow()
-        }).execute()
+        }).execute)
         return len(result.data)
@@ -3,6 +3,7 @@ Implementación Supabase del cache de embeddings
 
 """
 
+import asyncio
 import logging
 from typing import List, Optional, cast, Any
 from datetime import datetime, timedelta
@@ -23,8 +24,8 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
     async def get_embedding(self, text_hash: str) -> Optional[List[float]]:
         try:
             # Obtener del cache
-            result = self.client.table("embeddings_cache").select(
-                "*").eq("text_hash", text_hash).single().execute()
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").select(
+                "*").eq("text_hash", text_hash).single().execute)
 
             if not result.data:
                 return None  # No existe en cache
@@ -36,10 +37,10 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
             if embedding:
                 # Incrementar usage_count en background (fire-and-forget)
                 try:
-                    self.client.table("embeddings_cache").update({
+                    await asyncio.to_thread(self.client.table("embeddings_cache").update({
                         "usage_count": result.data.get("usage_count", 0) + 1,
                         "last_used_at": datetime.utcnow().isoformat()
-                    }).eq("text_hash", text_hash).execute()
+                    }).eq("text_hash", text_hash).execute)
                 except Exception as e:
                     logger.warning(
                         f"Error incrementando usage count: {str(e)}")
@@ -59,10 +60,10 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
                 text_hash, embedding, text_preview)
 
             # Insertar con ON CONFLICT DO NOTHING (evita duplicados)
-            result = self.client.table("embeddings_cache").upsert(
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").upsert(
                 data,
                 on_conflict="text_hash"
-            ).execute()
+            ).execute)
 
             # Verificar errores
             if getattr(result, 'status_code', 200) >= 400:
@@ -80,8 +81,8 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
     async def has_embedding(self, text_hash: str) -> bool:
         try:
             # Verificar existencia
-            result = self.client.table("embeddings_cache").select(
-                "text_hash").eq("text_hash", text_hash).single().execute()
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").select(
+                "text_hash").eq("text_hash", text_hash).single().execute)
             return result.data is not None  # True si existe
 
         except Exception as e:
@@ -91,10 +92,10 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
     async def increment_usage(self, text_hash: str) -> bool:
         try:
             # Incrementar usage_count (llamamos a funcion SQL) y actualizar last_used_at
-            result = self.client.table("embeddings_cache").update({
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").update({
                 "usage_count": self.client.rpc("increment_usage_count", {"hash": text_hash}),
                 "last_used_at": datetime.utcnow().isoformat()
-            }).eq("text_hash", text_hash).execute()
+            }).eq("text_hash", text_hash).execute)
 
             if getattr(result, 'status_code', 200) >= 400 or not getattr(result, 'data', None):
                 logger.error(
@@ -113,9 +114,9 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
             cutoff_date = datetime.utcnow() - timedelta(days=days_old)
 
             # Obtener embeddings antiguos primero
-            old_embeddings = self.client.table("embeddings_cache").select("text_hash").lt(
+            old_embeddings = await asyncio.to_thread(self.client.table("embeddings_cache").select("text_hash").lt(
                 "last_used_at", cutoff_date.isoformat()
-            ).execute()
+            ).execute)
 
             if not old_embeddings.data:
                 return 0  # No hay embeddings antiguos
@@ -123,9 +124,9 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
             count = len(old_embeddings.data)
 
             # Eliminar embeddings antiguos
-            result = self.client.table("embeddings_cache").delete().lt(
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").delete().lt(
                 "last_used_at", cutoff_date.isoformat()
-            ).execute()
+            ).execute)
 
             if getattr(result, 'status_code', 200) >= 400:
                 logger.error(
@@ -143,15 +144,15 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
     async def get_cache_stats(self) -> dict:
         try:
             # Contar total de embeddings
-            count_result = self.client.table("embeddings_cache").select(
+            count_result = await asyncio.to_thread(self.client.table("embeddings_cache").select(
                 "text_hash", count=cast(Any, "exact")
-            ).execute()
+            ).execute)
 
             # Sumar total de embeddings
             total_embeddings: int = count_result.count or 0
 
             # Sumar usage_count total (RPC que devuelve lista con dict)
-            usage_result = self.client.rpc("sum_usage_counts").execute()
+            usage_result = await asyncio.to_thread(self.client.rpc("sum_usage_counts").execute)
             total_usage: int = (
                 int(usage_result.data[0].get("sum", 0))
                 if usage_result.data and isinstance(usage_result.data, list)
@@ -232,10 +233,10 @@ class SupabaseEmbeddingCacheRepository(EmbeddingCacheRepository):
                 batch_data.append(data)
 
             # Batch insert
-            result = self.client.table("embeddings_cache").upsert(
+            result = await asyncio.to_thread(self.client.table("embeddings_cache").upsert(
                 batch_data,
                 on_conflict="text_hash"
-            ).execute()
+            ).execute)
 
             if getattr(result, 'status_code', 200) >= 400:
                 logger.error(
@@ -3,8 +3,10 @@ Implementación Supabase del repositorio de videos
 
 """
 
+import asyncio
 import logging
 import uuid
+from collections import Counter
 from typing import List, Optional, Dict, Any, cast
 from datetime import datetime, timedelta
 
@@ -35,7 +37,7 @@ class SupabaseVideoRepository(VideoRepository):
             data = VideoModel.from_entity(entity)
 
             # Insert en BD
-            result = self.client.table("videos").insert(data).execute()
+            result = await asyncio.to_thread(self.client.table("videos").insert(data).execute)
 
             if getattr(result, 'status_code', 200) >= 400:
                 logger.error(
@@ -62,15 +64,14 @@ class SupabaseVideoRepository(VideoRepository):
             if not entity.id:
                 raise ValueError("Video debe tener ID para actualizar")
 
-            # Actualizar timestamp
-            entity.updated_at = datetime.utcnow()
-
-            # Convertir a datos de BD
+            # Convertir a datos de BD; updated_at lo fija el trigger
+            # update_videos_updated_at con now() del servidor
             data = VideoModel.from_entity(entity)
+            data.pop("updated_at", None)
 
             # Update en BD
-            result = self.client.table("videos").update(
-                data).eq("id", entity.id).execute()
+            result = await asyncio.to_thread(self.client.table("videos").update(
+                data).eq("id", entity.id).execute)
 
             if getattr(result, 'error', None):
                 logger.error(
@@ -94,8 +95,8 @@ class SupabaseVideoRepository(VideoRepository):
     async def get_by_id(self, id: str) -> Optional[Video]:
         """Obtiene un video por su ID."""
         try:
-            result = self.client.table("videos").select(
-                "*").eq("id", id).single().execute()
+            result = await asyncio.to_thread(self.client.table("videos").select(
+                "*").eq("id", id).single().execute)
 
             if not result.data:
                 return None
@@ -109,8 +110,8 @@ class SupabaseVideoRepository(VideoRepository):
     async def delete(self, id: str) -> bool:
         """Elimina un video."""
         try:
-            result = self.client.table("videos").delete().eq(
-                "id", id).execute()
+            result = await asyncio.to_thread(self.client.table("videos").delete().eq(
+                "id", id).execute)
 
             if getattr(result, 'error', None):
                 logger.error(
@@ -151,7 +152,7 @@ class SupabaseVideoRepository(VideoRepository):
             # Aplicar paginación
             query = query.limit(limit).offset(offset)
 
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
 
             if not result.data:
                 return []
@@ -182,10 +183,6 @@ class SupabaseVideoRepository(VideoRepository):
     ) -> int:
         """Cuenta videos de un usuario con filtros."""
         try:
-            count_result = self.client.table("embeddings_cache").select(
-                "text_hash", count=cast(Any, "exact")
-            ).execute()
-
             query = self.client.table("videos").select(
                 "id", count=cast(Any, "exact")).eq("user_id", user_id)
 
@@ -195,7 +192,7 @@ class SupabaseVideoRepository(VideoRepository):
             if date_from:
                 query = query.gte("created_at", date_from.isoformat())
 
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
 
             return int(result.count or 0) if hasattr(result, 'count') else 0
 
@@ -229,7 +226,7 @@ class SupabaseVideoRepository(VideoRepository):
                 "status").order("created_at", desc=True)
             search_query = search_query.limit(limit)
 
-            result = search_query.execute()
+            result = await asyncio.to_thread(search_query.execute)
 
             if not result.data:
                 return []
@@ -271,7 +268,7 @@ class SupabaseVideoRepository(VideoRepository):
             query = query.order("created_at", desc=True)
             query = query.limit(limit)
 
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
 
             if not result.data:
                 return []
@@ -314,13 +311,13 @@ class SupabaseVideoRepository(VideoRepository):
             embedding_str = f"[{','.join(map(str, embedding))}]"
 
             # Usar RPC para similitud coseno
-            similarity_result = self.client.rpc("find_similar_videos", {
+            similarity_result = await asyncio.to_thread(self.client.rpc("find_similar_videos", {
                 "query_embedding": embedding_str,
                 "similarity_threshold": 0.7,
                 "max_results": limit,
                 "exclude_id": exclude_video_id,
                 "user_filter": user_id
-            }).execute()
+            }).execute)
 
             if not similarity_result.data:
                 logger.info("🔍 No se encontraron videos similares")
@@ -367,19 +364,20 @@ class SupabaseVideoRepository(VideoRepository):
     ) -> bool:
         """Actualiza el estado de un video."""
         try:
+            # updated_at lo fija el trigger update_videos_updated_at
             update_data = {
-                "status": status.value,
-                "updated_at": datetime.utcnow().isoformat()
+                "status": status.value
             }
 
             if error_message:
                 update_data["error_message"] = error_message
 
             if status == VideoStatus.COMPLETED:
-                update_data["completed_at"] = datetime.utcnow().isoformat()
+                # 'now' lo resuelve Postgres con el reloj del servidor
+                update_data["completed_at"] = "now"
 
-            result = self.client.table("videos").update(
-                update_data).eq("id", video_id).execute()
+            result = await asyncio.to_thread(self.client.table("videos").update(
+                update_data).eq("id", video_id).execute)
 
             if getattr(result, 'error', None):
                 logger.error(
@@ -400,9 +398,9 @@ class SupabaseVideoRepository(VideoRepository):
     async def get_videos_by_status(self, status: VideoStatus, limit: int = 100) -> List[Video]:
         """Obtiene videos por estado específico."""
         try:
-            result = self.client.table("videos").select("*").eq(
+            result = await asyncio.to_thread(self.client.table("videos").select("*").eq(
                 "status", status.value
-            ).order("created_at").limit(limit).execute()
+            ).order("created_at").limit(limit).execute)
 
             if not result.data:
                 return []
@@ -430,9 +428,10 @@ class SupabaseVideoRepository(VideoRepository):
     async def get_user_statistics(self, user_id: str) -> Dict[str, Any]:
         """Obtiene estadísticas de videos de un usuario."""
         try:
-            # Obtener todos los videos del usuario
-            all_videos_result = self.client.table("videos").select(
-                "*").eq("user_id", user_id).execute()
+            # Obtener solo las columnas necesarias (sin embeddings ni scripts)
+            all_videos_result = await asyncio.to_thread(self.client.table("videos").select(
+                "status, quality_score, actual_duration, target_duration, "
+                "category, tone").eq("user_id", user_id).execute)
 
             if not all_videos_result.data:
                 return {
@@ -447,38 +446,41 @@ class SupabaseVideoRepository(VideoRepository):
                 }
 
             videos = all_videos_result.data
-            total_videos = len(videos)
+            status_counts: Counter = Counter()
+            tone_counts: Counter = Counter()
+            categories = set()
+            quality_sum = 0.0
+            quality_count = 0
+            total_duration = 0.0
+
+            # Una sola pasada sobre los videos para todos los agregados
+            for v in videos:
+                status_counts[v.get("status")] += 1
+
+                quality_score = v.get("quality_score")
+                if quality_score is not None:
+                    quality_sum += quality_score
+                    quality_count += 1
 
-            # Contar por estado
-            completed_videos = len([v for v in videos if v.get(
-                "status") == VideoStatus.COMPLETED.value])
-            failed_videos = len([v for v in videos if v.get(
-                "status") == VideoStatus.FAILED.value])
-            processing_videos = len([v for v in videos if v.get("status") not in [
-                VideoStatus.COMPLETED.value, VideoStatus.FAILED.value, VideoStatus.CREATED.value
-            ]])
-
-            # Calcular calidad promedio
-            quality_scores = [v.get("quality_score")
-                              for v in videos if v.get("quality_score") is not None]
-            filtered_quality_scores = [
-                score for score in quality_scores if score is not None]
-            avg_quality_score = sum(filtered_quality_scores) / len(
-                filtered_quality_scores) if filtered_quality_scores else 0
-
-            # Calcular duración total
-            durations = [v.get("actual_duration", 0) or v.get(
-                "target_duration", 0) for v in videos]
-            total_duration = sum(durations)
-
-            # Categorías usadas
-            categories = list(set([v.get("category")
-                              for v in videos if v.get("category")]))
-
-            # Tono más usado
-            tones = [v.get("tone") for v in videos if v.get("tone")]
-            most_used_tone = max(
-                set(tones), key=tones.count) if tones else None
+                total_duration += v.get("actual_duration",
+                                        0) or v.get("target_duration", 0) or 0
+
+                category = v.get("category")
+                if category:
+                    categories.add(category)
+
+                tone = v.get("tone")
+                if tone:
+                    tone_counts[tone] += 1
+
+            total_videos = len(videos)
+            completed_videos = status_counts[VideoStatus.COMPLETED.value]
+            failed_videos = status_counts[VideoStatus.FAILED.value]
+            processing_videos = total_videos - completed_videos - failed_videos - \
+                status_counts[VideoStatus.CREATED.value]
+            avg_quality_score = quality_sum / quality_count if quality_count else 0
+            most_used_tone = tone_counts.most_common(
+                1)[0][0] if tone_counts else None
 
             return {
                 "total_videos": total_videos,
@@ -487,7 +489,7 @@ class SupabaseVideoRepository(VideoRepository):
                 "processing_videos": processing_videos,
                 "avg_quality_score": round(avg_quality_score, 1),
                 "total_duration": round(total_duration, 1),
-                "categories_used": categories,
+                "categories_used": list(categories),
                 "most_used_tone": most_used_tone
             }
 
@@ -524,7 +526,7 @@ class SupabaseVideoRepository(VideoRepository):
             query = query.order("created_at", desc=True)
             query = query.limit(limit)
 
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
 
             if not result.data:
                 return []
@@ -543,10 +545,9 @@ class SupabaseVideoRepository(VideoRepository):
     async def update_embedding(self, video_id: str, embedding: List[float]) -> bool:
         """Actualiza el embedding de un video."""
         try:
-            result = self.client.table("videos").update({
-                "script_embedding": embedding,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", video_id).execute()
+            result = await asyncio.to_thread(self.client.table("videos").update({
+                "script_embedding": embedding
+            }).eq("id", video_id).execute)
 
             if getattr(result, 'error', None):
                 logger.error(
@@ -566,9 +567,9 @@ class SupabaseVideoRepository(VideoRepository):
     async def get_videos_without_embeddings(self, limit: int = 50) -> List[Video]:
         """Obtiene videos que no tienen embeddings."""
         try:
-            result = self.client.table("videos").select("*").is_(
+            result = await asyncio.to_thread(self.client.table("videos").select("*").is_(
                 "script_embedding", "null"
-            ).not_.is_("script_enhanced", "null").limit(limit).execute()
+            ).not_.is_("script_enhanced", "null").limit(limit).execute)
 
             if not result.data:
                 return []
@@ -590,9 +591,9 @@ class SupabaseVideoRepository(VideoRepository):
             cutoff_date = datetime.utcnow() - timedelta(days=days_old)
 
             # Obtener videos fallidos antiguos
-            failed_videos = self.client.table("videos").select("id").eq(
+            failed_videos = await asyncio.to_thread(self.client.table("videos").select("id").eq(
                 "status", VideoStatus.FAILED.value
-            ).lt("created_at", cutoff_date.isoformat()).execute()
+            ).lt("created_at", cutoff_date.isoformat()).execute)
 
             if not failed_videos.data:
                 return 0
@@ -600,9 +601,9 @@ class SupabaseVideoRepository(VideoRepository):
             count = len(failed_videos.data)
 
             # Eliminar videos fallidos
-            result = self.client.table("videos").delete().eq(
+            result = await asyncio.to_thread(self.client.table("videos").delete().eq(
                 "status", VideoStatus.FAILED.value
-            ).lt("created_at", cutoff_date.isoformat()).execute()
+            ).lt("created_at", cutoff_date.isoformat()).execute)
 
             if getattr(result, 'error', None):
                 logger.error(
@@ -620,7 +621,7 @@ class SupabaseVideoRepository(VideoRepository):
         """Obtiene métricas de salud del procesamiento."""
         try:
             # Contar videos por estado
-            states_result = self.client.rpc("count_videos_by_status").execute()
+            states_result = await asyncio.to_thread(self.client.rpc("count_videos_by_status").execute)
             states_data = states_result.data if states_result.data else {}
 
             # Videos en procesamiento
@@ -640,7 +641,7 @@ class SupabaseVideoRepository(VideoRepository):
                 completed / total_finished) if total_finished > 0 else 0
 
             # Video más antiguo en procesamiento
-            oldest_processing = self.client.table("videos").select("created_at").in_(
+            oldest_processing = await asyncio.to_thread(self.client.table("videos").select("created_at").in_(
                 "status", [s.value for s in [
                     VideoStatus.ENHANCING_SCRIPT,
                     VideoStatus.GENERATING_EMBEDDING,
@@ -648,7 +649,7 @@ class SupabaseVideoRepository(VideoRepository):
                     VideoStatus.GENERATING_AUDIO,
                     VideoStatus.ASSEMBLING_VIDEO
                 ]]
-            ).order("created_at").limit(1).execute()
+            ).order("created_at").limit(1).execute)
 
             oldest_processing_date = None
             if oldest_processing.data:
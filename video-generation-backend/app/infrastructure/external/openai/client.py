@@ -1,15 +1,149 @@
 """
 OpenAI client adapter for the infrastructure layer
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, List, Optional, Sequence, Tuple
+import httpx
+from blake3 import blake3
+import orjson
+from openai import AsyncOpenAI
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bloque de código markdown opcional alrededor del JSON (```json ... ```)
+# (la valla de cierre es opcional: respuestas truncadas o sin cerrar)
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*(?:```\s*)?$", re.DOTALL)
+
+# Máximo de textos por request al endpoint de embeddings
+MAX_EMBEDDING_BATCH = 1024
+
+# Cache LRU de embeddings compartido por todas las instancias del cliente.
+# Clave direccionada por contenido: blake3(modelo + "\0" + texto preparado).
+# Se guardan tuplas (inmutables) y se devuelve una lista nueva en cada
+# acierto, para que ningún llamador pueda alterar el vector cacheado.
+_embedding_cache: "OrderedDict[bytes, Tuple[float, ...]]" = OrderedDict()
+
+
+def _prepare_embedding_text(text: str) -> str:
+    """
+    Normaliza el texto antes de generar su embedding.
+
+    Colapsa espacios y saltos de línea: consultas que solo difieren en el
+    espaciado comparten entrada de cache (y el embedding no cambia).
+
+    Args:
+        text: Texto original
+
+    Returns:
+        str: Texto preparado
+    """
+    return " ".join(text.split())
+
+
+def _embedding_cache_key(text: str, model: str) -> bytes:
+    """
+    Calcula la clave de cache para un par (modelo, texto preparado).
+
+    Args:
+        text: Texto ya preparado con _prepare_embedding_text
+        model: Modelo de embedding (se incluye para no mezclar dimensiones)
+
+    Returns:
+        bytes: Digest de 16 bytes de la pareja modelo/texto
+    """
+    return blake3(f"{model}\0{text}".encode("utf-8")).digest(length=16)
+
+
+def _cache_embedding(key: bytes, embedding: List[float]) -> None:
+    """
+    Guarda un embedding en el cache expulsando los menos usados.
+
+    Args:
+        key: Clave calculada con _embedding_cache_key
+        embedding: Vector a guardar
+    """
+    _embedding_cache[key] = tuple(embedding)
+    _embedding_cache.move_to_end(key)
+    while len(_embedding_cache) > settings.EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+class _RequestRateLimiter:
+    """
+    Token bucket asíncrono para respetar los límites RPM de OpenAI.
+
+    El bucket vive en el proceso: cada worker aplica su parte del límite
+    de la cuenta (ver _per_worker_rpm).
+
+    Cada request reserva un token (el saldo puede quedar negativo) y espera
+    lo que falte hasta que se recargue: las ráfagas se encolan en orden de
+    llegada en lugar de disparar 429 y reintentos.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int):
+        self.name = name
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    async def acquire(self) -> float:
+        """
+        Reserva un token esperando si el bucket está vacío.
+
+        Returns:
+            float: Segundos esperados (0.0 si había capacidad)
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens +
+                           (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return 0.0
+
+        waited = -self._tokens / self.rate
+        logger.warning(
+            f"⏳ Límite RPM de OpenAI ({self.name}) alcanzado, "
+            f"esperando {waited * 1000:.0f} ms")
+        await asyncio.sleep(waited)
+        return waited
+
+
+def _per_worker_rpm(account_rpm: int) -> int:
+    """
+    Reparte el límite RPM de la cuenta entre los workers.
+
+    Cada worker es un proceso con su propio bucket: sin repartir, el ritmo
+    real sería account_rpm × workers. settings.worker_count es también el
+    número de workers con el que arrancan main.py y gunicorn.conf.py.
+
+    Args:
+        account_rpm: Límite de la cuenta (0 desactiva el limitador)
+
+    Returns:
+        int: Límite de este worker (al menos 1 si el límite está activo)
+    """
+    if account_rpm <= 0:
+        return 0
+    return max(1, account_rpm // max(1, settings.worker_count))
+
+
+_chat_limiter = _RequestRateLimiter("chat", _per_worker_rpm(settings.OPENAI_CHAT_RPM))
+_tts_limiter = _RequestRateLimiter("tts", _per_worker_rpm(settings.TTS_RPM))
+
 
 class OpenAIClient:
     """Cliente adaptador para la API de OpenAI."""
@@ -19,7 +153,18 @@ class OpenAIClient:
         if not settings.openai_configured:
             raise ValueError("OpenAI API key no configurada correctamente")
 
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Cliente httpx con pool explícito: las conexiones keep-alive se
+        # reutilizan entre requests en lugar de repetir el handshake TLS
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=256,
+                    max_keepalive_connections=64
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
+        )
 
     async def complete_chat(
         self,
@@ -55,7 +200,8 @@ class OpenAIClient:
 
             logger.info(f"Enviando request a OpenAI: {params['model']}")
 
-            response = self.client.chat.completions.create(**params)
+            await _chat_limiter.acquire()
+            response = await self.client.chat.completions.create(**params)
 
             content = response.choices[0].message.content
             logger.info("Response recibida de OpenAI exitosamente")
@@ -78,9 +224,17 @@ class OpenAIClient:
             List[float]: Vector de embedding
         """
         try:
+            text = _prepare_embedding_text(text)
+            key = _embedding_cache_key(text, model)
+            cached = _embedding_cache.get(key)
+            if cached is not None:
+                _embedding_cache.move_to_end(key)
+                logger.debug("Embedding obtenido del cache")
+                return list(cached)
+
             logger.info("Generando embedding con OpenAI")
 
-            response = self.client.embeddings.create(
+            response = await self.client.embeddings.create(
                 model=model,
                 input=text
             )
@@ -88,12 +242,72 @@ class OpenAIClient:
             embedding = response.data[0].embedding
             logger.info(f"Embedding generado: {len(embedding)} dimensiones")
 
+            _cache_embedding(key, embedding)
             return embedding
 
         except Exception as e:
             logger.error(f"Error generando embedding: {str(e)}")
             raise
 
+    async def generate_embeddings_batch(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small"
+    ) -> List[List[float]]:
+        """
+        Genera embeddings para varios textos con el mínimo de requests.
+
+        Solo se envían a OpenAI los textos que no están en cache, en lotes
+        de hasta MAX_EMBEDDING_BATCH, y los resultados se devuelven en el
+        mismo orden que la entrada.
+
+        Args:
+            texts: Lista de textos
+            model: Modelo de embedding a usar
+
+        Returns:
+            List[List[float]]: Un vector por cada texto de entrada
+        """
+        try:
+            texts = [_prepare_embedding_text(text) for text in texts]
+            keys = [_embedding_cache_key(text, model) for text in texts]
+            results: Dict[bytes, Sequence[float]] = {}
+            missing: Dict[bytes, str] = {}
+
+            for key, text in zip(keys, texts):
+                if key in results or key in missing:
+                    continue
+                cached = _embedding_cache.get(key)
+                if cached is not None:
+                    _embedding_cache.move_to_end(key)
+                    results[key] = cached
+                else:
+                    missing[key] = text
+
+            if missing:
+                missing_keys = list(missing)
+                # Textos únicos: los duplicados del lote no cuentan como hits
+                logger.info(
+                    f"Generando {len(missing_keys)} embeddings con OpenAI "
+                    f"({len(results)} desde cache)")
+
+                for start in range(0, len(missing_keys), MAX_EMBEDDING_BATCH):
+                    batch_keys = missing_keys[start:start + MAX_EMBEDDING_BATCH]
+                    response = await self.client.embeddings.create(
+                        model=model,
+                        input=[missing[key] for key in batch_keys]
+                    )
+                    for item in response.data:
+                        key = batch_keys[item.index]
+                        results[key] = item.embedding
+                        _cache_embedding(key, item.embedding)
+
+            return [list(results[key]) for key in keys]
+
+        except Exception as e:
+            logger.error(f"Error generando embeddings en lote: {str(e)}")
+            raise
+
     async def generate_audio(
         self,
         text: str,
@@ -113,22 +327,49 @@ class OpenAIClient:
         Returns:
             bytes: Datos del archivo de audio
         """
+        # bytearray crece in-place: evita copiar todo lo acumulado en cada
+        # chunk como ocurre con bytes +=
+        buffer = bytearray()
+        async for chunk in self.stream_audio(text, voice, model, response_format):
+            buffer.extend(chunk)
+
+        audio_data = bytes(buffer)
+        logger.info(f"Audio generado: {len(audio_data)} bytes")
+        return audio_data
+
+    async def stream_audio(
+        self,
+        text: str,
+        voice: str = "alloy",
+        model: str = "tts-1",
+        response_format: str = "mp3",
+        chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """
+        Genera audio TTS y lo entrega en chunks a medida que llega de OpenAI.
+
+        Args:
+            text: Texto a convertir en audio
+            voice: Voz a utilizar
+            model: Modelo TTS a usar
+            response_format: Formato de audio de salida
+            chunk_size: Tamaño de cada chunk en bytes
+
+        Yields:
+            bytes: Fragmentos consecutivos del archivo de audio
+        """
         try:
             logger.info(f"Generando audio TTS con voz: {voice}")
 
-            response = self.client.audio.speech.create(
+            await _tts_limiter.acquire()
+            async with self.client.audio.speech.with_streaming_response.create(
                 model=model,
                 voice=voice,
                 input=text,
                 response_format=response_format
-            )
-
-            audio_data = b""
-            for chunk in response.iter_bytes():
-                audio_data += chunk
-
-            logger.info(f"Audio generado: {len(audio_data)} bytes")
-            return audio_data
+            ) as response:
+                async for chunk in response.iter_bytes(chunk_size):
+                    yield chunk
 
         except Exception as e:
             logger.error(f"Error generando audio: {str(e)}")
@@ -153,7 +394,7 @@ class OpenAIClient:
             audio_file = BytesIO(audio_data)
             audio_file.name = filename
 
-            response = self.client.audio.transcriptions.create(
+            response = await self.client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio_file
             )
@@ -182,21 +423,111 @@ class OpenAIClient:
         """
         try:
             # Limpiar la respuesta si tiene marcadores de código
-            cleaned_response = response.strip()
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.endswith("```"):
-                cleaned_response = cleaned_response[:-3]
+            fence = _JSON_FENCE_RE.match(response)
+            payload = fence.group(1) if fence else response.strip()
 
-            # Parsear JSON
-            parsed_response = json.loads(cleaned_response.strip())
-            return parsed_response
+            # Parsear JSON (orjson.JSONDecodeError hereda de json.JSONDecodeError)
+            return orjson.loads(payload)
 
         except json.JSONDecodeError as e:
             logger.error(f"Error parseando JSON de OpenAI: {str(e)}")
             logger.error(f"Respuesta recibida: {response[:500]}...")
             raise ValueError(f"Respuesta inválida de OpenAI: {str(e)}")
 
+    async def submit_batch(self, jsonl_data: bytes, endpoint: str = "/v1/chat/completions") -> str:
+        """
+        Envía un lote de requests a la Batch API de OpenAI (procesado offline,
+        hasta 24h, a mitad de coste y fuera de los límites por minuto).
+
+        Args:
+            jsonl_data: Requests serializadas en JSONL (una por línea, con custom_id)
+            endpoint: Endpoint de OpenAI al que van dirigidas las requests
+
+        Returns:
+            str: ID del batch creado
+        """
+        try:
+            input_file = await self.client.files.create(
+                file=("batch.jsonl", jsonl_data),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=endpoint,
+                completion_window="24h"
+            )
+
+            logger.info(f"Batch enviado a OpenAI: {batch.id}")
+            return batch.id
+
+        except Exception as e:
+            logger.error(f"Error enviando batch a OpenAI: {str(e)}")
+            raise
+
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Consulta el estado de un batch.
+
+        Args:
+            batch_id: ID del batch
+
+        Returns:
+            Dict con status, output_file_id, error_file_id y contadores
+        """
+        try:
+            batch = await self.client.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            return {
+                "batch_id": batch.id,
+                "status": batch.status,
+                "output_file_id": batch.output_file_id,
+                "error_file_id": batch.error_file_id,
+                "total": counts.total if counts else 0,
+                "completed": counts.completed if counts else 0,
+                "failed": counts.failed if counts else 0
+            }
+
+        except Exception as e:
+            logger.error(f"Error consultando batch {batch_id}: {str(e)}")
+            raise
+
+    async def fetch_batch_results(self, batch_id: str) -> Dict[str, str]:
+        """
+        Descarga los resultados de un batch completado.
+
+        Args:
+            batch_id: ID del batch
+
+        Returns:
+            Dict custom_id -> contenido de la respuesta del modelo
+        """
+        try:
+            batch = await self.get_batch(batch_id)
+            if batch["status"] != "completed" or not batch["output_file_id"]:
+                raise ValueError(
+                    f"Batch {batch_id} no completado: {batch['status']}")
+
+            content = await self.client.files.content(batch["output_file_id"])
+
+            results = {}
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                item = orjson.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                results[item["custom_id"]] = \
+                    response["body"]["choices"][0]["message"]["content"]
+
+            logger.info(
+                f"Resultados de batch {batch_id}: {len(results)} respuestas")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error obteniendo resultados del batch: {str(e)}")
+            raise
+
     async def health_check(self) -> bool:
         """
         Verifica la conectividad con OpenAI.
@@ -214,4 +545,19 @@ class OpenAIClient:
 
         except Exception as e:
             logger.error(f"Health check falló: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    async def close(self) -> None:
+        """Cierra el pool de conexiones HTTP (al apagar la aplicación)."""
+        await self.client.close()
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAIClient:
+    """
+    Devuelve la instancia compartida de OpenAIClient.
+
+    Returns:
+        OpenAIClient: Cliente único del proceso, con su pool de conexiones
+    """
+    return OpenAIClient()
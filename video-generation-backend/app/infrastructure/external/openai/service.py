@@ -1,26 +1,177 @@
 """
 OpenAI service implementation for script enhancement and audio generation
 """
-import json
+import asyncio
 import logging
-from typing import Dict, Any, List
-
-from .client import OpenAIClient
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import AsyncIterator, Dict, Any, List, Literal, Optional, Tuple
+import orjson
+from blake3 import blake3
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from .client import get_openai_client
+from app.core.config import settings
 from app.domain.entities.script import Script, Tone, Category
 from app.application.interfaces.audio_service import AudioService
 from app.application.interfaces.ai_service import AIService
 logger = logging.getLogger(__name__)
 
+# Normalización de texto para TTS (compilados una sola vez)
+_WHITESPACE_RE = re.compile(r"\s+")
+_SPEECH_PAUSE_RE = re.compile(r"[.!?]")
+_SPEECH_PAUSES = {".": "... ", "!": "! ", "?": "? "}
+
+# Extracción básica de keywords (fallback sin OpenAI)
+_KEYWORD_RE = re.compile(r"\b\w{4,}\b")
+_STOP_WORDS = frozenset({
+    'para', 'que', 'con', 'una', 'por', 'como', 'más', 'pero', 'sus', 'les',
+    'muy', 'todo', 'esta', 'son', 'ser', 'estar', 'hacer', 'puede', 'video'
+})
+
+# Scripts por request en la generación de keywords en lote
+KEYWORDS_BATCH_SIZE = 16
+
+
+# Cache LRU de mejoras: la mejora es función pura de (texto, duración, tono,
+# categoría, audiencia, modelo). Se guarda el JSON serializado para que cada
+# hit devuelva objetos nuevos que el caller puede mutar sin tocar el cache.
+_enhancement_cache: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+
+
+def _enhancement_cache_key(script: Script) -> bytes:
+    """
+    Calcula la clave de cache de la mejora de un script.
+
+    Args:
+        script: Script a mejorar
+
+    Returns:
+        bytes: Digest de 16 bytes de los parámetros normalizados
+    """
+    raw = "\0".join((
+        settings.OPENAI_MODEL,
+        _WHITESPACE_RE.sub(" ", script.original_text).strip(),
+        str(script.target_duration),
+        script.tone.value,
+        script.category.value,
+        script.target_audience
+    ))
+    return blake3(raw.encode("utf-8")).digest(length=16)
+
+
+def _get_cached_enhancement(key: bytes) -> Optional[Dict[str, Any]]:
+    """Devuelve una mejora cacheada no expirada, o None."""
+    entry = _enhancement_cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, payload = entry
+    if time.monotonic() >= expires_at:
+        del _enhancement_cache[key]
+        return None
+
+    _enhancement_cache.move_to_end(key)
+    return orjson.loads(payload)
+
+
+def _cache_enhancement(key: bytes, enhanced_data: Dict[str, Any]) -> None:
+    """Guarda una mejora expulsando las menos usadas."""
+    _enhancement_cache[key] = (
+        time.monotonic() + settings.ENHANCEMENT_CACHE_TTL_SECONDS,
+        orjson.dumps(enhanced_data)
+    )
+    _enhancement_cache.move_to_end(key)
+    while len(_enhancement_cache) > settings.ENHANCEMENT_CACHE_SIZE:
+        _enhancement_cache.popitem(last=False)
+
+
+class _SpeechCache:
+    """
+    Cache LRU en memoria de audios TTS, acotado por bytes totales.
+
+    El MP3 depende solo de (modelo, voz, texto procesado): repetir una
+    síntesis mientras el usuario itera devuelve los bytes sin llamar a
+    OpenAI (ni pagar los caracteres de nuevo).
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: int):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def key(model: str, voice: str, text: str) -> bytes:
+        """Calcula la clave de cache de una síntesis."""
+        raw = f"{model}\0{voice}\0{text}".encode("utf-8")
+        return blake3(raw).digest(length=16)
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Devuelve el audio cacheado no expirado, o None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, audio_data = entry
+        if time.monotonic() >= expires_at:
+            self._evict(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return audio_data
+
+    def put(self, key: bytes, audio_data: bytes) -> None:
+        """Guarda un audio expulsando los menos usados si se excede el límite."""
+        if len(audio_data) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._evict(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, audio_data)
+        self._size += len(audio_data)
+        while self._size > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: bytes) -> None:
+        _, audio_data = self._entries.pop(key)
+        self._size -= len(audio_data)
+
+
+_speech_cache = _SpeechCache(
+    settings.TTS_CACHE_MAX_BYTES, settings.TTS_CACHE_TTL_SECONDS)
+
+# Modelo de TTS usado por OpenAIAudioService (forma parte de la clave de cache)
+_SPEECH_MODEL = "tts-1-hd"
+
+
+class _EnhancementSegment(BaseModel):
+    """Segmento devuelto por OpenAI en la mejora de scripts."""
+    texto: str
+    duracion: float
+    tipo: Literal["hook", "contenido", "cta"]
+
+
+class _EnhancementResponse(BaseModel):
+    """Estructura JSON obligatoria de la respuesta de mejora."""
+    script_mejorado: str
+    duracion_estimada: float
+    segmentos: List[_EnhancementSegment] = Field(min_length=1)
+    keywords: List[str]
+    mejoras: List[str]
+
+
+# Validador compilado una sola vez para el array de keywords
+_KEYWORDS_ADAPTER = TypeAdapter(List[str])
+
 
 class OpenAIScriptService(AIService):
     """Servicio para mejora de scripts usando OpenAI."""
 
-    def __init__(self):
-        self.client = OpenAIClient()
-
-    def _create_system_prompt(self) -> str:
-        """Crea el prompt del sistema para mejora de scripts."""
-        return """Eres un experto en contenido viral para YouTube Shorts. DEBES responder ÚNICAMENTE con un JSON válido.
+    # Constantes de prompt: se construyen una vez al importar el módulo
+    SYSTEM_PROMPT = """Eres un experto en contenido viral para YouTube Shorts. DEBES responder ÚNICAMENTE con un JSON válido.
 
 ESTRUCTURA JSON REQUERIDA (OBLIGATORIA):
 {
@@ -57,45 +208,62 @@ REGLAS ESTRICTAS:
 7. Keywords deben ser relevantes para SEO de YouTube
 8. No uses markdown, solo texto plano en el script"""
 
-    def _create_enhancement_prompt(self, script: Script) -> str:
-        """Crea el prompt específico para mejorar el script."""
-        categoria_tips = {
-            Category.TECH: "Enfócate en beneficios prácticos, usa términos técnicos accesibles, incluye datos específicos",
-            Category.EDUCATION: "Estructura clara paso a paso, ejemplos prácticos, lenguaje educativo pero entretenido",
-            Category.MARKETING: "CTAs persuasivos, beneficios claros, urgencia sutil, prueba social",
-            Category.LIFESTYLE: "Experiencias personales, emociones, aspiraciones, relatabilidad",
-            Category.ENTERTAINMENT: "Elementos sorpresa, humor, narrativa envolvente, momentos memorables"
-        }
-
-        tono_instructions = {
-            Tone.VIRAL: "Usa lenguaje impactante, hooks provocativos, elementos sorpresa, frases memorables",
-            Tone.EDUCATIVO: "Estructura didáctica clara, explicaciones paso a paso, ejemplos concretos",
-            Tone.PROFESIONAL: "Lenguaje formal pero accesible, datos y estadísticas, credibilidad",
-            Tone.CASUAL: "Conversacional, cercano, como hablar con un amigo, natural y auténtico",
-            Tone.ENERGETICO: "Entusiasmo alto, exclamaciones, ritmo rápido, emoción contagiosa"
-        }
-
-        return f"""
-SCRIPT A MEJORAR: "{script.original_text}"
+    CATEGORIA_TIPS = {
+        Category.TECH: "Enfócate en beneficios prácticos, usa términos técnicos accesibles, incluye datos específicos",
+        Category.EDUCATION: "Estructura clara paso a paso, ejemplos prácticos, lenguaje educativo pero entretenido",
+        Category.MARKETING: "CTAs persuasivos, beneficios claros, urgencia sutil, prueba social",
+        Category.LIFESTYLE: "Experiencias personales, emociones, aspiraciones, relatabilidad",
+        Category.ENTERTAINMENT: "Elementos sorpresa, humor, narrativa envolvente, momentos memorables"
+    }
+
+    TONO_INSTRUCTIONS = {
+        Tone.VIRAL: "Usa lenguaje impactante, hooks provocativos, elementos sorpresa, frases memorables",
+        Tone.EDUCATIVO: "Estructura didáctica clara, explicaciones paso a paso, ejemplos concretos",
+        Tone.PROFESIONAL: "Lenguaje formal pero accesible, datos y estadísticas, credibilidad",
+        Tone.CASUAL: "Conversacional, cercano, como hablar con un amigo, natural y auténtico",
+        Tone.ENERGETICO: "Entusiasmo alto, exclamaciones, ritmo rápido, emoción contagiosa"
+    }
+
+    ENHANCEMENT_PROMPT_TEMPLATE = """
+SCRIPT A MEJORAR: "{original_text}"
 
 ESPECIFICACIONES:
-- Duración objetivo: {script.target_duration} segundos
-- Tono: {script.tone.value} - {tono_instructions.get(script.tone, '')}
-- Categoría: {script.category.value} - {categoria_tips.get(script.category, '')}
-- Audiencia: {script.target_audience}
+- Duración objetivo: {target_duration} segundos
+- Tono: {tone} - {tono_tips}
+- Categoría: {category} - {categoria_tips}
+- Audiencia: {target_audience}
 
 MEJORA EL SCRIPT siguiendo estas pautas:
 1. Mantén el mensaje core pero hazlo más atractivo y viral
-2. Optimiza para la duración objetivo ({script.target_duration}s)
-3. Aplica el tono {script.tone.value} de manera consistente
-4. Adapta el lenguaje para {script.target_audience}
-5. Incluye elementos específicos de {script.category.value}
+2. Optimiza para la duración objetivo ({target_duration}s)
+3. Aplica el tono {tone} de manera consistente
+4. Adapta el lenguaje para {target_audience}
+5. Incluye elementos específicos de {category}
 6. Estructura en Hook → Contenido → CTA
 7. Usa técnicas de retención de audiencia
 8. Optimiza para algoritmo de YouTube Shorts
 
 RESPONDE ÚNICAMENTE CON EL JSON VÁLIDO."""
 
+    def __init__(self):
+        self.client = get_openai_client()
+
+    def _create_system_prompt(self) -> str:
+        """Crea el prompt del sistema para mejora de scripts."""
+        return self.SYSTEM_PROMPT
+
+    def _create_enhancement_prompt(self, script: Script) -> str:
+        """Crea el prompt específico para mejorar el script."""
+        return self.ENHANCEMENT_PROMPT_TEMPLATE.format_map({
+            "original_text": script.original_text,
+            "target_duration": script.target_duration,
+            "tone": script.tone.value,
+            "tono_tips": self.TONO_INSTRUCTIONS.get(script.tone, ''),
+            "category": script.category.value,
+            "categoria_tips": self.CATEGORIA_TIPS.get(script.category, ''),
+            "target_audience": script.target_audience
+        })
+
     async def enhance_script(self, script: Script) -> Dict[str, Any]:
         """
         Mejora un script usando OpenAI.
@@ -107,6 +275,12 @@ RESPONDE ÚNICAMENTE CON EL JSON VÁLIDO."""
             Dict con script mejorado, segmentos, keywords y mejoras
         """
         try:
+            cache_key = _enhancement_cache_key(script)
+            cached = _get_cached_enhancement(cache_key)
+            if cached is not None:
+                logger.info("Mejora de script obtenida del cache")
+                return cached
+
             messages = [
                 {"role": "system", "content": self._create_system_prompt()},
                 {"role": "user",
@@ -124,6 +298,7 @@ RESPONDE ÚNICAMENTE CON EL JSON VÁLIDO."""
 
             # Validar estructura requerida
             self._validate_enhancement_response(enhanced_data)
+            _cache_enhancement(cache_key, enhanced_data)
 
             logger.info(
                 f"Script mejorado exitosamente. Duración: {enhanced_data.get('duracion_estimada')}s")
@@ -133,34 +308,72 @@ RESPONDE ÚNICAMENTE CON EL JSON VÁLIDO."""
             logger.error(f"Error mejorando script: {str(e)}")
             raise
 
-    def _validate_enhancement_response(self, data: Dict[str, Any]) -> None:
-        """Valida la estructura de la respuesta de mejora."""
-        required_fields = ['script_mejorado',
-                           'duracion_estimada', 'segmentos', 'keywords', 'mejoras']
+    async def enhance_scripts_batch(self, scripts: List[Script]) -> Dict[str, Any]:
+        """
+        Envía la mejora de varios scripts a la Batch API de OpenAI.
 
-        for field in required_fields:
-            if field not in data:
-                raise ValueError(
-                    f"Campo requerido '{field}' no encontrado en respuesta")
+        Pensado para reprocesados masivos no interactivos: el resultado llega
+        en hasta 24h y se recoge con fetch_enhancement_batch_results.
 
-        # Validar segmentos
-        if not isinstance(data['segmentos'], list) or len(data['segmentos']) == 0:
-            raise ValueError("Se requiere al menos un segmento")
+        Args:
+            scripts: Scripts a mejorar (deben tener id)
 
-        for i, segmento in enumerate(data['segmentos']):
-            if not isinstance(segmento, dict):
-                raise ValueError(f"Segmento {i} debe ser un objeto")
+        Returns:
+            Dict con batch_id y número de scripts enviados
+        """
+        system_prompt = self._create_system_prompt()
+        lines = [
+            orjson.dumps({
+                "custom_id": str(script.id),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": settings.OPENAI_MODEL,
+                    "temperature": 0.7,
+                    "max_tokens": settings.MAX_TOKENS,
+                    "response_format": {"type": "json_object"},
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user",
+                            "content": self._create_enhancement_prompt(script)}
+                    ]
+                }
+            })
+            for script in scripts
+        ]
 
-            seg_fields = ['texto', 'duracion', 'tipo']
-            for field in seg_fields:
-                if field not in segmento:
-                    raise ValueError(
-                        f"Campo '{field}' requerido en segmento {i}")
+        batch_id = await self.client.submit_batch(b"\n".join(lines))
+        return {"batch_id": batch_id, "total": len(scripts)}
 
-            # Validar tipo de segmento
-            if segmento['tipo'] not in ['hook', 'contenido', 'cta']:
-                raise ValueError(
-                    f"Tipo de segmento inválido: {segmento['tipo']}")
+    async def fetch_enhancement_batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Recoge y valida los scripts mejorados de un batch completado.
+
+        Args:
+            batch_id: ID devuelto por enhance_scripts_batch
+
+        Returns:
+            Dict script_id -> datos mejorados (las respuestas inválidas se omiten)
+        """
+        results = {}
+        for script_id, content in (await self.client.fetch_batch_results(batch_id)).items():
+            try:
+                enhanced_data = self.client.validate_json_response(content)
+                self._validate_enhancement_response(enhanced_data)
+                results[script_id] = enhanced_data
+            except ValueError as e:
+                logger.warning(
+                    f"Respuesta inválida en batch para script {script_id}: {str(e)}")
+        return results
+
+    def _validate_enhancement_response(self, data: Dict[str, Any]) -> None:
+        """Valida la estructura de la respuesta de mejora."""
+        # Una sola validación en pydantic-core (campos, tipos y tipo de segmento)
+        try:
+            _EnhancementResponse.model_validate(data)
+        except ValidationError as e:
+            raise ValueError(
+                f"Respuesta de mejora con estructura inválida: {e}") from e
 
     async def generate_keywords(self, text: str, max_keywords: int = 10) -> List[str]:
         """Genera keywords SEO para un texto."""
@@ -183,10 +396,8 @@ Responde ÚNICAMENTE con un JSON array de strings: ["keyword1", "keyword2", ...]
                 max_tokens=200
             )
 
-            keywords = json.loads(response.strip())
-
-            if not isinstance(keywords, list):
-                raise ValueError("Respuesta debe ser un array")
+            # Parseo y validación (array de strings) en una sola pasada
+            keywords = _KEYWORDS_ADAPTER.validate_json(response.strip())
 
             return keywords[:max_keywords]
 
@@ -195,25 +406,90 @@ Responde ÚNICAMENTE con un JSON array de strings: ["keyword1", "keyword2", ...]
             # Fallback: extraer keywords básicas
             return self._extract_basic_keywords(text, max_keywords)
 
-    def _extract_basic_keywords(self, text: str, max_keywords: int) -> List[str]:
-        """Extrae keywords básicas como fallback."""
-        import re
-        from collections import Counter
+    async def generate_keywords_batch(
+        self,
+        texts: List[str],
+        max_keywords: int = 10
+    ) -> List[List[str]]:
+        """
+        Genera keywords SEO para varios textos con una chat completion por
+        cada bloque de KEYWORDS_BATCH_SIZE textos (en paralelo).
+
+        Args:
+            texts: Lista de textos
+            max_keywords: Máximo de keywords por texto
+
+        Returns:
+            List[List[str]]: Keywords de cada texto, en el orden de entrada
+        """
+        chunks = [texts[i:i + KEYWORDS_BATCH_SIZE]
+                  for i in range(0, len(texts), KEYWORDS_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(self._generate_keywords_chunk(chunk, max_keywords) for chunk in chunks))
+        return [keywords for chunk_result in results for keywords in chunk_result]
+
+    async def _generate_keywords_chunk(
+        self,
+        texts: List[str],
+        max_keywords: int
+    ) -> List[List[str]]:
+        """
+        Genera keywords para un bloque de textos en una sola request.
+
+        Args:
+            texts: Textos del bloque
+            max_keywords: Máximo de keywords por texto
+
+        Returns:
+            List[List[str]]: Keywords de cada texto del bloque
+        """
+        try:
+            scripts = "\n".join(f"[{i}] {text}" for i, text in enumerate(texts))
+            messages = [
+                {
+                    "role": "system",
+                    "content": f"""Genera exactamente {max_keywords} keywords relevantes para SEO de YouTube Shorts para cada texto.
+Responde ÚNICAMENTE con un JSON object que mapee el índice de cada texto a su array de keywords: {{"0": ["keyword1", ...], "1": [...]}}"""
+                },
+                {
+                    "role": "user",
+                    "content": f"Textos:\n{scripts}"
+                }
+            ]
 
-        # Limpiar texto y obtener palabras
-        words = re.findall(r'\b\w{4,}\b', text.lower())
+            response = await self.client.complete_chat(
+                messages=messages,
+                temperature=0.3,
+                max_tokens=200 * len(texts),
+                response_format={"type": "json_object"}
+            )
 
-        # Filtrar stop words básicas
-        stop_words = {
-            'para', 'que', 'con', 'una', 'por', 'como', 'más', 'pero', 'sus', 'les',
-            'muy', 'todo', 'esta', 'son', 'ser', 'estar', 'hacer', 'puede', 'video'
-        }
+            data = self.client.validate_json_response(response)
 
-        filtered_words = [
-            w for w in words if w not in stop_words and len(w) > 3]
+        except Exception as e:
+            logger.error(f"Error generando keywords en lote: {str(e)}")
+            data = {}
+
+        # El modelo puede devolver JSON válido que no es un objeto (p.ej. una lista)
+        if not isinstance(data, dict):
+            logger.warning("Respuesta de keywords en lote sin formato de objeto")
+            data = {}
+
+        # Fallback por texto si falta o no es una lista
+        results = []
+        for i, text in enumerate(texts):
+            keywords = data.get(str(i))
+            if isinstance(keywords, list):
+                results.append(keywords[:max_keywords])
+            else:
+                results.append(self._extract_basic_keywords(text, max_keywords))
+        return results
 
-        # Contar frecuencias y tomar las más comunes
-        word_counts = Counter(filtered_words)
+    def _extract_basic_keywords(self, text: str, max_keywords: int) -> List[str]:
+        """Extrae keywords básicas como fallback."""
+        # Contar frecuencias sin stop words y tomar las más comunes
+        word_counts = Counter(
+            w for w in _KEYWORD_RE.findall(text.lower()) if w not in _STOP_WORDS)
         return [word for word, _ in word_counts.most_common(max_keywords)]
 
     async def generate_embedding(self, text: str) -> List[float]:
@@ -230,7 +506,7 @@ class OpenAIAudioService(AudioService):
     """Servicio para generación de audio usando OpenAI."""
 
     def __init__(self):
-        self.client = OpenAIClient()
+        self.client = get_openai_client()
 
     async def generate_speech(
         self,
@@ -253,12 +529,20 @@ class OpenAIAudioService(AudioService):
             # Ajustar velocidad en el texto si es necesario
             processed_text = self._process_text_for_speech(text, speed)
 
+            cache_key = _speech_cache.key(_SPEECH_MODEL, voice, processed_text)
+            cached = _speech_cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    f"Audio obtenido del cache: {len(cached)} bytes, voz: {voice}")
+                return cached
+
             audio_data = await self.client.generate_audio(
                 text=processed_text,
                 voice=voice,
-                model="tts-1-hd",  # Usar modelo HD para mejor calidad
+                model=_SPEECH_MODEL,  # Usar modelo HD para mejor calidad
                 response_format="mp3"
             )
+            _speech_cache.put(cache_key, audio_data)
 
             logger.info(
                 f"Audio generado: {len(audio_data)} bytes, voz: {voice}")
@@ -268,15 +552,52 @@ class OpenAIAudioService(AudioService):
             logger.error(f"Error generando speech: {str(e)}")
             raise
 
+    async def stream_speech(
+        self,
+        text: str,
+        voice: str = "alloy",
+        speed: float = 1.0
+    ) -> AsyncIterator[bytes]:
+        """
+        Genera audio de texto a voz en chunks, sin esperar al MP3 completo.
+
+        Args:
+            text: Texto a convertir
+            voice: Voz a utilizar
+            speed: Velocidad del habla (0.25 - 4.0)
+
+        Yields:
+            bytes: Fragmentos del audio en formato MP3
+        """
+        processed_text = self._process_text_for_speech(text, speed)
+
+        cache_key = _speech_cache.key(_SPEECH_MODEL, voice, processed_text)
+        cached = _speech_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        # Acumular mientras se reenvía: solo se cachea si el stream termina
+        chunks = []
+        async for chunk in self.client.stream_audio(
+            text=processed_text,
+            voice=voice,
+            model=_SPEECH_MODEL,
+            response_format="mp3"
+        ):
+            chunks.append(chunk)
+            yield chunk
+
+        _speech_cache.put(cache_key, b"".join(chunks))
+
     def _process_text_for_speech(self, text: str, speed: float) -> str:
         """Procesa el texto para mejorar la síntesis de voz."""
         # Normalizar espacios
-        text = ' '.join(text.split())
+        text = _WHITESPACE_RE.sub(" ", text).strip()
 
-        # Añadir pausas en puntos para mejor fluidez
-        text = text.replace('.', '... ')
-        text = text.replace('!', '! ')
-        text = text.replace('?', '? ')
+        # Añadir pausas en puntos para mejor fluidez (una sola pasada)
+        text = _SPEECH_PAUSE_RE.sub(
+            lambda match: _SPEECH_PAUSES[match.group()], text)
 
         return text.strip()
 
@@ -1,21 +1,75 @@
 """
 Supabase client adapter for authentication and storage
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from supabase import create_client, Client
 import httpx
+from blake3 import blake3
+import pybase64
 
 from app.core.config import settings
+from app.core.security import security
 
 logger = logging.getLogger(__name__)
 
+# Subidas resumibles (TUS) de Supabase Storage: chunks fijos de 6 MB
+RESUMABLE_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+
+# Cache de tokens verificados: blake3(token) -> (expira_en, user_data)
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_SWEEP_SIZE = 1024
+_token_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Calcula la clave de cache de un token sin guardar el token en claro.
+
+    Args:
+        token: Token JWT
+
+    Returns:
+        bytes: Digest de 16 bytes del token
+    """
+    return blake3(token.encode("utf-8")).digest(length=16)
+
+
+def _cache_verified_token(key: bytes, user_data: Dict[str, Any]) -> None:
+    """
+    Guarda un token verificado hasta min(exp del token, ahora + TTL).
+
+    Args:
+        key: Clave calculada con _token_cache_key
+        user_data: Información del usuario devuelta por la verificación
+    """
+    now = time.time()
+    expires_at = now + TOKEN_CACHE_TTL_SECONDS
+    if user_data.get("exp"):
+        expires_at = min(expires_at, float(user_data["exp"]))
+
+    # Limpieza perezosa de entradas expiradas cuando el cache crece
+    if len(_token_cache) >= TOKEN_CACHE_SWEEP_SIZE:
+        for expired_key in [k for k, (exp, _) in _token_cache.items() if exp <= now]:
+            del _token_cache[expired_key]
+
+    _token_cache[key] = (expires_at, user_data)
+
 
 class SupabaseClient:
     """Cliente adaptador para Supabase."""
 
     def __init__(self):
-        """Inicializa el cliente de Supabase."""
+        """
+        Inicializa el cliente de Supabase.
+
+        El SDK es síncrono: las llamadas de red se ejecutan con
+        asyncio.to_thread para no bloquear el event loop.
+        """
         if not settings.supabase_configured:
             raise ValueError("Supabase no configurado correctamente")
 
@@ -24,6 +78,9 @@ class SupabaseClient:
             settings.SUPABASE_ANON_KEY
         )
 
+        # Cliente HTTP asíncrono para las subidas resumibles contra Storage
+        self._http: Optional[httpx.AsyncClient] = None
+
     async def verify_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Verifica un JWT token de Supabase.
@@ -35,11 +92,36 @@ class SupabaseClient:
             Dict con información del usuario o None si es inválido
         """
         try:
-            # Usar el token para obtener información del usuario
-            response = self.client.auth.get_user(jwt=token)
+            cache_key = _token_cache_key(token)
+            cached = _token_cache.get(cache_key)
+            if cached and cached[0] > time.time():
+                return cached[1]
+
+            # Verificación local con el secret del proyecto (sin round-trip).
+            # Devuelve las mismas claves que la verificación remota: las
+            # fechas de la cuenta no viajan en los claims del JWT
+            if settings.SUPABASE_JWT_SECRET:
+                payload = security.verify_supabase_token(token)
+                if payload:
+                    user_data = {
+                        "id": payload.get("sub"),
+                        "email": payload.get("email"),
+                        "user_metadata": payload.get("user_metadata", {}),
+                        "app_metadata": payload.get("app_metadata", {}),
+                        "aud": payload.get("aud"),
+                        "created_at": None,
+                        "confirmed_at": None,
+                        "last_sign_in_at": None,
+                        "exp": payload.get("exp")
+                    }
+                    _cache_verified_token(cache_key, user_data)
+                    return user_data
+
+            # Fallback: validar contra Supabase Auth
+            response = await asyncio.to_thread(self.client.auth.get_user, jwt=token)
 
             if response.user:
-                return {
+                user_data = {
                     "id": response.user.id,
                     "email": response.user.email,
                     "user_metadata": response.user.user_metadata,
@@ -47,8 +129,11 @@ class SupabaseClient:
                     "aud": response.user.aud,
                     "created_at": response.user.created_at,
                     "confirmed_at": response.user.confirmed_at,
-                    "last_sign_in_at": response.user.last_sign_in_at
+                    "last_sign_in_at": response.user.last_sign_in_at,
+                    "exp": None
                 }
+                _cache_verified_token(cache_key, user_data)
+                return user_data
             return None
 
         except Exception as e:
@@ -67,10 +152,10 @@ class SupabaseClient:
             Dict con información del usuario o None
         """
         try:
-            # Establecer el token de sesión
-            self.client.auth.set_session(token, "")
-
-            response = self.client.auth.get_user()
+            # Validar el token directamente, sin mutar la sesión del cliente
+            # compartido (set_session añadía un round-trip y no es seguro
+            # con requests concurrentes)
+            response = await asyncio.to_thread(self.client.auth.get_user, jwt=token)
 
             if response.user and response.user.id == user_id:
                 return {
@@ -105,8 +190,15 @@ class SupabaseClient:
             URL pública del archivo o None si falla
         """
         try:
+            # Archivos grandes: subida resumible por chunks
+            if len(file_data) >= RESUMABLE_UPLOAD_THRESHOLD:
+                return await self._upload_resumable(
+                    bucket, file_path, file_data,
+                    content_type or "application/octet-stream")
+
             # Subir archivo
-            response = self.client.storage.from_(bucket).upload(
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).upload,
                 file_path,
                 file_data,
                 file_options={"content-type": content_type} if content_type else None
@@ -124,6 +216,78 @@ class SupabaseClient:
             logger.error(f"Error subiendo archivo: {str(e)}")
             return None
 
+    async def _upload_resumable(
+        self,
+        bucket: str,
+        file_path: str,
+        file_data: bytes,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Sube un archivo grande con el protocolo TUS de Supabase Storage.
+
+        Los chunks se recortan con memoryview y solo se copia el que se está
+        enviando. TUS exige que los chunks lleguen en orden, así que se
+        envían secuencialmente siguiendo el Upload-Offset confirmado.
+
+        Args:
+            bucket: Nombre del bucket
+            file_path: Ruta del archivo en el bucket
+            file_data: Datos del archivo
+            content_type: Tipo de contenido
+
+        Returns:
+            URL pública del archivo o None si falla
+        """
+        try:
+            def encode(value: str) -> str:
+                return pybase64.b64encode(value.encode("utf-8")).decode("ascii")
+
+            http = self._get_http_client()
+            headers = self._storage_headers()
+            headers["Tus-Resumable"] = "1.0.0"
+
+            create = await http.post(
+                "/upload/resumable",
+                headers={
+                    **headers,
+                    "Upload-Length": str(len(file_data)),
+                    "Upload-Metadata": ",".join([
+                        f"bucketName {encode(bucket)}",
+                        f"objectName {encode(file_path)}",
+                        f"contentType {encode(content_type)}"
+                    ])
+                }
+            )
+            create.raise_for_status()
+            upload_url = create.headers["Location"]
+
+            view = memoryview(file_data)
+            offset = 0
+            while offset < len(view):
+                chunk = view[offset:offset + RESUMABLE_CHUNK_SIZE]
+                response = await http.patch(
+                    upload_url,
+                    content=chunk.tobytes(),
+                    headers={
+                        **headers,
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream"
+                    }
+                )
+                response.raise_for_status()
+                offset = int(response.headers.get(
+                    "Upload-Offset", offset + len(chunk)))
+
+            public_url = self.get_public_url(bucket, file_path)
+            logger.info(
+                f"Archivo subido por chunks ({len(file_data)} bytes): {public_url}")
+            return public_url
+
+        except Exception as e:
+            logger.error(f"Error en subida resumible: {str(e)}")
+            return None
+
     async def download_file(self, bucket: str, file_path: str) -> Optional[bytes]:
         """
         Descarga un archivo del storage de Supabase.
@@ -136,7 +300,8 @@ class SupabaseClient:
             Datos del archivo o None si falla
         """
         try:
-            response = self.client.storage.from_(bucket).download(file_path)
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).download, file_path)
 
             if response:
                 logger.info(f"Archivo descargado: {file_path}")
@@ -148,6 +313,40 @@ class SupabaseClient:
             logger.error(f"Error descargando archivo: {str(e)}")
             return None
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Devuelve el cliente HTTP asíncrono usado para las subidas resumibles.
+
+        Returns:
+            httpx.AsyncClient: Cliente con pool de conexiones reutilizable
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=f"{settings.SUPABASE_URL}/storage/v1",
+                timeout=httpx.Timeout(300.0, connect=10.0)
+            )
+        return self._http
+
+    def _storage_headers(self, token: Optional[str] = None) -> Dict[str, str]:
+        """
+        Construye las cabeceras de autenticación para la API de Storage.
+
+        Usa las mismas credenciales que el cliente del SDK (anon key) para
+        que RLS se aplique igual sea cual sea el tamaño del archivo: nunca
+        se recurre implícitamente a la service role key.
+
+        Args:
+            token: JWT del usuario (por defecto la anon key)
+
+        Returns:
+            Dict con cabeceras apikey y Authorization
+        """
+        bearer = token or settings.SUPABASE_ANON_KEY
+        return {
+            "apikey": settings.SUPABASE_ANON_KEY,
+            "Authorization": f"Bearer {bearer}"
+        }
+
     async def delete_file(self, bucket: str, file_path: str) -> bool:
         """
         Elimina un archivo del storage.
@@ -160,7 +359,8 @@ class SupabaseClient:
             True si se eliminó exitosamente
         """
         try:
-            response = self.client.storage.from_(bucket).remove([file_path])
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).remove, [file_path])
 
             if response:
                 logger.info(f"Archivo eliminado: {file_path}")
@@ -184,7 +384,8 @@ class SupabaseClient:
             Lista de archivos
         """
         try:
-            response = self.client.storage.from_(bucket).list(folder)
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).list, folder)
 
             if response:
                 return [
@@ -222,7 +423,8 @@ class SupabaseClient:
             URL firmada o None si falla
         """
         try:
-            response = self.client.storage.from_(bucket).create_signed_url(
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).create_signed_url,
                 file_path,
                 expires_in
             )
@@ -278,7 +480,8 @@ class SupabaseClient:
             True si se creó exitosamente
         """
         try:
-            response = self.client.storage.create_bucket(bucket_name, public=public)
+            response = await asyncio.to_thread(
+                self.client.storage.create_bucket, bucket_name, public=public)
 
             if response:
                 logger.info(f"Bucket creado: {bucket_name}")
@@ -288,4 +491,21 @@ class SupabaseClient:
 
         except Exception as e:
             logger.error(f"Error creando bucket: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    async def close(self) -> None:
+        """Cierra el cliente HTTP de Storage si se llegó a crear."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> SupabaseClient:
+    """
+    Devuelve la instancia compartida de SupabaseClient.
+
+    Returns:
+        SupabaseClient: Cliente único del proceso, con su pool de conexiones
+    """
+    return SupabaseClient()
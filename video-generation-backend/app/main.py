@@ -3,15 +3,22 @@ FastAPI Video Generation API - Hexagonal Architecture
 """
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from functools import lru_cache
+
+import orjson
+from blake3 import blake3
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
 
 from app.core.config import settings
 from app.core.events import lifespan, setup_logging
-from app.core.container import container, check_services_health
+from app.core.container import check_services_health
 from app.api.v1.api import api_router
+from app.api.middleware.compression import SelectiveGZipMiddleware
 from app.api.middleware.cors import setup_cors
 from app.api.middleware.error_handler import ErrorHandlerMiddleware, setup_error_handlers
 from app.api.middleware.rate_limit import create_rate_limit_middleware
+from app.api.middleware.health_check import HealthCheckInterceptor
 from app.schemas.base import HealthResponse
 
 # Setup logging first
@@ -26,7 +33,8 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     openapi_url="/openapi.json" if settings.DEBUG else None,
-    lifespan=lifespan  # Use the lifespan from core.events
+    lifespan=lifespan,  # Use the lifespan from core.events
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json
 )
 
 # Setup middleware
@@ -46,6 +54,15 @@ if not settings.DEBUG:  # Only in production
 # 3. CORS middleware
 setup_cors(app)
 
+# 4. Response compression (small bodies like /health are left as-is; the
+#    MP3 stream is already compressed)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    exclude_paths={f"{settings.API_V1_PREFIX}/text-to-speech/stream"}
+)
+
 # Setup custom error handlers
 setup_error_handlers(app)
 
@@ -53,32 +70,120 @@ setup_error_handlers(app)
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+# Cuerpos estáticos de / e /info: no cambian entre reinicios, así que se
+# serializan una sola vez
+_ROOT_BODY = orjson.dumps({
+    "message": f"Bienvenido a {settings.APP_NAME}",
+    "version": settings.APP_VERSION,
+    "environment": settings.ENVIRONMENT,
+    "architecture": "Hexagonal Architecture (Ports & Adapters)",
+    "docs_url": "/docs" if settings.DEBUG else "Documentación deshabilitada en producción",
+    "api_v1": settings.API_V1_PREFIX,
+    "features": [
+        "✅ Mejora de scripts con IA",
+        "✅ Generación de audio TTS",
+        "✅ Autenticación JWT con Supabase",
+        "✅ Rate limiting",
+        "✅ Manejo global de errores",
+        "✅ Arquitectura hexagonal"
+    ]
+})
+
+# Cache HTTP de los cuerpos estáticos: monitores y balanceadores revalidan
+# con If-None-Match y reciben un 304 sin cuerpo
+_STATIC_CACHE_CONTROL = "public, max-age=300"
+
+
+def _etag(body: bytes) -> str:
+    """Calcula el ETag fuerte de un cuerpo estático."""
+    return f'"{blake3(body).hexdigest(length=16)}"'
+
+
+_ROOT_ETAG = _etag(_ROOT_BODY)
+
+
+def _static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Sirve un cuerpo JSON precalculado con ETag y Cache-Control.
+
+    Args:
+        request: Request entrante (para leer If-None-Match)
+        body: Cuerpo JSON ya serializado
+        etag: ETag del cuerpo
+
+    Returns:
+        Response: 304 si el cliente ya tiene la versión actual, 200 si no
+    """
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=1)
+def _info_body() -> bytes:
+    """Serializa (una vez) la información detallada de la API."""
+    return orjson.dumps({
+        "api": {
+            "name": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+            "environment": settings.ENVIRONMENT,
+            "debug": settings.DEBUG
+        },
+        "architecture": {
+            "pattern": "Hexagonal Architecture (Ports & Adapters)",
+            "layers": {
+                "presentation": "FastAPI + Pydantic schemas",
+                "application": "Use cases + interfaces",
+                "domain": "Entities + repositories + domain services",
+                "infrastructure": "Database + external services"
+            },
+            "principles": [
+                "Dependency Inversion",
+                "Single Responsibility",
+                "Domain-Driven Design",
+                "Clean Architecture"
+            ]
+        },
+        "services": {
+            "openai": "✅ Configurado" if settings.openai_configured else "❌ No configurado",
+            "supabase": "✅ Configurado" if settings.supabase_configured else "❌ No configurado",
+            "jwt": "✅ Configurado" if settings.jwt_configured else "❌ No configurado"
+        },
+        "features": {
+            "authentication": "Supabase JWT",
+            "rate_limiting": f"{settings.RATE_LIMIT_PER_MINUTE} requests/min",
+            "cors_origins": settings.cors_origins_list,
+            "database": "PostgreSQL (via SQLAlchemy)",
+            "ai_services": ["OpenAI GPT-4", "OpenAI TTS", "OpenAI Whisper"],
+            "storage": "Supabase Storage"
+        },
+        "endpoints": {
+            "api_v1": settings.API_V1_PREFIX,
+            "docs": "/docs" if settings.DEBUG else None,
+            "health": "/health",
+            "root": "/"
+        }
+    })
+
+
+@lru_cache(maxsize=1)
+def _info_etag() -> str:
+    """Calcula (una vez) el ETag de la información detallada."""
+    return _etag(_info_body())
+
+
 @app.get(
     "/",
     tags=["Root"],
     summary="API Root",
     description="Endpoint raíz de la API con información general"
 )
-async def root():
+async def root(request: Request):
     """
     Endpoint raíz que proporciona información básica de la API.
     """
-    return {
-        "message": f"Bienvenido a {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "environment": settings.ENVIRONMENT,
-        "architecture": "Hexagonal Architecture (Ports & Adapters)",
-        "docs_url": "/docs" if settings.DEBUG else "Documentación deshabilitada en producción",
-        "api_v1": settings.API_V1_PREFIX,
-        "features": [
-            "✅ Mejora de scripts con IA",
-            "✅ Generación de audio TTS",
-            "✅ Autenticación JWT con Supabase",
-            "✅ Rate limiting",
-            "✅ Manejo global de errores",
-            "✅ Arquitectura hexagonal"
-        ]
-    }
+    return _static_json_response(request, _ROOT_BODY, _ROOT_ETAG)
 
 
 @app.get(
@@ -93,11 +198,7 @@ async def health():
     Health check endpoint que verifica el estado de todos los servicios.
     """
     try:
-        # Initialize container if not already done
-        if not container._initialized:
-            container.initialize()
-
-        # Check all services
+        # Check all services (container is initialized in the lifespan)
         services_status = await check_services_health()
 
         # Determine overall status
@@ -124,67 +225,17 @@ async def health():
     summary="API Information",
     description="Información detallada sobre la configuración y arquitectura"
 )
-async def info():
+async def info(request: Request):
     """
     Proporciona información detallada sobre la API y su configuración.
     """
-    return {
-        "api": {
-            "name": settings.APP_NAME,
-            "version": settings.APP_VERSION,
-            "environment": settings.ENVIRONMENT,
-            "debug": settings.DEBUG
-        },
-        "architecture": {
-            "pattern": "Hexagonal Architecture (Ports & Adapters)",
-            "layers": {
-                "presentation": "FastAPI + Pydantic schemas",
-                "application": "Use cases + interfaces",
-                "domain": "Entities + repositories + domain services",
-                "infrastructure": "Database + external services"
-            },
-            "principles": [
-                "Dependency Inversion",
-                "Single Responsibility",
-                "Domain-Driven Design",
-                "Clean Architecture"
-            ]
-        },
-        "services": {
-            "openai": "✅ Configurado" if settings.openai_configured else "❌ No configurado",
-            "supabase": "✅ Configurado" if settings.supabase_configured else "❌ No configurado",
-            "jwt": "✅ Configurado" if settings.jwt_configured else "❌ No configurado"
-        },
-        "features": {
-            "authentication": "Supabase JWT",
-            "rate_limiting": f"{settings.RATE_LIMIT_PER_MINUTE} requests/min",
-            "cors_origins": settings.cors_origins_list,
-            "database": "PostgreSQL (via SQLAlchemy)",
-            "ai_services": ["OpenAI GPT-4", "OpenAI TTS", "OpenAI Whisper"],
-            "storage": "Supabase Storage"
-        },
-        "endpoints": {
-            "api_v1": settings.API_V1_PREFIX,
-            "docs": "/docs" if settings.DEBUG else None,
-            "health": "/health",
-            "root": "/"
-        }
-    }
+    return _static_json_response(request, _info_body(), _info_etag())
 
 
-# Global exception handler for uncaught exceptions
-@app.exception_handler(500)
-async def internal_error_handler(request, exc):
-    """
-    Handler global para errores 500 no capturados.
-    """
-    logger.error(f"Unhandled error: {str(exc)}")
-    return {
-        "success": False,
-        "error": "Error interno del servidor",
-        "error_code": "INTERNAL_SERVER_ERROR",
-        "timestamp": "2024-01-01T12:00:00Z"
-    }
+# Las sondas GET /health se responden desde cache sin atravesar el stack de
+# middleware; fastapi_app queda expuesta para tests
+fastapi_app = app
+app = HealthCheckInterceptor(fastapi_app, health_provider=health, cache_ttl=5.0)
 
 
 if __name__ == "__main__":
@@ -195,10 +246,16 @@ if __name__ == "__main__":
     logger.info(f"Debug: {settings.DEBUG}")
     logger.info(f"Host: {settings.API_HOST}:{settings.API_PORT}")
 
+    # uvloop + httptools (incluidos en uvicorn[standard]) en lugar de
+    # asyncio + h11
     uvicorn.run(
         "app.main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.DEBUG,
+        workers=settings.worker_count,
+        loop="uvloop",
+        http="httptools",
+        proxy_headers=True,
         log_level=settings.LOG_LEVEL.lower()
     )
\ No newline at end of file
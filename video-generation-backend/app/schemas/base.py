@@ -1,50 +1,44 @@
 """
 Base schemas and common types
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Any, Dict
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Any, Dict, Literal, Tuple
+from typing_extensions import Annotated
 from datetime import datetime
 from enum import Enum
 
+from app.domain.entities.script import Category, SegmentType, Tone
+from app.domain.entities.video import VoiceId
 
-class CategoriaEnum(str, Enum):
-    """Categorías de contenido disponibles."""
-    TECH = "tech"
-    MARKETING = "marketing"
-    EDUCATION = "education"
-    ENTERTAINMENT = "entertainment"
-    LIFESTYLE = "lifestyle"
-    BUSINESS = "business"
-    FITNESS = "fitness"
-    FOOD = "food"
-    TRAVEL = "travel"
-    NEWS = "news"
 
+# Los enums de la API son los del dominio: un solo Enum (y un solo core
+# schema de pydantic) por concepto. Se mantienen los nombres en español
+# como alias para los schemas existentes
+CategoriaEnum = Category
+TonoEnum = Tone
+TipoSegmentoEnum = SegmentType
+VozEnum = VoiceId
 
-class TonoEnum(str, Enum):
-    """Tonos disponibles para scripts."""
-    EDUCATIVO = "educativo"
-    VIRAL = "viral"
-    PROFESIONAL = "profesional"
-    CASUAL = "casual"
-    ENERGETICO = "energetico"
+# Variantes Literal para los modelos de request: pydantic-core las valida
+# como un match de strings en Rust, sin construir miembros del Enum. Se
+# generan desde los enums del dominio para que no puedan divergir
+TonoLiteral = Literal[tuple(tone.value for tone in Tone)]
+CategoriaLiteral = Literal[tuple(category.value for category in Category)]
+VozLiteral = Literal[tuple(voice.value for voice in VoiceId)]
 
+# Timestamp de los envoltorios de respuesta: solo viaja como JSON, así que se
+# guarda ya formateado (ISO-8601 UTC) y pydantic-core lo emite tal cual
+IsoTimestamp = Annotated[str, Field(json_schema_extra={"format": "date-time"})]
 
-class TipoSegmentoEnum(str, Enum):
-    """Tipos de segmento en scripts."""
-    HOOK = "hook"
-    CONTENIDO = "contenido"
-    CTA = "cta"
 
+def utc_timestamp() -> str:
+    """
+    Genera el timestamp actual para las respuestas.
 
-class VozEnum(str, Enum):
-    """Voces disponibles para TTS."""
-    ALLOY = "alloy"
-    ECHO = "echo"
-    FABLE = "fable"
-    ONYX = "onyx"
-    NOVA = "nova"
-    SHIMMER = "shimmer"
+    Returns:
+        str: Instante UTC en ISO-8601 con milisegundos (ej. 2024-01-01T12:00:00.000Z)
+    """
+    return datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
 
 
 class CalidadVideoEnum(str, Enum):
@@ -56,23 +50,29 @@ class CalidadVideoEnum(str, Enum):
 
 class BaseResponse(BaseModel):
     """Base response model."""
+    model_config = ConfigDict(frozen=True)
+
     success: bool = True
     message: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: IsoTimestamp = Field(default_factory=utc_timestamp)
 
 
 class ErrorResponse(BaseModel):
     """Error response model."""
+    model_config = ConfigDict(frozen=True)
+
     success: bool = False
     error: str
     error_code: Optional[str] = None
     details: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: IsoTimestamp = Field(default_factory=utc_timestamp)
 
 
 class PaginatedResponse(BaseModel):
     """Paginated response base."""
-    items: List[Any] = []
+    model_config = ConfigDict(frozen=True)
+
+    items: Tuple[Any, ...] = Field(default_factory=tuple)
     total_count: int = 0
     page: int = 1
     page_size: int = 10
@@ -85,10 +85,12 @@ class PaginatedResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(frozen=True)
+
     status: str = "healthy"
     version: str = "1.0.0"
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    services: Dict[str, str] = {}
+    timestamp: IsoTimestamp = Field(default_factory=utc_timestamp)
+    services: Dict[str, str] = Field(default_factory=dict)
 
 
 class ValidationError(BaseModel):
@@ -1,20 +1,23 @@
 """
 Audio request schemas
 """
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, StringConstraints, field_validator
 from typing import Optional
-from ..base import VozEnum
+from typing_extensions import Annotated
+from ..base import VozLiteral
 
 
 class AudioGenerateRequest(BaseModel):
     """Request para generar audio desde un script."""
 
-    script_id: str = Field(
+    # strip y límites se aplican en pydantic-core, sin validadores Python
+    script_id: Annotated[str, StringConstraints(
+        strip_whitespace=True, min_length=1)] = Field(
         ...,
         description="ID del script para generar audio"
     )
-    voice: VozEnum = Field(
-        default=VozEnum.ALLOY,
+    voice: VozLiteral = Field(
+        default="alloy",
         description="Voz a utilizar"
     )
     speed: float = Field(
@@ -28,26 +31,17 @@ class AudioGenerateRequest(BaseModel):
         description="Si guardar el audio en storage"
     )
 
-    @field_validator('script_id')
-    @classmethod
-    def validate_script_id(cls, v: str) -> str:
-        """Valida el ID del script."""
-        if not v.strip():
-            raise ValueError('El ID del script no puede estar vacío')
-        return v.strip()
-
 
 class TextToAudioRequest(BaseModel):
     """Request para generar audio directamente desde texto."""
 
-    text: str = Field(
+    text: Annotated[str, StringConstraints(
+        strip_whitespace=True, min_length=10, max_length=3000)] = Field(
         ...,
-        min_length=10,
-        max_length=3000,
         description="Texto a convertir en audio"
     )
-    voice: VozEnum = Field(
-        default=VozEnum.ALLOY,
+    voice: VozLiteral = Field(
+        default="alloy",
         description="Voz a utilizar"
     )
     speed: float = Field(
@@ -61,15 +55,6 @@ class TextToAudioRequest(BaseModel):
         description="Si guardar el audio en storage"
     )
 
-    @field_validator('text')
-    @classmethod
-    def validate_text(cls, v: str) -> str:
-        """Valida y limpia el texto."""
-        cleaned = v.strip()
-        if not cleaned:
-            raise ValueError('El texto no puede estar vacío')
-        return cleaned
-
 
 class AudioTranscribeRequest(BaseModel):
     """Request para transcribir audio (metadata, el audio va en multipart)."""
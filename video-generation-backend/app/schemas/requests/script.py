@@ -1,18 +1,19 @@
 """
 Script request schemas
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
-from ..base import CategoriaEnum, TonoEnum
+from pydantic import BaseModel, Field, StringConstraints, field_validator
+from typing import List, Optional
+from typing_extensions import Annotated
+from ..base import CategoriaLiteral, TonoLiteral
 
 
 class ScriptEnhanceRequest(BaseModel):
     """Request para mejorar un script con IA."""
 
-    script: str = Field(
+    # strip y límites se aplican en pydantic-core, sin validadores Python
+    script: Annotated[str, StringConstraints(
+        strip_whitespace=True, min_length=10, max_length=2000)] = Field(
         ...,
-        min_length=10,
-        max_length=2000,
         description="Texto original del script a mejorar"
     )
     target_duration: int = Field(
@@ -21,35 +22,30 @@ class ScriptEnhanceRequest(BaseModel):
         le=120,
         description="Duración objetivo en segundos"
     )
-    tone: TonoEnum = Field(
-        default=TonoEnum.CASUAL,
+    tone: TonoLiteral = Field(
+        default="casual",
         description="Tono deseado para el script"
     )
-    category: CategoriaEnum = Field(
-        default=CategoriaEnum.EDUCATION,
+    category: CategoriaLiteral = Field(
+        default="education",
         description="Categoría del contenido"
     )
-    target_audience: str = Field(
+    target_audience: Annotated[str, StringConstraints(
+        strip_whitespace=True, to_lower=True, min_length=1, max_length=100)] = Field(
         default="general",
-        min_length=1,
-        max_length=100,
         description="Audiencia objetivo"
     )
 
-    @field_validator('script')
-    @classmethod
-    def validate_script(cls, v: str) -> str:
-        """Valida y limpia el script."""
-        cleaned = v.strip()
-        if not cleaned:
-            raise ValueError('El script no puede estar vacío')
-        return cleaned
 
-    @field_validator('target_audience')
-    @classmethod
-    def validate_audience(cls, v: str) -> str:
-        """Valida y limpia la audiencia objetivo."""
-        return v.strip().lower()
+class ScriptEnhanceBatchRequest(BaseModel):
+    """Request para mejorar varios scripts en una sola llamada."""
+
+    items: List[ScriptEnhanceRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=10,
+        description="Scripts a mejorar (máximo 10)"
+    )
 
 
 class ScriptListRequest(BaseModel):
@@ -57,8 +53,8 @@ class ScriptListRequest(BaseModel):
 
     page: int = Field(default=1, ge=1, description="Número de página")
     page_size: int = Field(default=10, ge=1, le=50, description="Tamaño de página")
-    category: Optional[CategoriaEnum] = Field(default=None, description="Filtrar por categoría")
-    tone: Optional[TonoEnum] = Field(default=None, description="Filtrar por tono")
+    category: Optional[CategoriaLiteral] = Field(default=None, description="Filtrar por categoría")
+    tone: Optional[TonoLiteral] = Field(default=None, description="Filtrar por tono")
     search: Optional[str] = Field(default=None, description="Búsqueda en texto")
 
     @field_validator('search')
@@ -79,7 +75,9 @@ class ScriptUpdateRequest(BaseModel):
         max_length=3000,
         description="Script mejorado editado manualmente"
     )
-    keywords: Optional[list[str]] = Field(
+    # strip y minúsculas por keyword se aplican en pydantic-core
+    keywords: Optional[list[Annotated[str, StringConstraints(
+        strip_whitespace=True, to_lower=True)]]] = Field(
         default=None,
         description="Palabras clave actualizadas"
     )
@@ -98,12 +96,7 @@ class ScriptUpdateRequest(BaseModel):
     def validate_keywords(cls, v: Optional[list[str]]) -> Optional[list[str]]:
         """Valida las palabras clave."""
         if v:
-            # Filtrar y limpiar keywords
-            cleaned_keywords = []
-            for keyword in v:
-                if isinstance(keyword, str):
-                    clean_keyword = keyword.strip().lower()
-                    if clean_keyword and len(clean_keyword) >= 2:
-                        cleaned_keywords.append(clean_keyword)
-            return cleaned_keywords[:20]  # Máximo 20 keywords
+            # Descartar keywords demasiado cortas (ya vienen limpias);
+            # máximo 20 keywords
+            return [keyword for keyword in v if len(keyword) >= 2][:20]
         return v
\ No newline at end of file
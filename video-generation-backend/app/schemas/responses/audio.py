@@ -1,83 +1,193 @@
 """
 Audio response schemas
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, WithJsonSchema
+from typing import Annotated, Optional, Dict, Any
 from datetime import datetime
 from ..base import BaseResponse, VozEnum
 
 
+@lru_cache(maxsize=1)
+def _examples() -> Dict[str, Dict[str, Any]]:
+    """
+    Ejemplos OpenAPI de los schemas de audio.
+
+    Solo se construyen al generar /openapi.json (deshabilitado en
+    producción), no al importar el módulo.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Ejemplo por nombre de schema
+    """
+    return {
+        "AudioGenerateResponse": {
+            "success": True,
+            "message": "Audio generado exitosamente",
+            "timestamp": "2024-01-01T12:00:00Z",
+            "data": {
+                "script_id": "uuid-script",
+                "voice": "alloy",
+                "speed": 1.0,
+                "text_length": 250,
+                "estimated_duration": 45.5,
+                "audio_size": 1048576,
+                "audio_url": "https://storage.example.com/audio/user123/script_audio_uuid.mp3",
+                "stored": True,
+                "generated_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "TextToAudioResponse": {
+            "success": True,
+            "message": "Texto convertido a audio exitosamente",
+            "data": {
+                "text_length": 180,
+                "voice": "nova",
+                "speed": 1.2,
+                "estimated_duration": 32.5,
+                "audio_size": 890123,
+                "audio_base64": "UklGRiQAAABXQVZFZm10...",
+                "stored": False,
+                "generated_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "AudioTranscribeResponse": {
+            "success": True,
+            "message": "Audio transcrito exitosamente",
+            "data": {
+                "transcription": "Hola, este es el texto transcrito del audio...",
+                "character_count": 89,
+                "word_count": 15,
+                "audio_size": 2048576,
+                "language_detected": "es",
+                "confidence_score": 0.95,
+                "transcribed_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "AudioDeleteResponse": {
+            "success": True,
+            "message": "Audio eliminado exitosamente",
+            "data": {
+                "audio_url": "https://storage.example.com/audio/user123/audio_file.mp3",
+                "deleted": True,
+                "deleted_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "AudioListResponse": {
+            "success": True,
+            "data": {
+                "audios": [
+                    {
+                        "url": "https://storage.example.com/audio/user123/audio1.mp3",
+                        "duration": 45.5,
+                        "size": 1048576,
+                        "voice": "alloy",
+                        "speed": 1.0,
+                        "created_at": "2024-01-01T12:00:00Z"
+                    }
+                ],
+                "total_count": 8,
+                "total_duration": 320.5,
+                "total_size": 8388608
+            }
+        },
+        "VoiceListResponse": {
+            "success": True,
+            "data": {
+                "voices": [
+                    {
+                        "id": "alloy",
+                        "name": "Alloy",
+                        "description": "Voz neutral y versátil",
+                        "gender": "neutral",
+                        "language": "multi"
+                    },
+                    {
+                        "id": "echo",
+                        "name": "Echo",
+                        "description": "Voz masculina clara",
+                        "gender": "male",
+                        "language": "multi"
+                    }
+                ]
+            }
+        },
+        "AudioHealthResponse": {
+            "success": True,
+            "data": {
+                "tts_service": "operational",
+                "transcription_service": "operational",
+                "storage_service": "operational",
+                "response_time_ms": 150,
+                "last_check": "2024-01-01T12:00:00Z"
+            }
+        }
+    }
+
+
+def _add_example(schema: Dict[str, Any], model: type) -> None:
+    """Añade el ejemplo del schema al generar el JSON schema."""
+    schema["example"] = _examples()[model.__name__]
+
+
+class TextToAudioData(BaseModel):
+    """Datos del audio generado desde texto."""
+
+    model_config = ConfigDict(frozen=True)
+
+    text_length: int = Field(..., description="Caracteres convertidos")
+    voice: VozEnum = Field(..., description="Voz utilizada")
+    speed: float = Field(..., description="Velocidad utilizada")
+    estimated_duration: float = Field(..., description="Duración en segundos")
+    audio_size: int = Field(..., description="Tamaño del audio en bytes")
+    generated_at: datetime = Field(..., description="Fecha de generación")
+    stored: bool = Field(..., description="Si el audio se guardó en storage")
+    audio_url: Optional[str] = Field(None, description="URL del audio guardado")
+    # bytes ASCII: se serializan como string JSON (ser_json_bytes="utf8")
+    # sin copiarlos a un str de Python; en OpenAPI se documenta como base64
+    audio_base64: Optional[Annotated[bytes, WithJsonSchema({"type": "string", "format": "byte"})]] = Field(
+        None, description="Audio en base64 si no se guardó")
+
+
+class AudioGenerateData(TextToAudioData):
+    """Datos del audio generado para un script."""
+
+    script_id: str = Field(..., description="ID del script")
+
+
+class AudioTranscribeData(BaseModel):
+    """Datos de una transcripción."""
+
+    model_config = ConfigDict(frozen=True)
+
+    transcription: str = Field(..., description="Texto transcrito")
+    character_count: int = Field(..., description="Caracteres transcritos")
+    word_count: int = Field(..., description="Palabras transcritas")
+    audio_size: int = Field(..., description="Tamaño del audio en bytes")
+    transcribed_at: datetime = Field(..., description="Fecha de transcripción")
+
+
 class AudioGenerateResponse(BaseResponse):
     """Respuesta de generación de audio."""
 
-    data: Dict[str, Any] = Field(..., description="Datos del audio generado")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Audio generado exitosamente",
-                "timestamp": "2024-01-01T12:00:00Z",
-                "data": {
-                    "script_id": "uuid-script",
-                    "voice": "alloy",
-                    "speed": 1.0,
-                    "text_length": 250,
-                    "estimated_duration": 45.5,
-                    "audio_size": 1048576,
-                    "audio_url": "https://storage.example.com/audio/user123/script_audio_uuid.mp3",
-                    "stored": True,
-                    "generated_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    data: AudioGenerateData = Field(..., description="Datos del audio generado")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class TextToAudioResponse(BaseResponse):
     """Respuesta de conversión de texto a audio."""
 
-    data: Dict[str, Any] = Field(..., description="Datos del audio generado desde texto")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Texto convertido a audio exitosamente",
-                "data": {
-                    "text_length": 180,
-                    "voice": "nova",
-                    "speed": 1.2,
-                    "estimated_duration": 32.5,
-                    "audio_size": 890123,
-                    "audio_base64": "UklGRiQAAABXQVZFZm10...",
-                    "stored": False,
-                    "generated_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    data: TextToAudioData = Field(..., description="Datos del audio generado desde texto")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class AudioTranscribeResponse(BaseResponse):
     """Respuesta de transcripción de audio."""
 
-    data: Dict[str, Any] = Field(..., description="Datos de la transcripción")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Audio transcrito exitosamente",
-                "data": {
-                    "transcription": "Hola, este es el texto transcrito del audio...",
-                    "character_count": 89,
-                    "word_count": 15,
-                    "audio_size": 2048576,
-                    "language_detected": "es",
-                    "confidence_score": 0.95,
-                    "transcribed_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    data: AudioTranscribeData = Field(..., description="Datos de la transcripción")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class AudioDeleteResponse(BaseResponse):
@@ -85,23 +195,14 @@ class AudioDeleteResponse(BaseResponse):
 
     data: Dict[str, Any] = Field(..., description="Resultado de la eliminación")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Audio eliminado exitosamente",
-                "data": {
-                    "audio_url": "https://storage.example.com/audio/user123/audio_file.mp3",
-                    "deleted": True,
-                    "deleted_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class AudioInfoResponse(BaseModel):
     """Información básica de un audio."""
 
+    model_config = ConfigDict(frozen=True)
+
     url: str = Field(..., description="URL del audio")
     duration: Optional[float] = Field(None, description="Duración en segundos")
     size: Optional[int] = Field(None, description="Tamaño en bytes")
@@ -115,27 +216,7 @@ class AudioListResponse(BaseResponse):
 
     data: Dict[str, Any] = Field(..., description="Lista de audios")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "audios": [
-                        {
-                            "url": "https://storage.example.com/audio/user123/audio1.mp3",
-                            "duration": 45.5,
-                            "size": 1048576,
-                            "voice": "alloy",
-                            "speed": 1.0,
-                            "created_at": "2024-01-01T12:00:00Z"
-                        }
-                    ],
-                    "total_count": 8,
-                    "total_duration": 320.5,
-                    "total_size": 8388608
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class VoiceListResponse(BaseResponse):
@@ -143,30 +224,7 @@ class VoiceListResponse(BaseResponse):
 
     data: Dict[str, Any] = Field(..., description="Voces disponibles")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "voices": [
-                        {
-                            "id": "alloy",
-                            "name": "Alloy",
-                            "description": "Voz neutral y versátil",
-                            "gender": "neutral",
-                            "language": "multi"
-                        },
-                        {
-                            "id": "echo",
-                            "name": "Echo",
-                            "description": "Voz masculina clara",
-                            "gender": "male",
-                            "language": "multi"
-                        }
-                    ]
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class AudioHealthResponse(BaseResponse):
@@ -174,16 +232,4 @@ class AudioHealthResponse(BaseResponse):
 
     data: Dict[str, Any] = Field(..., description="Estado del servicio de audio")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "tts_service": "operational",
-                    "transcription_service": "operational",
-                    "storage_service": "operational",
-                    "response_time_ms": 150,
-                    "last_check": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
\ No newline at end of file
+    model_config = ConfigDict(json_schema_extra=_add_example)
@@ -1,206 +1,464 @@
 """
 Script response schemas
 """
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 from ..base import BaseResponse, PaginatedResponse, TonoEnum, CategoriaEnum, TipoSegmentoEnum
 
+# Valor -> miembro del Enum, resueltos una vez para los helpers from_db_row
+_TONES = {t.value: t for t in TonoEnum}
+_CATEGORIES = {c.value: c for c in CategoriaEnum}
+_SEGMENT_TYPES = {t.value: t for t in TipoSegmentoEnum}
+
+
+@lru_cache(maxsize=1)
+def _examples() -> Dict[str, Dict[str, Any]]:
+    """
+    Ejemplos OpenAPI de los schemas de script.
+
+    Solo se construyen al generar /openapi.json (deshabilitado en
+    producción), no al importar el módulo.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Ejemplo por nombre de schema
+    """
+    return {
+        "ScriptEnhanceResponse": {
+            "success": True,
+            "message": "Script mejorado exitosamente",
+            "timestamp": "2024-01-01T12:00:00Z",
+            "data": {
+                "script_id": "uuid-here",
+                "original_script": "Script original...",
+                "enhanced_script": "Script mejorado...",
+                "original_length": 150,
+                "enhanced_length": 200,
+                "estimated_duration": 45.5,
+                "target_duration": 45,
+                "segments": [
+                    {
+                        "text": "Hook impactante...",
+                        "duration": 8,
+                        "type": "hook",
+                        "position": 0
+                    }
+                ],
+                "keywords": ["keyword1", "keyword2"],
+                "tone": "viral",
+                "category": "tech",
+                "improvements": ["Mejora 1", "Mejora 2"],
+                "quality_score": 85,
+                "suggestions": ["Sugerencia 1"],
+                "created_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "ScriptEnhanceBatchResponse": {
+            "success": True,
+            "message": "2 de 3 scripts mejorados",
+            "timestamp": "2024-01-01T12:00:00Z",
+            "data": {
+                "total": 3,
+                "succeeded": 2,
+                "failed": 1,
+                "results": [
+                    {"index": 0, "success": True, "data": {"script_id": "uuid-1"}},
+                    {"index": 1, "success": True, "data": {"script_id": "uuid-2"}},
+                    {"index": 2, "success": False, "error": "Tono inválido"}
+                ]
+            }
+        },
+        "ScriptListResponse": {
+            "items": [
+                {
+                    "id": "script-1",
+                    "original_script": "Mi script...",
+                    "enhanced_script": "Mi script mejorado...",
+                    "original_length": 100,
+                    "enhanced_length": 150,
+                    "estimated_duration": 30.0,
+                    "target_duration": 30,
+                    "tone": "casual",
+                    "category": "education",
+                    "target_audience": "estudiantes",
+                    "keywords": ["educación", "aprendizaje"],
+                    "created_at": "2024-01-01T12:00:00Z"
+                }
+            ],
+            "total_count": 25,
+            "page": 1,
+            "page_size": 10,
+            "has_more": True
+        },
+        "ScriptDetailResponse": {
+            "success": True,
+            "data": {
+                "script_id": "uuid-here",
+                "original_script": "Script original completo...",
+                "enhanced_script": "Script mejorado completo...",
+                "segments": [
+                    {
+                        "text": "Hook: Descubre el secreto...",
+                        "duration": 10,
+                        "type": "hook",
+                        "position": 0
+                    },
+                    {
+                        "text": "Contenido principal...",
+                        "duration": 35,
+                        "type": "contenido",
+                        "position": 1
+                    },
+                    {
+                        "text": "¡Suscríbete para más!",
+                        "duration": 5,
+                        "type": "cta",
+                        "position": 2
+                    }
+                ],
+                "quality_metrics": {
+                    "longitud_adecuada": True,
+                    "duracion_objetivo": True,
+                    "score_calidad": 90
+                },
+                "suggestions": ["Añadir más emoción al hook"],
+                "created_at": "2024-01-01T12:00:00Z"
+            }
+        },
+        "ScriptStatsResponse": {
+            "success": True,
+            "data": {
+                "total_scripts": 15,
+                "scripts_this_month": 5,
+                "avg_quality_score": 82.5,
+                "top_categories": ["tech", "education", "lifestyle"],
+                "top_tones": ["casual", "profesional", "viral"],
+                "total_duration_generated": 750.5,
+                "avg_script_length": 180
+            }
+        },
+        "ScriptAnalyticsResponse": {
+            "success": True,
+            "data": {
+                "script_id": "uuid-here",
+                "performance_metrics": {
+                    "readability_score": 85,
+                    "engagement_potential": 92,
+                    "seo_score": 78
+                },
+                "content_analysis": {
+                    "sentiment": "positive",
+                    "emotion_distribution": {
+                        "excitement": 40,
+                        "curiosity": 35,
+                        "trust": 25
+                    },
+                    "complexity_level": "intermediate"
+                },
+                "optimization_suggestions": [
+                    "Reducir complejidad en el primer párrafo",
+                    "Añadir call-to-action más claro"
+                ]
+            }
+        }
+    }
+
+
+def _add_example(schema: Dict[str, Any], model: type) -> None:
+    """Añade el ejemplo del schema al generar el JSON schema."""
+    schema["example"] = _examples()[model.__name__]
+
 
 class SegmentResponse(BaseModel):
     """Respuesta de un segmento del script."""
 
+    # extra='forbid': el validador rechaza claves inesperadas en lugar de
+    # descartarlas y el schema publica additionalProperties: false
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     text: str = Field(..., description="Texto del segmento")
-    duration: int = Field(..., description="Duración estimada en segundos")
+    # La IA devuelve duraciones fraccionarias (ej. 7.5)
+    duration: float = Field(..., description="Duración estimada en segundos")
     type: TipoSegmentoEnum = Field(..., description="Tipo de segmento")
     position: int = Field(..., description="Posición en el script")
 
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "SegmentResponse":
+        """
+        Construye el segmento sin validar desde datos ya persistidos.
+
+        Solo para filas que vienen del repositorio (entidades del dominio ya
+        validadas al crearse): no se revalidan tipos ni restricciones, así que
+        nunca debe usarse con datos de entrada del cliente.
+
+        Args:
+            row: Segmento serializado por el caso de uso (type como string)
+
+        Returns:
+            SegmentResponse: Segmento construido con model_construct
+        """
+        return cls.model_construct(
+            text=row["text"],
+            duration=row["duration"],
+            type=_SEGMENT_TYPES[row["type"]],
+            position=row["position"]
+        )
+
+
+class _ScriptLengths(BaseModel):
+    """
+    Longitudes derivadas del texto del script.
 
-class ScriptResponse(BaseModel):
+    Se calculan al serializar a partir de original_script/enhanced_script
+    en lugar de recibirse y validarse como campos aparte.
+    """
+
+    @computed_field(description="Longitud del texto original")
+    @property
+    def original_length(self) -> int:
+        return len(self.original_script)
+
+    @computed_field(description="Longitud del texto mejorado")
+    @property
+    def enhanced_length(self) -> int:
+        return len(self.enhanced_script) if self.enhanced_script else 0
+
+
+class ScriptResponse(_ScriptLengths):
     """Respuesta básica de un script."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(..., description="ID único del script")
     original_script: str = Field(..., description="Texto original")
     enhanced_script: Optional[str] = Field(None, description="Texto mejorado por IA")
-    original_length: int = Field(..., description="Longitud del texto original")
-    enhanced_length: int = Field(..., description="Longitud del texto mejorado")
     estimated_duration: float = Field(..., description="Duración estimada en segundos")
     target_duration: int = Field(..., description="Duración objetivo")
     tone: TonoEnum = Field(..., description="Tono aplicado")
     category: CategoriaEnum = Field(..., description="Categoría del contenido")
     target_audience: str = Field(..., description="Audiencia objetivo")
-    keywords: List[str] = Field(default=[], description="Palabras clave extraídas")
+    keywords: Tuple[str, ...] = Field(default_factory=tuple, description="Palabras clave extraídas")
+    created_at: datetime = Field(..., description="Fecha de creación")
+    updated_at: Optional[datetime] = Field(None, description="Fecha de última actualización")
+
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "ScriptResponse":
+        """
+        Construye el script sin validar desde datos ya persistidos.
+
+        Mismo invariante que SegmentResponse.from_db_row: los datos vienen
+        de entidades del repositorio, nunca del cliente.
+
+        Args:
+            row: Script serializado por el caso de uso (tone y category como string)
+
+        Returns:
+            ScriptResponse: Script construido con model_construct
+        """
+        return cls.model_construct(**{
+            **row,
+            "tone": _TONES[row["tone"]],
+            "category": _CATEGORIES[row["category"]],
+            "keywords": tuple(row["keywords"])
+        })
+
+
+class QualityMetrics(BaseModel):
+    """Métricas de calidad calculadas por el dominio."""
+
+    model_config = ConfigDict(frozen=True)
+
+    longitud_adecuada: bool = Field(..., description="Longitud entre 50 y 2000 caracteres")
+    duracion_objetivo: bool = Field(..., description="Si alcanza la duración objetivo")
+    tiene_segmentos: bool = Field(..., description="Si el script tiene segmentos")
+    tiene_hook: bool = Field(..., description="Si tiene segmento hook")
+    tiene_cta: bool = Field(..., description="Si tiene segmento CTA")
+    densidad_palabras_clave: float = Field(..., description="Keywords por palabra")
+    score_calidad: float = Field(..., description="Score de calidad (0-100)")
+
+
+class ScriptEnhanceData(_ScriptLengths):
+    """Datos del script mejorado."""
+
+    model_config = ConfigDict(frozen=True)
+
+    script_id: str = Field(..., description="ID único del script")
+    original_script: str = Field(..., description="Texto original")
+    enhanced_script: Optional[str] = Field(None, description="Texto mejorado por IA")
+    estimated_duration: float = Field(..., description="Duración estimada en segundos")
+    target_duration: int = Field(..., description="Duración objetivo")
+    segments: Tuple[SegmentResponse, ...] = Field(default_factory=tuple, description="Segmentos del script")
+    keywords: Tuple[str, ...] = Field(default_factory=tuple, description="Palabras clave extraídas")
+    tone: TonoEnum = Field(..., description="Tono aplicado")
+    category: CategoriaEnum = Field(..., description="Categoría del contenido")
+    improvements: Tuple[str, ...] = Field(default_factory=tuple, description="Mejoras aplicadas")
+    quality_score: float = Field(..., description="Score de calidad (0-100)")
+    suggestions: Tuple[str, ...] = Field(default_factory=tuple, description="Sugerencias de mejora")
+    created_at: datetime = Field(..., description="Fecha de creación")
+    embedding_generated: bool = Field(False, description="Si se generó el embedding")
+
+
+class ScriptEnhanceBatchResult(BaseModel):
+    """Resultado de un script dentro de un lote."""
+
+    model_config = ConfigDict(frozen=True)
+
+    index: int = Field(..., description="Posición en el lote de entrada")
+    success: bool = Field(..., description="Si el script se mejoró")
+    data: Optional[ScriptEnhanceData] = Field(None, description="Script mejorado")
+    error: Optional[str] = Field(None, description="Error si falló")
+
+
+class ScriptEnhanceBatchData(BaseModel):
+    """Resumen de una mejora en lote."""
+
+    model_config = ConfigDict(frozen=True)
+
+    total: int = Field(..., description="Scripts recibidos")
+    succeeded: int = Field(..., description="Scripts mejorados")
+    failed: int = Field(..., description="Scripts con error")
+    results: Tuple[ScriptEnhanceBatchResult, ...] = Field(
+        default_factory=tuple, description="Resultados en el orden de entrada")
+
+
+class ScriptDetailData(_ScriptLengths):
+    """Datos detallados de un script."""
+
+    model_config = ConfigDict(frozen=True)
+
+    script_id: str = Field(..., description="ID único del script")
+    original_script: str = Field(..., description="Texto original")
+    enhanced_script: Optional[str] = Field(None, description="Texto mejorado por IA")
+    estimated_duration: float = Field(..., description="Duración estimada en segundos")
+    target_duration: int = Field(..., description="Duración objetivo")
+    segments: Tuple[SegmentResponse, ...] = Field(default_factory=tuple, description="Segmentos del script")
+    keywords: Tuple[str, ...] = Field(default_factory=tuple, description="Palabras clave extraídas")
+    tone: TonoEnum = Field(..., description="Tono aplicado")
+    category: CategoriaEnum = Field(..., description="Categoría del contenido")
+    target_audience: str = Field(..., description="Audiencia objetivo")
+    improvements: Tuple[str, ...] = Field(default_factory=tuple, description="Mejoras aplicadas")
+    quality_metrics: QualityMetrics = Field(..., description="Métricas de calidad")
+    suggestions: Tuple[str, ...] = Field(default_factory=tuple, description="Sugerencias de mejora")
     created_at: datetime = Field(..., description="Fecha de creación")
     updated_at: Optional[datetime] = Field(None, description="Fecha de última actualización")
 
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "ScriptDetailData":
+        """
+        Construye el detalle sin validar desde datos ya persistidos.
+
+        Mismo invariante que SegmentResponse.from_db_row: los datos vienen
+        de entidades del repositorio, nunca del cliente.
+
+        Args:
+            row: Detalle serializado por el caso de uso
+
+        Returns:
+            ScriptDetailData: Detalle construido con model_construct
+        """
+        return cls.model_construct(**{
+            **row,
+            "segments": tuple(SegmentResponse.from_db_row(seg) for seg in row["segments"]),
+            "keywords": tuple(row["keywords"]),
+            "tone": _TONES[row["tone"]],
+            "category": _CATEGORIES[row["category"]],
+            "improvements": tuple(row["improvements"]),
+            "quality_metrics": QualityMetrics.model_construct(**row["quality_metrics"]),
+            "suggestions": tuple(row["suggestions"])
+        })
+
+
+class ScriptStatsData(BaseModel):
+    """Estadísticas de scripts de un usuario."""
+
+    model_config = ConfigDict(frozen=True)
+
+    total_scripts: int = Field(..., description="Scripts totales")
+    scripts_this_month: int = Field(..., description="Scripts creados este mes")
+    avg_quality_score: float = Field(..., description="Score de calidad medio")
+    top_categories: Tuple[str, ...] = Field(default_factory=tuple, description="Categorías más usadas")
+    top_tones: Tuple[str, ...] = Field(default_factory=tuple, description="Tonos más usados")
+    total_duration_generated: float = Field(..., description="Segundos de contenido generados")
+    avg_script_length: int = Field(..., description="Longitud media de los scripts")
+
+
+class PerformanceMetrics(BaseModel):
+    """Métricas de rendimiento estimado de un script."""
+
+    model_config = ConfigDict(frozen=True)
+
+    readability_score: int = Field(..., description="Legibilidad (0-100)")
+    engagement_potential: int = Field(..., description="Potencial de engagement (0-100)")
+    seo_score: int = Field(..., description="Score SEO (0-100)")
+
+
+class ContentAnalysis(BaseModel):
+    """Análisis del contenido de un script."""
+
+    model_config = ConfigDict(frozen=True)
+
+    sentiment: str = Field(..., description="Sentimiento general")
+    emotion_distribution: Dict[str, int] = Field(
+        default_factory=dict, description="Porcentaje por emoción")
+    complexity_level: str = Field(..., description="Nivel de complejidad")
+
+
+class ScriptAnalyticsData(BaseModel):
+    """Analytics de un script."""
+
+    model_config = ConfigDict(frozen=True)
+
+    script_id: str = Field(..., description="ID único del script")
+    performance_metrics: PerformanceMetrics = Field(..., description="Métricas de rendimiento")
+    content_analysis: ContentAnalysis = Field(..., description="Análisis del contenido")
+    optimization_suggestions: Tuple[str, ...] = Field(
+        default_factory=tuple, description="Sugerencias de optimización")
+
 
 class ScriptEnhanceResponse(BaseResponse):
     """Respuesta completa de mejora de script."""
 
-    data: dict = Field(..., description="Datos del script mejorado")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Script mejorado exitosamente",
-                "timestamp": "2024-01-01T12:00:00Z",
-                "data": {
-                    "script_id": "uuid-here",
-                    "original_script": "Script original...",
-                    "enhanced_script": "Script mejorado...",
-                    "original_length": 150,
-                    "enhanced_length": 200,
-                    "estimated_duration": 45.5,
-                    "target_duration": 45,
-                    "segments": [
-                        {
-                            "text": "Hook impactante...",
-                            "duration": 8,
-                            "type": "hook",
-                            "position": 0
-                        }
-                    ],
-                    "keywords": ["keyword1", "keyword2"],
-                    "tone": "viral",
-                    "category": "tech",
-                    "improvements": ["Mejora 1", "Mejora 2"],
-                    "quality_score": 85,
-                    "suggestions": ["Sugerencia 1"],
-                    "created_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    data: ScriptEnhanceData = Field(..., description="Datos del script mejorado")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
+
+
+class ScriptEnhanceBatchResponse(BaseResponse):
+    """Respuesta de mejora de varios scripts."""
+
+    data: ScriptEnhanceBatchData = Field(..., description="Resultados por script, en el orden de entrada")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class ScriptListResponse(PaginatedResponse):
     """Respuesta de lista de scripts."""
 
-    items: List[ScriptResponse] = Field(default=[], description="Lista de scripts")
+    items: Tuple[ScriptResponse, ...] = Field(default_factory=tuple, description="Lista de scripts")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "items": [
-                    {
-                        "id": "script-1",
-                        "original_script": "Mi script...",
-                        "enhanced_script": "Mi script mejorado...",
-                        "original_length": 100,
-                        "enhanced_length": 150,
-                        "estimated_duration": 30.0,
-                        "target_duration": 30,
-                        "tone": "casual",
-                        "category": "education",
-                        "target_audience": "estudiantes",
-                        "keywords": ["educación", "aprendizaje"],
-                        "created_at": "2024-01-01T12:00:00Z"
-                    }
-                ],
-                "total_count": 25,
-                "page": 1,
-                "page_size": 10,
-                "has_more": True
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class ScriptDetailResponse(BaseResponse):
     """Respuesta detallada de un script específico."""
 
-    data: dict = Field(..., description="Datos detallados del script")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "script_id": "uuid-here",
-                    "original_script": "Script original completo...",
-                    "enhanced_script": "Script mejorado completo...",
-                    "segments": [
-                        {
-                            "text": "Hook: Descubre el secreto...",
-                            "duration": 10,
-                            "type": "hook",
-                            "position": 0
-                        },
-                        {
-                            "text": "Contenido principal...",
-                            "duration": 35,
-                            "type": "contenido",
-                            "position": 1
-                        },
-                        {
-                            "text": "¡Suscríbete para más!",
-                            "duration": 5,
-                            "type": "cta",
-                            "position": 2
-                        }
-                    ],
-                    "quality_metrics": {
-                        "longitud_adecuada": True,
-                        "duracion_objetivo": True,
-                        "score_calidad": 90
-                    },
-                    "suggestions": ["Añadir más emoción al hook"],
-                    "created_at": "2024-01-01T12:00:00Z"
-                }
-            }
-        }
+    data: ScriptDetailData = Field(..., description="Datos detallados del script")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class ScriptStatsResponse(BaseResponse):
     """Respuesta de estadísticas de scripts del usuario."""
 
-    data: Dict[str, Any] = Field(..., description="Estadísticas de scripts")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "total_scripts": 15,
-                    "scripts_this_month": 5,
-                    "avg_quality_score": 82.5,
-                    "top_categories": ["tech", "education", "lifestyle"],
-                    "top_tones": ["casual", "profesional", "viral"],
-                    "total_duration_generated": 750.5,
-                    "avg_script_length": 180
-                }
-            }
-        }
+    data: ScriptStatsData = Field(..., description="Estadísticas de scripts")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
 
 
 class ScriptAnalyticsResponse(BaseResponse):
     """Respuesta de analytics de un script específico."""
 
-    data: Dict[str, Any] = Field(..., description="Analytics del script")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {
-                    "script_id": "uuid-here",
-                    "performance_metrics": {
-                        "readability_score": 85,
-                        "engagement_potential": 92,
-                        "seo_score": 78
-                    },
-                    "content_analysis": {
-                        "sentiment": "positive",
-                        "emotion_distribution": {
-                            "excitement": 40,
-                            "curiosity": 35,
-                            "trust": 25
-                        },
-                        "complexity_level": "intermediate"
-                    },
-                    "optimization_suggestions": [
-                        "Reducir complejidad en el primer párrafo",
-                        "Añadir call-to-action más claro"
-                    ]
-                }
-            }
-        }
\ No newline at end of file
+    data: ScriptAnalyticsData = Field(..., description="Analytics del script")
+
+    model_config = ConfigDict(json_schema_extra=_add_example)
@@ -3,6 +3,16 @@ Test configuration and fixtures
 """
 import pytest
 import os
+
+# Configuración de test: debe fijarse antes de importar la app (el cliente de
+# Supabase se crea al importar las rutas). Los tests nunca llaman a los
+# servicios reales. El rate limiting solo se activa fuera de DEBUG: todas las
+# requests del TestClient comparten IP y agotarían el burst entre tests
+os.environ.setdefault("DEBUG", "true")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.config import settings
@@ -0,0 +1,74 @@
+"""
+Tests for the MP3 duration parser
+"""
+import pytest
+
+from app.application.use_cases.generate_audio import _mp3_duration
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, sin padding
+_STEREO_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+_MONO_HEADER = bytes([0xFF, 0xFB, 0x90, 0xC0])
+_FRAME_LENGTH = 144 * 128000 // 44100
+_SAMPLES_PER_FRAME = 1152
+
+
+def _frame(header: bytes = _STEREO_HEADER, payload: bytes = b"") -> bytes:
+    """Build one MP3 frame padded with zeros to its nominal length."""
+    frame = header + payload
+    return frame + bytes(_FRAME_LENGTH - len(frame))
+
+
+def _expected(frames: int) -> float:
+    return round(frames * _SAMPLES_PER_FRAME / 44100, 2)
+
+
+def test_cbr_duration_from_frame_headers():
+    """Without a Xing/VBRI header every frame is counted"""
+    audio = _frame() * 100
+
+    assert _mp3_duration(audio) == _expected(100)
+
+
+def test_xing_header_gives_total_frames():
+    """A Xing header in the first frame short-circuits the frame walk"""
+    xing = b"Xing" + (1).to_bytes(4, "big") + (1000).to_bytes(4, "big")
+    audio = _frame(payload=bytes(32) + xing) + _frame() * 3
+
+    assert _mp3_duration(audio) == _expected(1000)
+
+
+def test_info_header_in_mono_stream():
+    """Mono frames have a shorter side info block before the Info tag"""
+    info = b"Info" + (1).to_bytes(4, "big") + (500).to_bytes(4, "big")
+    audio = _frame(_MONO_HEADER, bytes(17) + info) + _frame(_MONO_HEADER)
+
+    assert _mp3_duration(audio) == _expected(500)
+
+
+def test_xing_header_without_frame_count_falls_back_to_walk():
+    """A Xing header without the frames flag is ignored"""
+    xing = b"Xing" + (0).to_bytes(4, "big")
+    audio = _frame(payload=bytes(32) + xing) + _frame() * 9
+
+    assert _mp3_duration(audio) == _expected(10)
+
+
+def test_vbri_header_gives_total_frames():
+    """A VBRI header sits 32 bytes after the first frame header"""
+    vbri = b"VBRI" + bytes(10) + (750).to_bytes(4, "big")
+    audio = _frame(payload=bytes(32) + vbri) + _frame()
+
+    assert _mp3_duration(audio) == _expected(750)
+
+
+def test_id3v2_tag_is_skipped():
+    """The ID3v2 tag size is syncsafe and skipped before the first frame"""
+    tag = b"ID3" + bytes([4, 0, 0]) + bytes([0, 0, 1, 0]) + bytes(128)
+
+    assert _mp3_duration(tag + _frame() * 20) == _expected(20)
+
+
+@pytest.mark.parametrize("audio", [b"", b"not an mp3 file at all", bytes(2048)])
+def test_invalid_audio_returns_none(audio):
+    """Data without any valid frame header has no duration"""
+    assert _mp3_duration(audio) is None
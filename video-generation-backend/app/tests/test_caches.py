@@ -0,0 +1,157 @@
+"""
+Tests for the in-memory LRU/TTL caches
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.external.openai import client as openai_client
+from app.infrastructure.external.openai import service as openai_service
+from app.infrastructure.external.openai.service import _SpeechCache
+
+
+# ============= TTS =============
+
+def test_speech_cache_evicts_least_recently_used_by_bytes():
+    """The cache is bounded by total bytes, evicting the oldest entries"""
+    cache = _SpeechCache(max_bytes=10, ttl_seconds=60)
+    cache.put(b"a", b"1234")
+    cache.put(b"b", b"1234")
+
+    # "a" pasa a ser el más reciente, así que se expulsa "b"
+    assert cache.get(b"a") == b"1234"
+    cache.put(b"c", b"1234")
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == b"1234"
+    assert cache.get(b"c") == b"1234"
+
+
+def test_speech_cache_skips_entries_larger_than_limit():
+    """An audio larger than the whole cache is not stored"""
+    cache = _SpeechCache(max_bytes=4, ttl_seconds=60)
+    cache.put(b"a", b"12345")
+
+    assert cache.get(b"a") is None
+
+
+def test_speech_cache_expires_entries():
+    """Expired entries are dropped and their bytes released"""
+    cache = _SpeechCache(max_bytes=10, ttl_seconds=0)
+    cache.put(b"a", b"1234")
+
+    assert cache.get(b"a") is None
+    assert cache._size == 0
+
+
+def test_speech_cache_key_depends_on_model_voice_and_text():
+    """Different voices or models never share an entry"""
+    key = _SpeechCache.key("tts-1", "alloy", "hola")
+
+    assert key == _SpeechCache.key("tts-1", "alloy", "hola")
+    assert key != _SpeechCache.key("tts-1", "nova", "hola")
+    assert key != _SpeechCache.key("tts-1-hd", "alloy", "hola")
+
+
+# ============= MEJORA DE SCRIPTS =============
+
+@pytest.fixture
+def enhancement_cache(monkeypatch):
+    """Empty enhancement cache with a small size limit"""
+    monkeypatch.setattr(settings, "ENHANCEMENT_CACHE_SIZE", 2)
+    monkeypatch.setattr(settings, "ENHANCEMENT_CACHE_TTL_SECONDS", 60)
+    openai_service._enhancement_cache.clear()
+    yield openai_service._enhancement_cache
+    openai_service._enhancement_cache.clear()
+
+
+def test_enhancement_cache_returns_independent_copies(enhancement_cache):
+    """Mutating a cached enhancement does not alter the cache"""
+    openai_service._cache_enhancement(b"k", {"keywords": ["a"]})
+
+    first = openai_service._get_cached_enhancement(b"k")
+    first["keywords"].append("b")
+
+    assert openai_service._get_cached_enhancement(b"k") == {"keywords": ["a"]}
+
+
+def test_enhancement_cache_is_bounded(enhancement_cache):
+    """The least recently used enhancement is evicted"""
+    for key in (b"1", b"2", b"3"):
+        openai_service._cache_enhancement(key, {"key": key.decode()})
+
+    assert openai_service._get_cached_enhancement(b"1") is None
+    assert len(enhancement_cache) == 2
+
+
+def test_enhancement_cache_expires_entries(enhancement_cache, monkeypatch):
+    """Expired enhancements are removed on read"""
+    monkeypatch.setattr(settings, "ENHANCEMENT_CACHE_TTL_SECONDS", 0)
+    openai_service._cache_enhancement(b"k", {"key": "k"})
+
+    assert openai_service._get_cached_enhancement(b"k") is None
+    assert b"k" not in enhancement_cache
+
+
+# ============= EMBEDDINGS =============
+
+class _FakeEmbeddings:
+    """Embeddings endpoint that records every input it receives"""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def create(self, model, input):
+        self.inputs.append(input)
+        texts = [input] if isinstance(input, str) else input
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text)), 1.0])
+            for i, text in enumerate(texts)
+        ])
+
+
+@pytest.fixture
+def embeddings_client(monkeypatch):
+    """OpenAI client backed by a fake embeddings endpoint and an empty cache"""
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    openai_client._embedding_cache.clear()
+    client = openai_client.OpenAIClient()
+    client.client = SimpleNamespace(embeddings=_FakeEmbeddings())
+    yield client
+    openai_client._embedding_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_embedding_is_not_shared(embeddings_client):
+    """Callers can mutate a returned embedding without corrupting the cache"""
+    embedding = await embeddings_client.generate_embedding("hola mundo")
+    embedding[0] = 99.0
+
+    assert await embeddings_client.generate_embedding("hola  mundo") == [10.0, 1.0]
+    assert embeddings_client.client.embeddings.inputs == ["hola mundo"]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_batch_deduplicates_and_uses_cache(embeddings_client):
+    """Only unique, uncached texts are sent to OpenAI"""
+    await embeddings_client.generate_embedding("uno")
+
+    result = await embeddings_client.generate_embeddings_batch(
+        ["uno", "dos", "dos", "tres"])
+
+    assert result == [[3.0, 1.0], [3.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert result[1] is not result[2]
+    assert embeddings_client.client.embeddings.inputs[-1] == ["dos", "tres"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_is_bounded(embeddings_client, monkeypatch):
+    """The least recently used embedding is evicted"""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_SIZE", 2)
+
+    await embeddings_client.generate_embeddings_batch(["a", "b", "c"])
+
+    assert len(openai_client._embedding_cache) == 2
+    await embeddings_client.generate_embedding("a")
+    assert embeddings_client.client.embeddings.inputs[-1] == "a"
@@ -0,0 +1,28 @@
+"""
+Tests for the dependency container lifecycle
+"""
+import pytest
+
+from app.core.container import DependencyContainer
+from app.infrastructure.external.openai.client import get_openai_client
+from app.infrastructure.external.supabase.client import get_supabase_client
+
+
+@pytest.mark.asyncio
+async def test_shutdown_discards_closed_clients():
+    """After shutdown the cached clients are rebuilt instead of reused closed"""
+    container = DependencyContainer()
+    openai_client = get_openai_client()
+    supabase_client = get_supabase_client()
+    container._instances = {
+        'openai_client': openai_client,
+        'supabase_client': supabase_client
+    }
+    container._initialized = True
+
+    await container.shutdown()
+
+    assert container._instances == {}
+    assert not container._initialized
+    assert get_openai_client() is not openai_client
+    assert get_supabase_client() is not supabase_client
@@ -0,0 +1,168 @@
+"""
+Tests for the batch enhancement and TTS streaming endpoints
+"""
+from typing import AsyncIterator, List
+
+import httpx
+import openai
+import pytest
+
+from app.api.middleware.auth import get_user_id
+from app.application.use_cases.enhance_script import EnhanceScriptUseCase
+from app.core.config import settings
+from app.core.container import get_enhance_script_use_case, get_generate_audio_use_case
+from app.main import fastapi_app
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def override_dependencies():
+    """Authenticate every request and restore the real dependencies afterwards"""
+    fastapi_app.dependency_overrides[get_user_id] = lambda: USER_ID
+    yield fastapi_app.dependency_overrides
+    fastapi_app.dependency_overrides.clear()
+
+
+def _script_item(script: str) -> dict:
+    return {
+        "script": script,
+        "target_duration": 30,
+        "tone": "educativo",
+        "category": "tech"
+    }
+
+
+# ============= MEJORA EN LOTE =============
+
+class _FailingEnhanceUseCase(EnhanceScriptUseCase):
+    """Use case whose execute() fails according to the script text"""
+
+    def __init__(self):
+        pass
+
+    async def execute(self, user_id: str, original_script: str, **kwargs):
+        if original_script.startswith("invalido"):
+            raise ValueError("La duración no es válida")
+        if original_script.startswith("sin creditos"):
+            raise PermissionError("Créditos insuficientes")
+        raise RuntimeError("connection to db.internal:5432 refused")
+
+
+def test_batch_enhance_reports_safe_errors_per_item(client, override_dependencies):
+    """Each failed item gets the same message the single endpoint would send"""
+    override_dependencies[get_enhance_script_use_case] = _FailingEnhanceUseCase
+
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/enhance/batch",
+        json={"items": [
+            _script_item("invalido: script de prueba"),
+            _script_item("sin creditos: script de prueba"),
+            _script_item("cualquier otro script de prueba"),
+        ]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["total"], data["succeeded"], data["failed"]) == (3, 0, 3)
+    assert [r["index"] for r in data["results"]] == [0, 1, 2]
+    assert [r["error"] for r in data["results"]] == [
+        "La duración no es válida",
+        "Créditos insuficientes",
+        "Error interno procesando el script",
+    ]
+
+
+# ============= TTS EN STREAMING =============
+
+class _StreamingAudioUseCase:
+    """Use case that streams fixed chunks or fails on the first one"""
+
+    def __init__(self, chunks: List[bytes], error: Exception = None):
+        self.chunks = chunks
+        self.error = error
+
+    async def stream_text(self, user_id: str, text: str, voice: str, speed: float):
+        async def generate() -> AsyncIterator[bytes]:
+            if self.error is not None:
+                raise self.error
+            for chunk in self.chunks:
+                yield chunk
+
+        metadata = {
+            "estimated_duration": 3.5,
+            "generated_at": "2024-01-01T12:00:00.000000"
+        }
+        return generate(), metadata
+
+
+def _stream(client, override_dependencies, use_case):
+    override_dependencies[get_generate_audio_use_case] = lambda: use_case
+    return client.post(
+        f"{settings.API_V1_PREFIX}/text-to-speech/stream",
+        json={"text": "Hola, esto es una prueba de audio.", "voice": "nova"},
+        headers={"Accept-Encoding": "gzip"}
+    )
+
+
+def test_tts_stream_sends_all_chunks(client, override_dependencies):
+    """The first chunk is read ahead and re-sent before the rest"""
+    response = _stream(client, override_dependencies,
+                       _StreamingAudioUseCase([b"ID3", b"abc", b"def"] * 500))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/mpeg"
+    assert response.headers["x-voice-id"] == "nova"
+    assert response.headers["x-duration"] == "3.5"
+    assert "content-encoding" not in response.headers
+    assert response.content == b"ID3abcdef" * 500
+
+
+def test_tts_stream_maps_first_chunk_validation_error_to_400(client, override_dependencies):
+    """An error before any audio is sent becomes a proper HTTP status"""
+    response = _stream(client, override_dependencies, _StreamingAudioUseCase(
+        [], error=ValueError("Texto demasiado largo")))
+
+    assert response.status_code == 400
+
+
+def test_tts_stream_maps_first_chunk_failure_to_500(client, override_dependencies):
+    """OpenAI failures on the first chunk do not produce a truncated 200"""
+    response = _stream(client, override_dependencies, _StreamingAudioUseCase(
+        [], error=RuntimeError("429 Too Many Requests")))
+
+    assert response.status_code == 500
+    assert "429" not in response.text
+
+
+def test_tts_stream_rejects_empty_audio(client, override_dependencies):
+    """A stream that ends before the first chunk is an error"""
+    response = _stream(client, override_dependencies, _StreamingAudioUseCase([]))
+
+    assert response.status_code == 502
+
+
+def _openai_error(error_class, status_code: int, headers: dict = None) -> Exception:
+    response = httpx.Response(
+        status_code,
+        headers=headers,
+        request=httpx.Request("POST", "https://api.openai.com/v1/audio/speech")
+    )
+    return error_class("upstream error", response=response, body=None)
+
+
+def test_tts_stream_maps_upstream_rate_limit_to_429(client, override_dependencies):
+    """An OpenAI 429 keeps its status and Retry-After"""
+    response = _stream(client, override_dependencies, _StreamingAudioUseCase(
+        [], error=_openai_error(openai.RateLimitError, 429, {"retry-after": "7"})))
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+
+
+def test_tts_stream_maps_upstream_server_error_to_502(client, override_dependencies):
+    """OpenAI 5xx errors are reported as a bad gateway"""
+    response = _stream(client, override_dependencies, _StreamingAudioUseCase(
+        [], error=_openai_error(openai.InternalServerError, 500)))
+
+    assert response.status_code == 502
@@ -0,0 +1,187 @@
+"""
+Tests for the ASGI middleware and the cached static endpoints
+"""
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+from pydantic import BaseModel
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.api.middleware.compression import SelectiveGZipMiddleware
+from app.api.middleware.health_check import HealthCheckInterceptor
+
+
+class _Health(BaseModel):
+    status: str
+
+
+async def _downstream(scope, receive, send):
+    """ASGI app that answers every request with 204"""
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _health_app(status: Optional[str] = "healthy", delay: float = 0.0):
+    """Interceptor around a provider that counts its calls"""
+    calls = []
+
+    async def provider():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if status is None:
+            raise RuntimeError("supabase caído")
+        return _Health(status=status)
+
+    app = HealthCheckInterceptor(_downstream, health_provider=provider, cache_ttl=5.0)
+    return app, calls
+
+
+def _async_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+# ============= HEALTH CHECK =============
+
+@pytest.mark.asyncio
+async def test_health_is_cached():
+    """Probes within the TTL reuse the cached result"""
+    app, calls = _health_app("healthy")
+
+    async with _async_client(app) as client:
+        first = await client.get("/health")
+        second = await client.get("/health")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == {"status": "healthy"}
+    assert first.headers["cache-control"] == "max-age=5"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_returns_503():
+    """Load balancers see an unhealthy service as a 503"""
+    app, _ = _health_app("unhealthy")
+
+    async with _async_client(app) as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "unhealthy"}
+
+
+@pytest.mark.asyncio
+async def test_degraded_stays_available():
+    """A degraded service still answers 200"""
+    app, _ = _health_app("degraded")
+
+    async with _async_client(app) as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_provider_error_on_first_probe_returns_503():
+    """A failing provider with nothing cached yet reports unhealthy"""
+    app, _ = _health_app(None)
+
+    async with _async_client(app) as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_probes_share_one_refresh():
+    """Concurrent cold probes trigger a single provider call"""
+    app, calls = _health_app("unhealthy", delay=0.05)
+
+    async with _async_client(app) as client:
+        responses = await asyncio.gather(*(client.get("/health") for _ in range(10)))
+
+    assert [r.status_code for r in responses] == [503] * 10
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_requests_reach_the_app():
+    """Only GET /health is intercepted"""
+    app, calls = _health_app("healthy")
+
+    async with _async_client(app) as client:
+        other = await client.get("/info")
+        post = await client.post("/health")
+
+    assert other.status_code == post.status_code == 204
+    assert calls == []
+
+
+# ============= COMPRESIÓN =============
+
+_BODY = "x" * 4096
+
+
+def _gzip_app() -> SelectiveGZipMiddleware:
+    async def body(request):
+        return PlainTextResponse(_BODY)
+
+    app = Starlette(routes=[Route("/text", body), Route("/stream", body)])
+    return SelectiveGZipMiddleware(
+        app, minimum_size=1024, exclude_paths={"/stream"})
+
+
+@pytest.mark.asyncio
+async def test_gzip_compresses_regular_paths():
+    """Large responses are gzipped when the client accepts it"""
+    async with _async_client(_gzip_app()) as client:
+        response = await client.get("/text", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == _BODY
+
+
+@pytest.mark.asyncio
+async def test_gzip_skips_excluded_paths():
+    """Excluded paths are passed through untouched"""
+    async with _async_client(_gzip_app()) as client:
+        response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == _BODY.encode()
+
+
+# ============= ETAG EN / E /info =============
+
+@pytest.mark.parametrize("path", ["/", "/info"])
+def test_static_endpoints_send_etag(client, path):
+    """Static bodies carry a strong ETag and a public Cache-Control"""
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "public, max-age=300"
+
+
+@pytest.mark.parametrize("path", ["/", "/info"])
+def test_static_endpoints_revalidate_with_304(client, path):
+    """A matching If-None-Match gets an empty 304"""
+    etag = client.get(path).headers["etag"]
+
+    response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_static_endpoints_ignore_stale_etag(client):
+    """A different ETag gets the full body"""
+    response = client.get("/", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json()["api_v1"]
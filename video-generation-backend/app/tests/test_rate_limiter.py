@@ -0,0 +1,67 @@
+"""
+Tests for the OpenAI request rate limiter
+"""
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.external.openai import client as openai_client
+from app.infrastructure.external.openai.client import _RequestRateLimiter, _per_worker_rpm
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the limiter's waits instead of sleeping"""
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(openai_client.asyncio, "sleep", fake_sleep)
+    return waits
+
+
+@pytest.mark.asyncio
+async def test_burst_within_capacity_does_not_wait(sleeps):
+    """Requests up to the bucket capacity go through immediately"""
+    limiter = _RequestRateLimiter("test", requests_per_minute=3)
+
+    waited = [await limiter.acquire() for _ in range(3)]
+
+    assert waited == [0.0, 0.0, 0.0]
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_requests_over_capacity_queue_in_order(sleeps):
+    """Each request over capacity waits one more refill interval"""
+    limiter = _RequestRateLimiter("test", requests_per_minute=120)
+    limiter._tokens = 0.0
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert sleeps == [pytest.approx(0.5, abs=0.01), pytest.approx(1.0, abs=0.01)]
+
+
+@pytest.mark.asyncio
+async def test_zero_rpm_disables_limiter(sleeps):
+    """A limit of 0 never waits"""
+    limiter = _RequestRateLimiter("test", requests_per_minute=0)
+
+    assert await limiter.acquire() == 0.0
+    assert sleeps == []
+
+
+@pytest.mark.parametrize("debug,workers,account_rpm,expected", [
+    (False, 4, 500, 125),
+    (False, 3, 500, 166),
+    (False, 8, 4, 1),
+    (True, 4, 500, 500),
+    (False, 4, 0, 0),
+])
+def test_account_rpm_is_split_across_workers(monkeypatch, debug, workers, account_rpm, expected):
+    """Each worker gets its share of the account-wide limit"""
+    monkeypatch.setattr(settings, "DEBUG", debug)
+    monkeypatch.setattr(settings, "UVICORN_WORKERS", workers)
+
+    assert _per_worker_rpm(account_rpm) == expected
@@ -0,0 +1,20 @@
+"""
+Tests for the shared request schema types
+"""
+from typing import get_args
+
+import pytest
+
+from app.domain.entities.script import Category, Tone
+from app.domain.entities.video import VoiceId
+from app.schemas.base import CategoriaLiteral, TonoLiteral, VozLiteral
+
+
+@pytest.mark.parametrize("literal, enum", [
+    (TonoLiteral, Tone),
+    (CategoriaLiteral, Category),
+    (VozLiteral, VoiceId),
+])
+def test_literals_match_domain_enums(literal, enum):
+    """The request Literals accept exactly the values of the domain enums"""
+    assert get_args(literal) == tuple(member.value for member in enum)
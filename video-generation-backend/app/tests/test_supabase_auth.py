@@ -0,0 +1,95 @@
+"""
+Tests for Supabase JWT verification
+"""
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.external.supabase import client as supabase_module
+from app.infrastructure.external.supabase.client import SupabaseClient
+
+JWT_SECRET = "test-jwt-secret-of-at-least-32-bytes"
+
+
+class _FakeAuth:
+    """Supabase Auth that accepts any token and counts the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_user(self, jwt: str):
+        self.calls += 1
+        return SimpleNamespace(user=SimpleNamespace(
+            id="user-1",
+            email="user@example.com",
+            user_metadata={},
+            app_metadata={},
+            aud="authenticated",
+            created_at="2024-01-01T00:00:00Z",
+            confirmed_at="2024-01-01T00:00:00Z",
+            last_sign_in_at="2024-01-02T00:00:00Z"
+        ))
+
+
+@pytest.fixture
+def supabase():
+    """Supabase client with a fake Auth endpoint and an empty token cache"""
+    supabase_module._token_cache.clear()
+    client = SupabaseClient()
+    client.client = SimpleNamespace(auth=_FakeAuth())
+    yield client
+    supabase_module._token_cache.clear()
+
+
+def _token() -> str:
+    return jwt.encode({
+        "sub": "user-1",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 300
+    }, JWT_SECRET, algorithm="HS256")
+
+
+@pytest.mark.asyncio
+async def test_local_and_remote_verification_return_the_same_shape(supabase, monkeypatch):
+    """The user dict does not depend on whether SUPABASE_JWT_SECRET is set"""
+    token = _token()
+
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    local = await supabase.verify_jwt_token(token)
+
+    supabase_module._token_cache.clear()
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "")
+    remote = await supabase.verify_jwt_token(token)
+
+    assert local.keys() == remote.keys()
+    assert local["id"] == remote["id"] == "user-1"
+    assert supabase.client.auth.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_local_verification_skips_supabase_auth(supabase, monkeypatch):
+    """With the project secret the token is checked without a round-trip"""
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", JWT_SECRET)
+
+    user = await supabase.verify_jwt_token(_token())
+
+    assert user["email"] == "user@example.com"
+    assert user["confirmed_at"] is None
+    assert supabase.client.auth.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached(supabase, monkeypatch):
+    """A token verified remotely is not sent to Supabase again"""
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "")
+    token = _token()
+
+    first = await supabase.verify_jwt_token(token)
+    second = await supabase.verify_jwt_token(token)
+
+    assert first == second
+    assert supabase.client.auth.calls == 1
@@ -0,0 +1,11 @@
+"""
+Gunicorn configuration (producción: UvicornWorker con uvloop + httptools)
+
+El número de workers sale de settings, el mismo valor con el que cada
+worker reparte el límite RPM de OpenAI: no se pasa -w en la línea de comandos.
+"""
+from app.core.config import settings
+
+bind = f"{settings.API_HOST}:{settings.API_PORT}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.worker_count
@@ -457,6 +457,7 @@ CREATE INDEX IF NOT EXISTS idx_videos_created_at ON videos (created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_processing_queue_video ON processing_queue (video_id);
 CREATE INDEX IF NOT EXISTS idx_analytics_video_platform ON analytics (video_id, platform);
 CREATE INDEX IF NOT EXISTS idx_profiles_subscription ON profiles (subscription_tier);
+CREATE INDEX IF NOT EXISTS idx_profiles_last_video_created_at ON profiles (last_video_created_at);
 CREATE INDEX IF NOT EXISTS idx_templates_category_active ON templates (category, is_active) WHERE is_active = true;
 
 -- Índice para búsqueda de texto en títulos